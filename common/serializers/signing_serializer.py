@@ -21,6 +21,7 @@ authenticator.
 
 """
 from collections import Iterable
+from typing import Dict
 
 from common.error import error
 from stp_core.common.log import getlogger
@@ -55,34 +56,71 @@ class SigningSerializer:
          serialization
         :return: a string representation of `obj`
         """
-        res = None
-        if not isinstance(obj, acceptableTypes):
-            error("invalid type found {}: {}".format(objname, obj))
-        elif isinstance(obj, str):
-            res = obj
-        elif isinstance(obj, dict):
-            if level > 0:
-                keys = list(obj.keys())
+        # The walk is done iteratively with an explicit stack: nested values
+        # are visited in exactly the same order as a recursive walk would do,
+        # so both the output and the first reported error are the same,
+        # but without a Python call and intermediate string per value.
+        out = []
+        stack = [(obj, level, objname)]
+        push = stack.append
+        while stack:
+            item = stack.pop()
+            if item.__class__ is str:
+                out.append(item)
+                continue
+            obj, level, objname = item
+            cls = obj.__class__
+            if cls is dict or cls is list:
+                pass
+            elif not isinstance(obj, acceptableTypes):
+                error("invalid type found {}: {}".format(objname, obj))
+            elif isinstance(obj, str):
+                out.append(obj)
+                continue
+            elif obj is None:
+                continue
+            elif not isinstance(obj, (dict, Iterable)):
+                out.append(str(obj))
+                continue
+
+            level += 1
+            if isinstance(obj, dict):
+                if level > 1:
+                    keys = list(obj.keys())
+                else:
+                    topLevelKeysToIgnore = topLevelKeysToIgnore or []
+                    keys = [k for k in obj.keys() if k not in topLevelKeysToIgnore]
+                keys.sort()
+                sep = "|"
             else:
-                topLevelKeysToIgnore = topLevelKeysToIgnore or []
-                keys = [k for k in obj.keys() if k not in topLevelKeysToIgnore]
-            keys.sort()
-            strs = []
-            for k in keys:
-                onm = ".".join([str(objname), str(k)]) if objname else k
-                strs.append(
-                    str(k) + ":" + self.serialize(obj[k], level + 1, onm, toBytes=False))
-            res = "|".join(strs)
-        elif isinstance(obj, Iterable):
-            strs = []
-            for o in obj:
-                strs.append(self.serialize(
-                    o, level + 1, objname, toBytes=False))
-            res = ",".join(strs)
-        elif obj is None:
-            res = ""
-        else:
-            res = str(obj)
+                keys = range(len(obj))
+                sep = ","
+            # children are pushed in reverse order so that they are popped
+            # in the natural one; plain strings and numbers need no separate
+            # visit and are pushed together with their key and separator
+            is_dict = sep == "|"
+            for i in range(len(keys) - 1, -1, -1):
+                k = keys[i]
+                v = obj[k]
+                prefix = str(k) + ":" if is_dict else ""
+                if i:
+                    prefix = sep + prefix
+                vcls = v.__class__
+                if vcls is str:
+                    push(prefix + v)
+                elif vcls is int or vcls is float:
+                    push(prefix + str(v))
+                elif v is None:
+                    push(prefix)
+                else:
+                    if is_dict:
+                        push((v, level, ".".join([str(objname), str(k)]) if objname else k))
+                    else:
+                        push((v, level, objname))
+                    if prefix:
+                        push(prefix)
+
+        res = "".join(out)
 
         # logger.trace("serialized msg {} into {}".format(obj, res))
 
@@ -93,3 +131,36 @@ class SigningSerializer:
 
         # topLevelKeysToIgnore = topLevelKeysToIgnore or []
         # return ujson.dumps({k:obj[k] for k in obj.keys() if k not in topLevelKeysToIgnore}, sort_keys=True)
+
+    def serialize_memoized(self, obj: Dict, memo: Dict, toBytes=True):
+        """
+        Same as `serialize` for a dict, but serialized forms of its top level
+        containers are taken from `memo`, which maps a key to a
+        `(value, serialized value)` pair, and stored there when missing.
+
+        A memoized form is reused only while the key refers to the very same
+        object, so the values must not be mutated in place once serialized.
+
+        :param obj: the dict to serialize
+        :param memo: the memo kept by the caller between invocations
+        :return: a string representation of `obj`
+        """
+        strs = []
+        for k in sorted(obj.keys()):
+            v = obj[k]
+            if v.__class__ in (dict, list):
+                cached = memo.get(k)
+                if cached is not None and cached[0] is v:
+                    ser = cached[1]
+                else:
+                    ser = self.serialize(v, 1, k, toBytes=False)
+                    memo[k] = (v, ser)
+            else:
+                ser = self.serialize(v, 1, k, toBytes=False)
+            strs.append(str(k) + ":" + ser)
+        res = "|".join(strs)
+
+        if not toBytes:
+            return res
+
+        return res.encode('utf-8')
@@ -2,7 +2,7 @@ from collections import OrderedDict
 
 import pytest
 
-from common.serializers.serialization import serialize_msg_for_signing
+from common.serializers.serialization import serialize_msg_for_signing, signing_serializer
 
 
 def test_serialize_int():
@@ -138,3 +138,111 @@ def test_serialize_complex_ordered_dict():
             ])),
             ('1', 'a'),
         ]))
+
+
+def reference_serialize(obj, level=0, objname=None, topLevelKeysToIgnore=None):
+    # The original recursive implementation, kept to check that
+    # the current one produces byte-for-byte the same output
+    if not isinstance(obj, (str, int, float, list, dict, type(None))):
+        raise Exception("invalid type found {}: {}".format(objname, obj))
+    elif isinstance(obj, str):
+        return obj
+    elif isinstance(obj, dict):
+        if level > 0:
+            keys = list(obj.keys())
+        else:
+            topLevelKeysToIgnore = topLevelKeysToIgnore or []
+            keys = [k for k in obj.keys() if k not in topLevelKeysToIgnore]
+        keys.sort()
+        strs = []
+        for k in keys:
+            onm = ".".join([str(objname), str(k)]) if objname else k
+            strs.append(str(k) + ":" + reference_serialize(obj[k], level + 1, onm))
+        return "|".join(strs)
+    elif isinstance(obj, list):
+        return ",".join(reference_serialize(o, level + 1, objname) for o in obj)
+    elif obj is None:
+        return ""
+    return str(obj)
+
+
+GOLDEN = [
+    ({}, b''),
+    ([], b''),
+    ('', b''),
+    (True, b'True'),
+    (1.5, b'1.5'),
+    (-7, b'-7'),
+    ('ünïcødé', 'ünïcødé'.encode()),
+    ([None, 1, 'a', [], {}], b',1,a,,'),
+    ([[1, 2], [3, [4, 5]]], b'1,2,3,4,5'),
+    ({'a': None, 'b': [None]}, b'a:|b:'),
+    ({'a': {'b': {'c': {'d': [1, {'e': False}]}}}}, b'a:b:c:d:1,e:False'),
+    ({'b': 1, 'a': 2, 'c': OrderedDict([('z', 1), ('y', 2)])}, b'a:2|b:1|c:y:2|z:1'),
+    ({'identifier': 'L5AD5g65TDQr1PPHHRoiGf',
+      'reqId': 1513945121191691,
+      'operation': {'type': '1', 'dest': 'GEzcdDLhCpGCYRHW82kjHd',
+                    'raw': '{"name":"Alice"}'},
+      'protocolVersion': 2,
+      'taaAcceptance': {'mechanism': 'click', 'taaDigest': 'abc', 'time': 1513900000}},
+     b'identifier:L5AD5g65TDQr1PPHHRoiGf|operation:dest:GEzcdDLhCpGCYRHW82kjHd|'
+     b'raw:{"name":"Alice"}|type:1|protocolVersion:2|reqId:1513945121191691|'
+     b'taaAcceptance:mechanism:click|taaDigest:abc|time:1513900000'),
+]
+
+
+@pytest.mark.parametrize('obj, expected', GOLDEN)
+def test_serialize_golden(obj, expected):
+    assert expected == serialize_msg_for_signing(obj)
+    assert expected == reference_serialize(obj).encode()
+
+
+def test_serialize_same_as_reference_for_nested_data():
+    obj = {'k{}'.format(i): {'n{}'.format(j): [j, str(j), None, {'x': [j] * 3}]
+                             for j in range(10)}
+           for i in range(20)}
+    obj['list'] = [[[i, {'deep': [i, [i]]}]] for i in range(10)]
+    for ignore in (None, ['k0'], ['k1', 'list', 'missing']):
+        assert reference_serialize(obj, topLevelKeysToIgnore=ignore).encode() == \
+            serialize_msg_for_signing(obj, topLevelKeysToIgnore=ignore)
+
+
+def test_serialize_ignores_only_top_level_keys():
+    obj = {'signature': 'sig', 'a': {'signature': 'nested'}}
+    assert b'a:signature:nested' == serialize_msg_for_signing(obj, topLevelKeysToIgnore=['signature'])
+
+
+def test_serialize_deeply_nested():
+    obj = leaf = {}
+    for _ in range(5000):
+        leaf['a'] = {}
+        leaf = leaf['a']
+    assert b'a:' * 5000 == serialize_msg_for_signing(obj)
+
+
+@pytest.mark.parametrize('obj, objname', [
+    ((1, 2), None),
+    ({'a': [1, {'b': (1,)}]}, 'a.b'),
+    ({'a': {'b': {1, 2}}, 'c': b'first is reported'}, 'a.b'),
+])
+def test_serialize_reports_same_error(obj, objname):
+    with pytest.raises(Exception) as expected:
+        reference_serialize(obj)
+    with pytest.raises(Exception) as actual:
+        serialize_msg_for_signing(obj)
+    assert str(expected.value) == str(actual.value)
+    assert str(actual.value).startswith('invalid type found {}'.format(objname))
+
+
+def test_serialize_memoized():
+    operation = {'type': '1', 'dest': 'a'}
+    msg = {'reqId': 1, 'operation': operation}
+    memo = {}
+    assert serialize_msg_for_signing(msg) == signing_serializer.serialize_memoized(msg, memo)
+    assert memo['operation'] == (operation, 'dest:a|type:1')
+
+    memo['operation'] = (operation, 'memoized')
+    assert b'operation:memoized|reqId:1' == signing_serializer.serialize_memoized(msg, memo)
+
+    msg['operation'] = {'type': '2'}
+    assert b'operation:type:2|reqId:1' == signing_serializer.serialize_memoized(msg, memo)
@@ -128,13 +128,15 @@ class CompactMerkleTree(merkle_tree.MerkleTree):
             for h in hashes:
                 self.hashStore.writeLeaf(h)
 
-        new_node_hashes = self.__push_subtree_hash(subtree_h, root_hash)
-
-        nodes = [(self.tree_size, height, h) for h, height in new_node_hashes]
+        nodes = self.__push_subtree_nodes(subtree_h, root_hash)
         if self.hashStore:
             for node in nodes:
                 self.hashStore.writeNode(node)
 
+    def __push_subtree_nodes(self, subtree_h: int, sub_hash: bytes):
+        new_node_hashes = self.__push_subtree_hash(subtree_h, sub_hash)
+        return [(self.tree_size, height, h) for h, height in new_node_hashes]
+
     def __push_subtree_hash(self, subtree_h: int, sub_hash: bytes):
         size, mintree_h = 1 << (subtree_h - 1), self.__mintree_height
         if subtree_h < mintree_h or mintree_h == 0:
@@ -159,6 +161,56 @@ class CompactMerkleTree(merkle_tree.MerkleTree):
         self._push_subtree([new_leaf])
         return auditPath
 
+    def append_batch(self, new_leaves: List[bytes]) -> List[Tuple[List[bytes], bytes]]:
+        """Append new leaves onto the end of this tree one by one and return
+        the audit path of every leaf along with the root hash of the tree
+        after appending it. Hashes of the leaves and of the new nodes are
+        written to the hash store at once."""
+        leaf_hashes = []
+        nodes = []
+        appended = []
+        for new_leaf in new_leaves:
+            auditPath = list(reversed(self.__hashes))
+            leaf_hash = self.__hasher.hash_leaf(new_leaf)
+            leaf_hashes.append(leaf_hash)
+            nodes.extend(self.__push_subtree_nodes(1, leaf_hash))
+            appended.append((auditPath, self.root_hash))
+
+        if self.hashStore:
+            self.hashStore.writeLeafs(leaf_hashes)
+            self.hashStore.writeNodes(nodes)
+        return appended
+
+    def append_leaves(self, new_leaves: List[bytes]):
+        """Append new leaves onto the end of this tree, the same as
+        `append_batch` but without building audit paths and root hashes of
+        intermediate trees. Full subtrees are combined level by level on
+        a stack of subtree hashes, so every node is hashed once."""
+        hasher = self.__hasher
+        tree_size = self.tree_size
+        hashes = list(self.__hashes)
+        leaf_hashes = []
+        nodes = []
+        for new_leaf in new_leaves:
+            h = hasher.hash_leaf(new_leaf)
+            leaf_hashes.append(h)
+            tree_size += 1
+            # Every trailing zero bit of the new size is a carry of two
+            # full subtrees of the same height into a node
+            height = 1
+            size = tree_size
+            while not size & 1:
+                h = hasher.hash_children(hashes.pop(), h)
+                nodes.append((tree_size, height, h))
+                height += 1
+                size >>= 1
+            hashes.append(h)
+        self._update(tree_size, hashes)
+
+        if self.hashStore:
+            self.hashStore.writeLeafs(leaf_hashes)
+            self.hashStore.writeNodes(nodes)
+
     def extend(self, new_leaves: List[bytes]):
         """Extend this tree with new_leaves on the end.
 
@@ -212,7 +264,12 @@ class CompactMerkleTree(merkle_tree.MerkleTree):
 
     def consistency_proof(self, first: int, second: int):
         return [self.merkle_tree_hash(a, b) for a, b in
-                self._subproof(first, 0, second, True)]
+                self.consistency_proof_ranges(first, second)]
+
+    def consistency_proof_ranges(self, first: int, second: int) -> List[Tuple[int, int]]:
+        """Ranges of leaves whose hashes make up the consistency proof
+        between the trees of sizes `first` and `second`."""
+        return self._subproof(first, 0, second, True)
 
     def inclusion_proof(self, start, end):
         return [self.merkle_tree_hash(a, b)
@@ -292,3 +349,5 @@ class CompactMerkleTree(merkle_tree.MerkleTree):
         self.hashStore.reset()
         self._update(tree_size=0,
                      hashes=())
+        # Cached hashes of the tree are not valid anymore
+        self.merkle_tree_hash.cache_clear()
@@ -1,3 +1,6 @@
+import mmap
+import os
+
 from ledger.hash_stores.hash_store import HashStore
 from storage.binary_file_store import BinaryFileStore
 from storage.kv_store_file import KeyValueStorageFile
@@ -28,6 +31,10 @@ class FileHashStore(HashStore):
         self.nodeSize = nodeSize
         self.leafSize = leafSize
 
+        # Read-only memory maps of the files, entries are only appended to
+        # the files so a map is recreated when an entry beyond it is read
+        self._maps = {}
+
     @property
     def is_persistent(self) -> bool:
         return True
@@ -44,20 +51,51 @@ class FileHashStore(HashStore):
                     size, dataSize))
         store.put(key=None, value=data)
 
-    @staticmethod
-    def read(store: KeyValueStorageFile, entryNo, size):
-        store.db_file.seek((entryNo - 1) * size)
-        return store.db_file.read(size)
+    @classmethod
+    def write_multiple(cls, data, store, size):
+        data = [d if isinstance(d, bytes) else d.encode() for d in data]
+        for d in data:
+            if len(d) != size:
+                raise ValueError(
+                    "Data size not allowed. Size of the data should be "
+                    "{} but instead was {}".format(size, len(d)))
+        # entries are of fixed size, so they can be written as one
+        if data:
+            store.put(key=None, value=b''.join(data))
+
+    def read_range(self, store: KeyValueStorageFile, startpos, endpos, size) -> bytes:
+        """
+        Read entries from `startpos` to `endpos` (both inclusive) as one
+        buffer, it is shorter than requested if some of the entries are
+        not written yet
+        """
+        if startpos < 1:
+            return b''
+        end = endpos * size
+        data_map = self._maps.get(store.db_path)
+        if data_map is None or len(data_map) < end:
+            data_map = self._remap(store)
+            if data_map is None:
+                return b''
+        return data_map[(startpos - 1) * size:end]
+
+    def _remap(self, store: KeyValueStorageFile):
+        self._unmap(store)
+        fileno = store.db_file.fileno()
+        if os.fstat(fileno).st_size == 0:
+            # empty files cannot be mapped
+            return None
+        data_map = self._maps[store.db_path] = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        return data_map
+
+    def _unmap(self, store: KeyValueStorageFile):
+        data_map = self._maps.pop(store.db_path, None)
+        if data_map is not None:
+            data_map.close()
 
     @staticmethod
-    def dataGen(dataFactory, startpos, endpos):
-        i = startpos
-        while True:
-            data = dataFactory(i)
-            yield data
-            i += 1
-            if i <= endpos:
-                break
+    def split(data: bytes, size):
+        return [data[i:i + size] for i in range(0, len(data), size)]
 
     def writeNode(self, node):
         # TODO: Need to have some exception handling around converting to bytes
@@ -72,8 +110,14 @@ class FileHashStore(HashStore):
     def writeLeaf(self, leafHash):
         self.write(leafHash, self.leavesFile, self.leafSize)
 
+    def writeNodes(self, nodes):
+        self.write_multiple([node[2] for node in nodes], self.nodesFile, self.nodeSize)
+
+    def writeLeafs(self, leafHashes):
+        self.write_multiple(leafHashes, self.leavesFile, self.leafSize)
+
     def readNode(self, pos):
-        data = self.read(self.nodesFile, pos, self.nodeSize)
+        data = self.read_range(self.nodesFile, pos, pos, self.nodeSize)
         if len(data) < self.nodeSize:
             raise IndexError("No node at given position")
         # start = int.from_bytes(data[:4], byteorder='little')
@@ -83,16 +127,36 @@ class FileHashStore(HashStore):
         return data
 
     def readLeaf(self, pos):
-        data = self.read(self.leavesFile, pos, self.leafSize)
+        data = self.read_range(self.leavesFile, pos, pos, self.leafSize)
         if len(data) < self.leafSize:
             raise IndexError("No leaf at given position")
         return data
 
     def readLeafs(self, startpos, endpos):
-        return self.dataGen(self.readLeaf, startpos, endpos)
+        return self.split(self.read_leafs_buffer(startpos, endpos), self.leafSize)
 
     def readNodes(self, startpos, endpos):
-        return self.dataGen(self.readNode, startpos, endpos)
+        return self.split(self.read_nodes_buffer(startpos, endpos), self.nodeSize)
+
+    def read_leafs_buffer(self, startpos, endpos) -> bytes:
+        """
+        Return hashes of leaves from `startpos` to `endpos` (both inclusive)
+        concatenated in one buffer
+        """
+        data = self.read_range(self.leavesFile, startpos, endpos, self.leafSize)
+        if len(data) < (endpos - startpos + 1) * self.leafSize:
+            raise IndexError("No leaf at some of given positions")
+        return data
+
+    def read_nodes_buffer(self, startpos, endpos) -> bytes:
+        """
+        Return hashes of nodes from `startpos` to `endpos` (both inclusive)
+        concatenated in one buffer
+        """
+        data = self.read_range(self.nodesFile, startpos, endpos, self.nodeSize)
+        if len(data) < (endpos - startpos + 1) * self.nodeSize:
+            raise IndexError("No node at some of given positions")
+        return data
 
     @property
     def leafCount(self) -> int:
@@ -111,10 +175,15 @@ class FileHashStore(HashStore):
         self.leavesFile.open()
 
     def close(self):
+        self._unmap(self.nodesFile)
+        self._unmap(self.leavesFile)
         self.nodesFile.close()
         self.leavesFile.close()
 
     def reset(self):
+        # Truncating a mapped file makes the map invalid
+        self._unmap(self.nodesFile)
+        self._unmap(self.leavesFile)
         self.nodesFile.reset()
         self.leavesFile.reset()
         return True
@@ -1,6 +1,5 @@
 from abc import abstractmethod
 
-from ledger.util import count_bits_set
 from ledger.util import highest_bit_set
 
 
@@ -29,6 +28,26 @@ class HashStore:
         :param node: tuple of start, height and nodeHash
         """
 
+    def writeLeafs(self, leafHashes):
+        """
+        append the leafHashes to the leaf hash store, stores which can
+        write multiple hashes at once should override it
+
+        :param leafHashes: list of hashes of leaves
+        """
+        for leafHash in leafHashes:
+            self.writeLeaf(leafHash)
+
+    def writeNodes(self, nodes):
+        """
+        append the nodes to the node hash store, stores which can
+        write multiple nodes at once should override it
+
+        :param nodes: list of tuples of start, height and nodeHash
+        """
+        for node in nodes:
+            self.writeNode(node)
+
     @abstractmethod
     def readLeaf(self, pos):
         """
@@ -95,13 +114,16 @@ class HashStore:
         """
         pwr = highest_bit_set(start) - 1
         height = height or pwr
-        if count_bits_set(start) == 1:
-            adj = height - pwr
-            return start - 1 + adj
-        else:
-            c = pow(2, pwr)
-            return cls.getNodePosition(c, pwr) + \
-                cls.getNodePosition(start - c, height)
+        pos = 0
+        # The node goes after all nodes of full subtrees on the left of it,
+        # a full subtree of 2^pwr leaves has 2^pwr - 1 nodes
+        while start & (start - 1):  # start is not a power of 2
+            c = 1 << pwr
+            pos += c - 1
+            start -= c
+            pwr = start.bit_length() - 1
+        adj = height - pwr
+        return pos + start - 1 + adj
 
     @classmethod
     def getPath(cls, seqNo, offset=0):
@@ -121,7 +143,7 @@ class HashStore:
                 return [seqNo - 1], []
             else:
                 return [], []
-        c = pow(2, pwr) + offset
+        c = (1 << pwr) + offset
         leafs, nodes = cls.getPath(seqNo, c)
         nodes.append(cls.getNodePosition(c, pwr))
         return leafs, nodes
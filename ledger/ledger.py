@@ -97,7 +97,8 @@ class Ledger(ImmutableStore):
             self.tree.reset()
         self.seqNo = 0
         for key, entry in self._transactionLog.iterator():
-            if self.txn_serializer != self.hash_serializer:
+            # Some txn log storages return already deserialized entries
+            if self.txn_serializer != self.hash_serializer or not isinstance(entry, (bytes, str)):
                 entry = self.serialize_for_tree(
                     self.txn_serializer.deserialize(entry))
             if isinstance(entry, str):
@@ -131,6 +132,60 @@ class Ledger(ImmutableStore):
 
         return merkle_info
 
+    def add_batch(self, leaves):
+        """
+        Add the leaves (transactions) to the log and the merkle tree, the
+        same as adding them one by one but each storage is written once.
+
+        :return: list of merkle info of every leaf
+        """
+        if not leaves:
+            return []
+        appended = self.tree.append_batch(self._add_batch_to_store(leaves))
+
+        # Audit paths of successive leaves share most of hashes
+        hash_strs = {}
+
+        def hash_to_str(h):
+            s = hash_strs.get(h)
+            if s is None:
+                s = hash_strs[h] = self.hashToStr(h)
+            return s
+
+        merkle_infos = []
+        for audit_path, root_hash in appended:
+            self.seqNo += 1
+            merkle_infos.append({
+                F.seqNo.name: self.seqNo,
+                F.rootHash.name: self.hashToStr(root_hash),
+                F.auditPath.name: [hash_to_str(h) for h in audit_path]
+            })
+        return merkle_infos
+
+    def import_batch(self, leaves):
+        """
+        Add the leaves (transactions) to the log and the merkle tree at once
+        without building merkle info of every leaf, this is meant for bulk
+        import of already trusted transactions.
+        """
+        if not leaves:
+            return
+        self.tree.append_leaves(self._add_batch_to_store(leaves))
+        self.seqNo += len(leaves)
+
+    def _add_batch_to_store(self, leaves):
+        """
+        Write the leaves to the log at once and return them serialized
+        for the tree
+        """
+        serz_leaves = [self.serialize_for_txn_log(leaf) for leaf in leaves]
+        self._transactionLog.setBatch([(str(self.seqNo + i), serz_leaf)
+                                       for i, serz_leaf in enumerate(serz_leaves, 1)])
+
+        if self.txn_serializer == self.hash_serializer and self._transactionLog.is_byte:
+            return serz_leaves
+        return [self.serialize_for_tree(leaf) for leaf in leaves]
+
     def _addToTree(self, leafData, serialized=False):
         serializedLeafData = self.serialize_for_tree(leafData) if \
             not serialized else leafData
@@ -229,7 +284,8 @@ class Ledger(ImmutableStore):
     def reset(self):
         # THIS IS A DESTRUCTIVE ACTION
         self._transactionLog.reset()
-        self.tree.hashStore.reset()
+        self.tree.reset()
+        self.seqNo = 0
 
     # TODO: rename getAllTxn to get_txn_slice with required parameters frm to
     # add get_txn_all without args.
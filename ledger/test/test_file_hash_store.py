@@ -99,3 +99,46 @@ def testRandomAndRepeatedReads(nodesLeaves, tempdir):
     fhs.writeLeaf(leaves[-1])
     fhs.writeLeaf(leaves[0])
     assert leaves[idx] == fhs.readLeaf(idx + 1)
+
+
+def testRangeReads(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    fhs = writtenFhs(tempdir=tempdir, nodes=nodes, leaves=leaves)
+
+    assert fhs.readLeafs(1, len(leaves)) == leaves
+    assert fhs.readLeafs(3, 5) == leaves[2:5]
+    assert fhs.readNodes(2, len(nodes)) == [node[2] for node in nodes[1:]]
+    assert fhs.read_leafs_buffer(4, 6) == b''.join(leaves[3:6])
+    assert fhs.read_nodes_buffer(1, 1) == nodes[0][2]
+
+    with pytest.raises(IndexError):
+        fhs.readLeafs(5, len(leaves) + 1)
+    with pytest.raises(IndexError):
+        fhs.readNode(len(nodes) + 1)
+    with pytest.raises(IndexError):
+        fhs.readLeaf(0)
+
+
+def testReadsAfterWritesAndReset(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    fhs = FileHashStore(tempdir)
+    with pytest.raises(IndexError):
+        fhs.readLeaf(1)
+
+    # Entries written after previous reads are visible
+    for i, leaf in enumerate(leaves):
+        fhs.writeLeaf(leaf)
+        assert fhs.readLeaf(i + 1) == leaf
+    fhs.writeLeafs(leaves)
+    assert fhs.readLeafs(1, 2 * len(leaves)) == leaves + leaves
+
+    fhs.reset()
+    assert fhs.leafCount == 0
+    with pytest.raises(IndexError):
+        fhs.readLeaf(1)
+    fhs.writeLeaf(leaves[-1])
+    assert fhs.readLeafs(1, 1) == [leaves[-1]]
+
+    fhs.close()
+    fhs = FileHashStore(tempdir)
+    assert fhs.readLeaf(1) == leaves[-1]
@@ -141,6 +141,56 @@ def test_recover_merkle_tree_from_hash_store(create_ledger_callable, tempdir,
     assert tree_size_before == restartedLedger.tree.tree_size
 
 
+def test_add_batch_same_as_add(create_ledger_callable, tmpdir_factory,
+                               txn_serializer, hash_serializer):
+    txns = [random_txn(i) for i in range(11)]
+    ledger = create_ledger_callable(txn_serializer, hash_serializer,
+                                    tmpdir_factory.mktemp('').strpath)
+    merkle_infos = [ledger.add(txn) for txn in txns]
+    ledger.stop()
+
+    batch_dir = tmpdir_factory.mktemp('').strpath
+    batch_ledger = create_ledger_callable(txn_serializer, hash_serializer, batch_dir)
+    assert batch_ledger.add_batch([]) == []
+    assert batch_ledger.add_batch(txns[:4]) + batch_ledger.add_batch(txns[4:]) == merkle_infos
+    batch_ledger.stop()
+
+    assert batch_ledger.size == ledger.size
+    assert batch_ledger.root_hash == ledger.root_hash
+    assert batch_ledger.tree.hashes == ledger.tree.hashes
+
+    restartedLedger = create_ledger_callable(txn_serializer, hash_serializer, batch_dir)
+    assert restartedLedger.size == ledger.size
+    assert restartedLedger.root_hash == ledger.root_hash
+    assert [txn for _, txn in restartedLedger.getAllTxn()] == txns
+    restartedLedger.stop()
+
+
+def test_import_batch_same_as_add(create_ledger_callable, tmpdir_factory,
+                                  txn_serializer, hash_serializer):
+    txns = [random_txn(i) for i in range(11)]
+    ledger = create_ledger_callable(txn_serializer, hash_serializer,
+                                    tmpdir_factory.mktemp('').strpath)
+    for txn in txns:
+        ledger.add(txn)
+    ledger.stop()
+
+    import_dir = tmpdir_factory.mktemp('').strpath
+    import_ledger = create_ledger_callable(txn_serializer, hash_serializer, import_dir)
+    import_ledger.import_batch(txns[:4])
+    import_ledger.import_batch(txns[4:])
+    import_ledger.stop()
+
+    assert import_ledger.size == ledger.size
+    assert import_ledger.root_hash == ledger.root_hash
+
+    restartedLedger = create_ledger_callable(txn_serializer, hash_serializer, import_dir)
+    assert restartedLedger.size == ledger.size
+    assert restartedLedger.root_hash == ledger.root_hash
+    assert [txn for _, txn in restartedLedger.getAllTxn()] == txns
+    restartedLedger.stop()
+
+
 def test_recover_ledger_new_fields_to_txns_added(tempdir):
     ledger = create_ledger_text_file_storage(
         CompactSerializer(orderedFields), None, tempdir)
@@ -3,12 +3,7 @@ from enum import Enum
 
 
 def count_bits_set(i):
-    # from https://wiki.python.org/moin/BitManipulation
-    count = 0
-    while i:
-        i &= i - 1
-        count += 1
-    return count
+    return bin(i).count('1')
 
 
 def isPowerOf2(i):
@@ -22,14 +17,8 @@ def lowest_bit_set(i):
 
 
 def highest_bit_set(i):
-    # from https://wiki.python.org/moin/BitManipulation
-    # but with 1-based indexing like in ffs(3) POSIX
-    hi = i
-    hiBit = 0
-    while hi:
-        hi >>= 1
-        hiBit += 1
-    return hiBit
+    # 1-based indexing like in ffs(3) POSIX
+    return i.bit_length()
 
 
 def has_nth_bit_set(number, n):
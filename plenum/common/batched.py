@@ -1,5 +1,5 @@
 from collections import deque
-from typing import Any, Iterable, Dict
+from typing import Any, Iterable, Dict, Mapping, List
 
 from plenum.common.util import z85_to_friendly
 from plenum.common.constants import BATCH, OP_FIELD_NAME
@@ -9,7 +9,10 @@ from stp_core.common.constants import CONNECTION_PREFIX
 from stp_core.crypto.signer import Signer
 from stp_core.common.log import getlogger
 from plenum.common.types import f
+from plenum.common.messages.message_base import MessageBase
 from plenum.common.messages.node_messages import Batch
+from plenum.common.messages.node_message_codec import is_binary_frame, pack_message, \
+    pack_serialized, pack_batch, unpack_messages
 from plenum.common.message_processor import MessageProcessor
 from stp_core.validators.message_length_validator import MessageLenValidator
 from stp_core.common.config.util import getConfig
@@ -17,12 +20,30 @@ from stp_core.common.config.util import getConfig
 logger = getlogger()
 
 
+class SerializedMessage(bytes):
+    """
+    JSON serialized message which also carries its binary form
+    (see `node_message_codec`) for remotes accepting it
+    """
+
+    def __new__(cls, msg_bytes: bytes, binary: bytes):
+        obj = super().__new__(cls, msg_bytes)
+        obj.binary = binary
+        return obj
+
+
 class Batched(MessageProcessor):
     """
     A mixin to allow batching of requests to be send to remotes.
     Assumes a Stack (ZStack or RStack) is mixed
     """
 
+    # Wire protocol announced to remotes (None means JSON only) and names
+    # of remotes accepting messages in the binary form, maintained by the
+    # stack negotiating wire protocols
+    wire_protocol = None
+    wire_protocol_peers = frozenset()
+
     def __init__(self, config=None, metrics=NullMetricsCollector()):
         """
         :param self: 'NodeStacked'
@@ -99,13 +120,15 @@ class Batched(MessageProcessor):
                 removedRemotes.append(rid)
                 continue
             if msgs:
+                binary = dest in self.wire_protocol_peers
                 if self._should_batch(msgs):
                     logger.trace(
                         "{} batching {} msgs to {} into fewer transmissions".
                         format(self, len(msgs), dest))
                     logger.trace("    messages: {}".format(msgs))
                     batches = split_messages_on_batches(list(msgs),
-                                                        self._make_batch,
+                                                        self._make_binary_batch
+                                                        if binary else self._make_batch,
                                                         self._test_batch_len,
                                                         )
                     msgs.clear()
@@ -125,6 +148,8 @@ class Batched(MessageProcessor):
                 else:
                     while msgs:
                         msg = msgs.popleft()
+                        if binary:
+                            msg = self._binary_form(msg)
                         logger.trace(
                             "{} sending msg {} to {}".format(self, msg, dest))
                         self.metrics.add_event(MetricsName.TRANSPORT_BATCH_SIZE, 1)
@@ -154,10 +179,65 @@ class Batched(MessageProcessor):
             serialized_batch = msgs[0]
         return serialized_batch
 
+    def _make_binary_batch(self, msgs):
+        if len(msgs) == 1:
+            return self._binary_form(msgs[0])
+        return pack_batch([msg.binary if isinstance(msg, SerializedMessage) else pack_serialized(msg)
+                           for msg in msgs])
+
+    @staticmethod
+    def _binary_form(msg):
+        return msg.binary if isinstance(msg, SerializedMessage) else msg
+
     def _test_batch_len(self, batch_len):
         return self.msg_len_val.is_len_less_than_limit(batch_len)
 
+    def announce_wire_protocol(self, wire_protocol: str):
+        """
+        Announce the wire protocol the stack can receive besides JSON. It is
+        sent in a batch with just a ping or pong, so nodes not knowing it
+        handle the ping or pong and drop the batch as an empty one.
+        """
+        self.wire_protocol = wire_protocol
+        self._announcing_health_messages = {
+            msg: self.serializeMsg({OP_FIELD_NAME: BATCH,
+                                    f.MSGS.nm: [msg],
+                                    f.SIG.nm: None,
+                                    f.WIRE_PROTOCOL.nm: wire_protocol})
+            for msg in (self.pingMessage, self.pongMessage)}
+        self.healthMessages = self.healthMessages | set(self._announcing_health_messages.values())
+
+    def _send_health_message(self, msg, remote_name):
+        if self.wire_protocol is None:
+            return super()._send_health_message(msg, remote_name)
+        # Not batched with other messages, so that the batch has nothing
+        # but the ping or pong for nodes not knowing the wire protocol
+        return self.transmit(self._announcing_health_messages[msg], remote_name,
+                             timeout=self.messageTimeout, serialized=True)
+
+    def deserializeReceived(self, msg, frm) -> List:
+        if not is_binary_frame(msg):
+            return super().deserializeReceived(msg, frm)
+        if frm not in self.wire_protocol_peers:
+            self.discard(msg, "{} did not announce the binary form".format(z85_to_friendly(frm)),
+                         logMethod=logger.warning)
+            return []
+        try:
+            return unpack_messages(msg)
+        except Exception as ex:
+            logger.error('{} got error {} while unpacking binary message {}'.format(self, ex, msg))
+            return []
+
     def doProcessReceived(self, msg, frm, ident):
+        if isinstance(msg, str):
+            # Serialized message carried by a binary frame
+            if self.handlePingPong(msg, frm, ident):
+                return None
+            try:
+                msg = self.deserializeMsg(msg)
+            except Exception as ex:
+                logger.error('{} got error {} while converting message {} to JSON'.format(self, ex, msg))
+                return None
         if OP_FIELD_NAME in msg and msg[OP_FIELD_NAME] == BATCH:
             if f.MSGS.nm in msg and isinstance(msg[f.MSGS.nm], list):
                 # Removing ping and pong messages from Batch
@@ -167,6 +247,9 @@ class Batched(MessageProcessor):
                     if not r:
                         relevantMsgs.append(m)
 
+                if f.WIRE_PROTOCOL.nm in msg and self.wire_protocol is not None:
+                    self._set_peer_wire_protocol(frm, msg[f.WIRE_PROTOCOL.nm])
+
                 if not relevantMsgs:
                     return None
                 msg[f.MSGS.nm] = relevantMsgs
@@ -180,6 +263,8 @@ class Batched(MessageProcessor):
             part = large_msg_parts.pop()
             part_bytes = self.sign_and_serialize(part, signer)
             if self.msg_len_val.is_len_less_than_limit(len(part_bytes)):
+                if self.wire_protocol_peers:
+                    part_bytes = self._with_binary_form(part, part_bytes, signer)
                 fine_msg_parts.append(part_bytes)
                 continue
             if message_splitter is not None:
@@ -196,6 +281,20 @@ class Batched(MessageProcessor):
 
         return fine_msg_parts, None
 
+    def _with_binary_form(self, msg, msg_bytes, signer):
+        # Validated messages are packed as they are, see `pack_message`
+        payload = msg if signer is None and isinstance(msg, MessageBase) \
+            else self.prepForSending(msg, signer)
+        if not isinstance(payload, Mapping):
+            # Health messages are sent as they are
+            return msg_bytes
+        try:
+            binary = pack_message(payload)
+        except (TypeError, ValueError, OverflowError) as ex:
+            logger.debug('{} cannot pack message {} into binary form: {}'.format(self, msg, ex))
+            return msg_bytes
+        return SerializedMessage(msg_bytes, binary)
+
     def sign_and_serialize(self, msg, signer=None):
         payload = self.prepForSending(msg, signer)
         msg_bytes = self.serializeMsg(payload)
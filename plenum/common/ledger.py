@@ -1,5 +1,6 @@
+from collections import deque
 from copy import copy
-from typing import List, Tuple
+from typing import List, Tuple, Callable
 
 from common.exceptions import PlenumValueError, LogicError
 from ledger.ledger import Ledger as _Ledger
@@ -18,6 +19,13 @@ class Ledger(_Ledger):
         self.uncommittedTxns = []
         self.uncommittedRootHash = None
         self.uncommittedTree = None
+        # Frontiers (size and hashes of full subtrees) of uncommitted tree
+        # after every applied batch, so that reverting batches doesn't
+        # need to hash their transactions again
+        self._uncommitted_frontiers = deque()
+        # Called after the ledger is reset, so that data derived from its
+        # transactions can be dropped
+        self._reset_handlers = []  # type: List[Callable[[], None]]
 
     @property
     def uncommitted_size(self) -> int:
@@ -52,6 +60,8 @@ class Ledger(_Ledger):
         self.uncommittedRootHash = self.uncommittedTree.root_hash
         self.uncommittedTxns.extend(txns)
         if txns:
+            self._uncommitted_frontiers.append((self.uncommittedTree.tree_size,
+                                                self.uncommittedTree.hashes))
             return (uncommittedSize + 1, uncommittedSize + len(txns)), txns
         else:
             return (uncommittedSize, uncommittedSize), txns
@@ -64,6 +74,22 @@ class Ledger(_Ledger):
         merkle_info.pop(F.seqNo.name, None)
         return merkle_info
 
+    def add_batch(self, txns):
+        for i, txn in enumerate(txns):
+            if get_seq_no(txn) is None:
+                self._append_seq_no([txn], self.seqNo + i)
+        merkle_infos = super().add_batch(txns)
+        # seqNo is part of the transaction itself, so no need to duplicate it here
+        for merkle_info in merkle_infos:
+            merkle_info.pop(F.seqNo.name, None)
+        return merkle_infos
+
+    def import_batch(self, txns):
+        for i, txn in enumerate(txns):
+            if get_seq_no(txn) is None:
+                self._append_seq_no([txn], self.seqNo + i)
+        super().import_batch(txns)
+
     def _append_seq_no(self, txns, start_seq_no):
         # TODO: Fix name `start_seq_no`, it is misleading. The seq no start from `start_seq_no`+1
         seq_no = start_seq_no
@@ -80,13 +106,14 @@ class Ledger(_Ledger):
         numbers of the committed txns
         """
         committedSize = self.size
-        committedTxns = []
-        for txn in self.uncommittedTxns[:count]:
-            txn.update(self.append(txn))
-            committedTxns.append(txn)
+        committedTxns = self.uncommittedTxns[:count]
+        for txn, merkle_info in zip(committedTxns, self.add_batch(committedTxns)):
+            txn.update(merkle_info)
         self.uncommittedTxns = self.uncommittedTxns[count:]
         logger.debug('Committed {} txns, {} are uncommitted'.
                      format(len(committedTxns), len(self.uncommittedTxns)))
+        while self._uncommitted_frontiers and self._uncommitted_frontiers[0][0] <= self.size:
+            self._uncommitted_frontiers.popleft()
         if not self.uncommittedTxns:
             self.uncommittedTree = None
             self.uncommittedRootHash = None
@@ -106,8 +133,6 @@ class Ledger(_Ledger):
         :param count:
         :return:
         """
-        # TODO: This can be optimised if multiple discards are combined
-        # together since merkle root computation will be done only once.
         if count == 0:
             return
         if count > len(self.uncommittedTxns):
@@ -115,17 +140,35 @@ class Ledger(_Ledger):
                              format(count, len(self.uncommittedTxns)))
         old_hash = self.uncommittedRootHash
         self.uncommittedTxns = self.uncommittedTxns[:-count]
+        uncommitted_size = self.uncommitted_size
+        while self._uncommitted_frontiers and self._uncommitted_frontiers[-1][0] > uncommitted_size:
+            self._uncommitted_frontiers.pop()
         if not self.uncommittedTxns:
             self.uncommittedTree = None
             self.uncommittedRootHash = None
         else:
-            self.uncommittedTree = self.treeWithAppliedTxns(
-                self.uncommittedTxns)
+            self.uncommittedTree = self._uncommitted_tree_of_size(uncommitted_size)
             self.uncommittedRootHash = self.uncommittedTree.root_hash
         logger.info('Discarding {} txns and root hash {} and new root hash is {}. {} are still uncommitted'.
                     format(count, Ledger.hashToStr(old_hash), Ledger.hashToStr(self.uncommittedRootHash),
                            len(self.uncommittedTxns)))
 
+    def _uncommitted_tree_of_size(self, size: int):
+        """
+        Return uncommitted tree with `size` leaves restored from the closest
+        frontier, only transactions which are after it are hashed (if any)
+        """
+        if self._uncommitted_frontiers:
+            frontier_size, hashes = self._uncommitted_frontiers[-1]
+            tree = copy(self.tree)
+            tree._update(frontier_size, hashes)
+        else:
+            tree = self.tree
+        if tree.tree_size < size:
+            tree = self.treeWithAppliedTxns(self.uncommittedTxns[tree.tree_size - self.size:], tree)
+            self._uncommitted_frontiers.append((tree.tree_size, tree.hashes))
+        return tree
+
     def treeWithAppliedTxns(self, txns: List, currentTree=None):
         """
         Return a copy of merkle tree after applying the txns
@@ -142,10 +185,20 @@ class Ledger(_Ledger):
             tempTree.append(s)
         return tempTree
 
+    def register_reset_handler(self, handler: Callable[[], None]):
+        self._reset_handlers.append(handler)
+
+    def reset(self):
+        super().reset()
+        self.reset_uncommitted()
+        for handler in self._reset_handlers:
+            handler()
+
     def reset_uncommitted(self):
         self.uncommittedTxns = []
         self.uncommittedRootHash = None
         self.uncommittedTree = None
+        self._uncommitted_frontiers.clear()
 
     def get_uncommitted_txns(self):
         return self.uncommittedTxns
@@ -166,3 +219,50 @@ class Ledger(_Ledger):
         if seq_no > self.size:
             return self.uncommittedTxns[seq_no - self.size - 1]
         return self.getBySeqNo(seq_no)
+
+
+class LedgerView:
+    """
+    Read-only view of committed transactions of a ledger pinned to its
+    current size. Committed transactions and hashes of their ranges never
+    change, so the view can be read from other threads while the ledger is
+    being appended in the main thread (given that storages of the ledger
+    support concurrent reads, like RocksDB does).
+    """
+
+    def __init__(self, ledger: _Ledger):
+        self._ledger = ledger
+        self._size = ledger.size
+        self._root_hash = ledger.root_hash
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def root_hash(self) -> str:
+        return self._root_hash
+
+    @staticmethod
+    def hashToStr(h):
+        return _Ledger.hashToStr(h)
+
+    def getBySeqNo(self, seqNo):
+        if not 0 < int(seqNo) <= self._size:
+            return None
+        return self._ledger.getBySeqNo(seqNo)
+
+    def __getitem__(self, seqNo):
+        return self.getBySeqNo(seqNo)
+
+    def merkleInfo(self, seqNo):
+        if int(seqNo) > self._size:
+            raise PlenumValueError('seqNo', seqNo, '<= {}'.format(self._size))
+        return self._ledger.merkleInfo(seqNo)
+
+    def getAllTxn(self, frm: int = None, to: int = None):
+        to = self._size if to is None else min(to, self._size)
+        return self._ledger.getAllTxn(frm=frm, to=to)
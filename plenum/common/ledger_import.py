@@ -0,0 +1,201 @@
+"""
+Offline bulk import of a trusted ledger dump into an empty ledger of a node,
+so that a new node doesn't have to catch up the whole ledger over network.
+
+A dump is either a stream of msgpack serialized transactions or a JSON file
+with a transaction per line (`.json`, `.jsonl` or `.txt`). Transactions are
+written to the ledger in chunks, each chunk with one write per storage, and
+the resulting ledger is checked against the expected root and size, which
+can be taken from an audit ledger transaction. State of the ledger is
+replayed from the imported transactions in memory and built at once with
+`PruningState.bulk_load`, its root is checked against the one recorded in
+the audit ledger transaction as well.
+"""
+import json
+import os
+from contextlib import ExitStack
+from typing import Iterable, Iterator, Optional, Tuple, Callable, List
+
+from common.exceptions import PlenumValueError
+from common.serializers.serialization import ledger_txn_serializer
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.common.constants import AUDIT_TXN_LEDGER_ROOT, AUDIT_TXN_LEDGERS_SIZE, AUDIT_TXN_STATE_ROOT, \
+    POOL_LEDGER_ID, DOMAIN_LEDGER_ID, CONFIG_LEDGER_ID
+from plenum.common.ledger import Ledger
+from plenum.common.txn_util import get_payload_data, get_seq_no, get_type
+from plenum.server.database_manager import DatabaseManager
+from plenum.server.request_handlers.node_handler import NodeHandler
+from plenum.server.request_handlers.nym_handler import NymHandler
+from plenum.server.request_handlers.txn_author_agreement_aml_handler import TxnAuthorAgreementAmlHandler
+from plenum.server.request_handlers.txn_author_agreement_handler import TxnAuthorAgreementHandler
+from plenum.server.request_managers.write_request_manager import WriteRequestManager
+from state.pruning_state import PruningState
+from state.trie.pruning_trie import BLANK_ROOT
+from storage.helper import initHashStore, initKeyValueStorage
+from stp_core.common.log import getlogger
+
+logger = getlogger()
+
+JSON_DUMP_EXTENSIONS = ('.json', '.jsonl', '.txt')
+
+
+class LedgerImportError(Exception):
+    pass
+
+
+def read_txns_dump(path: str) -> Iterator[dict]:
+    """
+    Stream transactions from a dump file one by one
+    """
+    if os.path.splitext(path)[1] in JSON_DUMP_EXTENSIONS:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    else:
+        with open(path, 'rb') as f:
+            yield from ledger_txn_serializer.get_lines(f)
+
+
+def ledger_summary_from_audit_txn(audit_txn: dict, ledger_id: int) -> Tuple[int, str, Optional[str]]:
+    """
+    Return size, root hash and state root hash (None for ledgers without
+    state) of the ledger recorded in the audit txn
+    """
+    data = get_payload_data(audit_txn)
+    # Integer keys become strings when audit txn is dumped to JSON
+    sizes = {int(k): v for k, v in data[AUDIT_TXN_LEDGERS_SIZE].items()}
+    roots = {int(k): v for k, v in data[AUDIT_TXN_LEDGER_ROOT].items()}
+    state_roots = {int(k): v for k, v in data.get(AUDIT_TXN_STATE_ROOT, {}).items()}
+    if ledger_id not in sizes:
+        raise PlenumValueError('audit_txn', audit_txn, 'size of ledger {}'.format(ledger_id))
+    root = roots.get(ledger_id)
+    if not isinstance(root, str):
+        # Audit txn refers to a root recorded in an earlier audit txn
+        raise PlenumValueError('audit_txn', audit_txn, 'root hash of ledger {}'.format(ledger_id))
+    return sizes[ledger_id], root, state_roots.get(ledger_id)
+
+
+def create_node_ledger(data_dir: str, name: str, config) -> Ledger:
+    """
+    Create a ledger with the same storages the node uses for ledger `name`
+    ('pool', 'domain', 'config' or 'audit')
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    hash_store = initHashStore(data_dir, name, config)
+    return Ledger(CompactMerkleTree(hashStore=hash_store),
+                  dataDir=data_dir,
+                  fileName=getattr(config, "{}TransactionsFile".format(name)),
+                  ensureDurability=config.EnsureLedgerDurability)
+
+
+def create_node_state(data_dir: str, name: str, config) -> PruningState:
+    """
+    Create a state with the same storage the node uses for state `name`
+    ('pool', 'domain' or 'config')
+    """
+    return PruningState(initKeyValueStorage(getattr(config, "{}StateStorage".format(name)),
+                                            data_dir,
+                                            getattr(config, "{}StateDbName".format(name)),
+                                            db_config=config.db_state_config))
+
+
+def create_state_updater(ledger_id: int, ledger: Ledger, state: PruningState,
+                         config) -> Callable[[dict], None]:
+    """
+    Return a function updating the state with a committed txn of the ledger
+    by plenum request handlers, the same way a node recreates state from
+    ledger. Txns of other types (added by plugins) are not supported.
+    """
+    db_manager = DatabaseManager()
+    db_manager.register_new_database(ledger_id, ledger, state)
+    write_manager = WriteRequestManager(db_manager)
+    if ledger_id == POOL_LEDGER_ID:
+        write_manager.register_req_handler(NodeHandler(db_manager, None))
+    elif ledger_id == DOMAIN_LEDGER_ID:
+        write_manager.register_req_handler(NymHandler(config, db_manager))
+    elif ledger_id == CONFIG_LEDGER_ID:
+        write_manager.register_req_handler(TxnAuthorAgreementAmlHandler(db_manager))
+        write_manager.register_req_handler(TxnAuthorAgreementHandler(db_manager))
+
+    def update_state(txn):
+        if get_type(txn) not in write_manager.request_handlers:
+            raise LedgerImportError('cannot replay state with transaction of type {}'.format(get_type(txn)))
+        write_manager.update_state(txn, isCommitted=True)
+
+    return update_state
+
+
+def import_txns(ledger: Ledger, txns: Iterable[dict],
+                expected_size: Optional[int] = None,
+                expected_root: Optional[str] = None,
+                chunk_size: int = 10000,
+                state: Optional[PruningState] = None,
+                update_state: Optional[Callable[[dict], None]] = None,
+                expected_state_root: Optional[str] = None) -> int:
+    """
+    Import transactions into an empty ledger and check that the ledger
+    got the expected size and root hash. If `state` is given, it must be
+    empty, it is updated with every imported transaction by `update_state`
+    and checked to get the expected root hash. If any check fails, the
+    ledger and the state are reset.
+
+    :return: number of imported transactions
+    """
+    if ledger.size != 0:
+        raise LedgerImportError('ledger already has {} transactions'.format(ledger.size))
+    if state is not None and not state.isEmpty:
+        raise LedgerImportError('state is not empty')
+
+    try:
+        with ExitStack() as stack:
+            if state is not None:
+                # Values are kept in memory and the trie is built from them
+                # once all txns are imported and the ledger is checked
+                stack.enter_context(state.bulk_load())
+            _import_txns(ledger, txns, chunk_size, update_state if state is not None else None)
+            if expected_size is not None and ledger.size != expected_size:
+                raise LedgerImportError('imported {} transactions instead of {}'.format(ledger.size, expected_size))
+            if expected_root is not None and ledger.root_hash != expected_root:
+                raise LedgerImportError('ledger root hash {} does not match expected {}'
+                                        .format(ledger.root_hash, expected_root))
+    except Exception:
+        ledger.reset()
+        raise
+
+    if state is not None:
+        state_root = Ledger.hashToStr(state.committedHeadHash)
+        logger.info('replayed state of {} transactions, state root hash {}'.format(ledger.size, state_root))
+        if expected_state_root is not None and state_root != expected_state_root:
+            ledger.reset()
+            state.revertToHead(BLANK_ROOT)
+            state.commit(rootHash=BLANK_ROOT)
+            raise LedgerImportError('state root hash {} does not match expected {}'
+                                    .format(state_root, expected_state_root))
+    return ledger.size
+
+
+def _import_txns(ledger: Ledger, txns: Iterable[dict], chunk_size: int,
+                 update_state: Optional[Callable[[dict], None]]):
+    chunk = []
+    for txn in txns:
+        seq_no, expected_seq_no = get_seq_no(txn), ledger.size + len(chunk) + 1
+        if seq_no is not None and seq_no != expected_seq_no:
+            raise LedgerImportError('expected transaction with seqNo {} but got {}'.format(expected_seq_no, seq_no))
+        chunk.append(txn)
+        if len(chunk) >= chunk_size:
+            _import_chunk(ledger, chunk, update_state)
+            logger.info('imported {} transactions'.format(ledger.size))
+            chunk = []
+    _import_chunk(ledger, chunk, update_state)
+    logger.info('imported {} transactions, root hash {}'.format(ledger.size, ledger.root_hash))
+
+
+def _import_chunk(ledger: Ledger, chunk: List[dict], update_state: Optional[Callable[[dict], None]]):
+    # seqNos are appended to txns without them while importing, so state
+    # is updated with txns as they are stored in the ledger
+    ledger.import_batch(chunk)
+    if update_state is not None:
+        for txn in chunk:
+            update_state(txn)
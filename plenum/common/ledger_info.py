@@ -8,7 +8,8 @@ class LedgerInfo:
                  preCatchupStartClbk,
                  postCatchupCompleteClbk,
                  postTxnAddedToLedgerClbk,
-                 verifier):
+                 verifier,
+                 postTxnsAddedToLedgerClbk=None):
 
         self.id = id
         self.ledger = ledger
@@ -16,6 +17,7 @@ class LedgerInfo:
         self.preCatchupStartClbk = preCatchupStartClbk
         self.postCatchupCompleteClbk = postCatchupCompleteClbk
         self.postTxnAddedToLedgerClbk = postTxnAddedToLedgerClbk
+        self.postTxnsAddedToLedgerClbk = postTxnsAddedToLedgerClbk
         self.verifier = verifier
 
     @property
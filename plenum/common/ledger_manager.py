@@ -12,6 +12,7 @@ from plenum.common.metrics_collector import MetricsCollector, NullMetricsCollect
 from plenum.common.util import compare_3PC_keys
 from plenum.server.catchup.node_catchup_data import CatchupNodeDataProvider
 from plenum.server.catchup.node_leecher_service import NodeLeecherService
+from plenum.server.catchup.proof_cache import ProofCache
 from plenum.server.catchup.seeder_service import ClientSeederService, NodeSeederService
 from plenum.server.catchup.utils import LedgerCatchupStart, LedgerCatchupComplete, NodeCatchupComplete
 from stp_core.common.log import getlogger
@@ -42,11 +43,14 @@ class LedgerManager:
         config = getConfig()
         provider = CatchupNodeDataProvider(owner)
 
+        # Clients and nodes ask for proofs of the same ranges of ledgers
+        self._proof_cache = ProofCache(size=config.CATCHUP_PROOF_CACHE_SIZE, metrics=self.metrics)
+
         self._client_seeder_inbox, rx = create_direct_channel()
-        self._client_seeder = ClientSeederService(rx, provider)
+        self._client_seeder = ClientSeederService(rx, provider, self._proof_cache)
 
         self._node_seeder_inbox, rx = create_direct_channel()
-        self._node_seeder = NodeSeederService(rx, provider)
+        self._node_seeder = NodeSeederService(rx, provider, self._proof_cache)
 
         leecher_outbox_tx, leecher_outbox_rx = create_direct_channel()
         router = Router(leecher_outbox_rx)
@@ -77,7 +81,8 @@ class LedgerManager:
     def addLedger(self, ledger_id: int, ledger: Ledger,
                   preCatchupStartClbk: Optional[Callable] = None,
                   postCatchupCompleteClbk: Optional[Callable] = None,
-                  postTxnAddedToLedgerClbk: Optional[Callable] = None):
+                  postTxnAddedToLedgerClbk: Optional[Callable] = None,
+                  postTxnsAddedToLedgerClbk: Optional[Callable] = None):
 
         if ledger_id in self.ledgerRegistry:
             logger.error("{} already present in ledgers so cannot replace that ledger".format(ledger_id))
@@ -89,10 +94,12 @@ class LedgerManager:
             preCatchupStartClbk=preCatchupStartClbk,
             postCatchupCompleteClbk=postCatchupCompleteClbk,
             postTxnAddedToLedgerClbk=postTxnAddedToLedgerClbk,
+            postTxnsAddedToLedgerClbk=postTxnsAddedToLedgerClbk,
             verifier=MerkleVerifier(ledger.hasher),
         )
 
         self._node_leecher.register_ledger(ledger_id)
+        self._proof_cache.register_ledger(ledger_id, ledger)
 
     def ledger_info(self, lid: int) -> Optional[LedgerInfo]:
         return self.ledgerRegistry.get(lid)
@@ -1,12 +1,79 @@
 from collections import OrderedDict
-from operator import itemgetter
 from typing import Mapping, Dict
 
 from plenum.common.types import f
 
 from plenum.common.constants import OP_FIELD_NAME, SCHEMA_IS_STRICT
 from plenum.common.exceptions import MissingProtocolVersionError
-from plenum.common.messages.fields import FieldValidator
+from plenum.common.messages.fields import FieldValidator, FieldBase
+
+
+class CompiledSchema:
+    """
+    Schema of a message class prepared for validation: names of fields
+    in schema order, names of required fields and validation functions
+    of fields by name
+    """
+
+    __slots__ = ('schema', 'names', 'required', 'validators')
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.names = tuple(name for name, _ in schema)
+        self.required = tuple(name for name, field in schema if not field.optional)
+        self.validators = {name: _field_validator(field) for name, field in schema}
+
+
+def _field_validator(field):
+    """
+    Returns a function doing the same as `field.validate` but without
+    going through the generic type check for every value
+    """
+    if not isinstance(field, FieldBase) or type(field).validate is not FieldBase.validate:
+        return field.validate
+
+    nullable = field.nullable
+    base_types = field._base_types
+    specific_validation = field._specific_validation
+    wrong_type_msg = field._wrong_type_msg
+
+    if base_types is None:
+        def validate(val):
+            if nullable and val is None:
+                return None
+            return specific_validation(val)
+    else:
+        base_types = tuple(base_types)
+
+        def validate(val):
+            if nullable and val is None:
+                return None
+            if not isinstance(val, base_types):
+                return wrong_type_msg(val)
+            return specific_validation(val)
+    return validate
+
+
+class FieldAttribute:
+    """
+    Gives access to a field of a message as to an attribute without
+    falling back to `__getattr__`. It is a non-data descriptor, so
+    a value assigned to the attribute of an instance overrides it.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return instance._fields[self.name]
+        except KeyError:
+            # `__getattr__` raises the error
+            raise AttributeError(self.name) from None
 
 
 class MessageValidator(FieldValidator):
@@ -15,6 +82,7 @@ class MessageValidator(FieldValidator):
 
     schema = ()
     schema_is_strict = SCHEMA_IS_STRICT
+    _compiled = None
 
     def __init__(self, schema_is_strict=SCHEMA_IS_STRICT, optional: bool = False):
         self.schema_is_strict = schema_is_strict
@@ -28,21 +96,44 @@ class MessageValidator(FieldValidator):
     def _validate_fields_with_schema(self, dct, schema):
         if not isinstance(dct, dict):
             self._raise_invalid_type(dct)
-        schema_dct = dict(schema)
-        required_fields = filter(lambda x: not x[1].optional, schema)
-        required_field_names = map(lambda x: x[0], required_fields)
-        missed_required_fields = set(required_field_names) - set(dct)
-        if missed_required_fields:
-            self._raise_missed_fields(*missed_required_fields)
+        compiled = self._compiled_schema(schema)
+        if compiled is not None:
+            required, validators = compiled.required, compiled.validators
+        else:
+            required = [name for name, field in schema if not field.optional]
+            validators = {name: field.validate for name, field in schema}
+        for name in required:
+            if name not in dct:
+                self._raise_missed_fields(*(set(required) - set(dct)))
         for k, v in dct.items():
-            if k not in schema_dct:
+            validate = validators.get(k)
+            if validate is None:
                 if self.schema_is_strict:
                     self._raise_unknown_fields(k, v)
             else:
-                validation_error = schema_dct[k].validate(v)
+                validation_error = validate(v)
                 if validation_error:
                     self._raise_invalid_fields(k, v, validation_error)
 
+    def _compiled_schema(self, schema):
+        """
+        Returns the schema of the class compiled once, or None if `schema`
+        is not the schema of the class (it is set for the instance)
+        """
+        cls = type(self)
+        if schema is not cls.schema:
+            return None
+        compiled = cls._compiled
+        if compiled is None or compiled.schema is not schema:
+            # a subclass with its own schema or the schema was replaced
+            compiled = cls._compile_schema(schema)
+            cls._compiled = compiled
+        return compiled
+
+    @classmethod
+    def _compile_schema(cls, schema):
+        return CompiledSchema(schema)
+
     def _validate_message(self, dct):
         return None
 
@@ -79,6 +170,15 @@ class MessageValidator(FieldValidator):
 
 class MessageBase(Mapping, MessageValidator):
     typename = None
+    # Fields which are enough to decide whether to stash or discard
+    # the message, see `create_lazily`
+    header_fields = ()
+    _deferred_input = None
+    _deferred_error = None
+
+    def __new__(cls, *args, **kwargs):
+        # messages are not generic, so `typing.Mapping.__new__` is not needed
+        return object.__new__(cls)
 
     def __init__(self, *args, **kwargs):
         if args and kwargs:
@@ -98,23 +198,101 @@ class MessageBase(Mapping, MessageValidator):
 
         super().__init__()
         input_as_dict = kwargs if kwargs else self._join_with_schema(args)
+        self._init_fields(input_as_dict)
 
+    @classmethod
+    def create_lazily(cls, **kwargs):
+        """
+        Create a message validating only its header fields. The rest of
+        fields are validated when the content of the message is accessed
+        for the first time or by `validate_deferred`, so messages which are
+        stashed or discarded by header fields are never fully validated.
+        """
+        kwargs.pop(OP_FIELD_NAME, None)
+        msg = cls.__new__(cls)
+        MessageValidator.__init__(msg)
+        compiled = msg._compiled_schema(msg.schema)
+        if compiled is None or not cls.header_fields or \
+                (msg.schema_is_strict and len(kwargs) > len(msg.schema)):
+            return cls(**kwargs)
+        for name in cls.header_fields:
+            if name not in kwargs or compiled.validators[name](kwargs[name]):
+                # fails the same way as the full validation
+                return cls(**kwargs)
+        for name in cls.header_fields:
+            # header fields are read without triggering the validation
+            object.__setattr__(msg, name, kwargs[name])
+        msg._deferred_input = kwargs
+        return msg
+
+    def validate_deferred(self):
+        """
+        Complete the validation of a message created by `create_lazily`,
+        does nothing if the message is already validated
+
+        :raises TypeError: if the message is not valid, the error of the
+        first validation is raised again without validating the message
+        """
+        if self._deferred_error is not None:
+            raise self._deferred_error
+        input_as_dict = self._deferred_input
+        if input_as_dict is None:
+            return
+        try:
+            self._init_fields(input_as_dict)
+        except TypeError as ex:
+            self._deferred_error = ex
+            raise
+        for name in self.header_fields:
+            object.__delattr__(self, name)
+        self._deferred_input = None
+
+    def _init_fields(self, input_as_dict):
         self.validate(input_as_dict)
 
         input_as_dict = self._post_process(input_as_dict)
 
-        self._fields = OrderedDict(
+        self._fields = OrderedDict([
             (name, input_as_dict[name])
-            for name, _ in self.schema
-            if name in input_as_dict)
+            for name in self._field_names()
+            if name in input_as_dict])
+
+    @classmethod
+    def _compile_schema(cls, schema):
+        compiled = super()._compile_schema(schema)
+        for name in compiled.names:
+            # names of methods and class attributes are not overridden
+            # the same way as with `__getattr__`
+            if not hasattr(cls, name):
+                setattr(cls, name, FieldAttribute(name))
+        return compiled
+
+    def _field_names(self):
+        compiled = self._compiled_schema(self.schema)
+        if compiled is not None:
+            return compiled.names
+        return [name for name, _ in self.schema]
 
     def _join_with_schema(self, args):
-        return dict(zip(map(itemgetter(0), self.schema), args))
+        return dict(zip(self._field_names(), args))
 
     def _post_process(self, input_as_dict: Dict) -> Dict:
         return input_as_dict
 
     def __getattr__(self, item):
+        if item == '_fields':
+            # only a message created by `create_lazily` has no fields
+            # until it is validated, an invalid one has no attributes
+            # besides header fields, so `hasattr` and `getattr` with
+            # a default work with it
+            try:
+                self.validate_deferred()
+            except TypeError as ex:
+                raise AttributeError(
+                    "'{}' object is not valid: {}"
+                    .format(self.__class__.__name__, ex)
+                ) from ex
+            return object.__getattribute__(self, '_fields')
         if item in self._fields:
             return self._fields[item]
         raise AttributeError(
@@ -163,6 +341,9 @@ class MessageBase(Mapping, MessageValidator):
         return self._fields.values()
 
     def __str__(self):
+        if self._deferred_input is not None:
+            # logging a message should not validate it
+            return "{}{}".format(self.typename, self._deferred_input)
         return "{}{}".format(self.typename, dict(self.items()))
 
     def __repr__(self):
@@ -0,0 +1,238 @@
+"""
+Compact binary (msgpack) form of node-to-node messages.
+
+A message is packed as an array `[op, value1, value2, ...]` where values go
+in the order of fields in the `schema` of the message class, so names of
+fields are not transmitted. Optional fields which are absent in the message
+are packed as a special ext value (trailing ones are just dropped).
+Messages which are not known to `node_message_factory` are packed as maps.
+
+A binary frame is either one packed message or a batch: an array starting
+with nil followed by packed messages. Messages are packed when they are sent,
+a batch is made by just concatenating them. Besides packed messages a batch
+can contain already serialized messages (JSON or health messages) packed as
+strings.
+
+Values are converted the same way JSON serialization does it (keys of maps
+become strings, nested messages become maps of their fields), so that
+receivers get exactly the same messages regardless of the form used by
+the sender. Values of fields which schema allows to have only scalars
+(or lists of scalars) are packed as they are when the message is validated.
+"""
+import hashlib
+import struct
+from typing import Mapping, List, Tuple, Sequence, Optional
+
+import msgpack
+
+from plenum.common.constants import OP_FIELD_NAME
+from plenum.common.exceptions import InvalidNodeOp
+from plenum.common.messages.fields import IterableField
+from plenum.common.messages.message_base import MessageBase
+from plenum.common.messages.node_message_factory import node_message_factory
+
+_ABSENT_EXT_CODE = 0
+_ABSENT_EXT = msgpack.ExtType(_ABSENT_EXT_CODE, b'')
+_ABSENT = object()
+
+_PLAIN_TYPES = {str, int, float, bool, type(None), bytes}
+
+_BATCH_MARKER = b'\xc0'  # nil
+
+# Node stacks are serviced by one thread so the packer can be shared
+_packer = msgpack.Packer(use_bin_type=False)
+
+# Field names of messages and flags of fields having only scalar values
+# by op, classes of messages are registered in `node_message_factory`
+# before any message is sent or received
+_schemas_cache = {}
+
+
+def is_binary_frame(frame: bytes) -> bool:
+    """
+    Packed messages and batches start with bytes >= 0x80 while JSON
+    and health messages are ASCII
+    """
+    return len(frame) > 0 and frame[0] >= 0x80
+
+
+def schema_fingerprint() -> str:
+    """
+    Digest of schemas of all known node messages, peers can use the
+    binary form only if their schemas are the same
+    """
+    h = hashlib.sha256()
+    for cls in sorted(node_message_factory.get_types(), key=lambda cls: cls.typename):
+        h.update('{}:{};'.format(cls.typename, ','.join(name for name, _ in cls.schema)).encode())
+    return h.hexdigest()[:16]
+
+
+def pack_message(msg: Mapping) -> bytes:
+    """
+    Pack a message (`MessageBase`) or its dict form
+
+    :raises TypeError, ValueError or OverflowError: if the message contains
+        values which cannot be packed
+    """
+    if isinstance(msg, dict):
+        op = msg.get(OP_FIELD_NAME)
+        fields = msg
+        validated = False
+    else:
+        op = msg.typename
+        fields = msg._fields
+        validated = True
+
+    schema = _schema(op)
+    if schema is None:
+        return _packer.pack(_normalize(_with_op(msg) if validated else msg))
+
+    values = [op]
+    present = 0
+    for name, scalar in zip(*schema):
+        if name in fields:
+            value = fields[name]
+            if not (scalar and validated) and type(value) not in _PLAIN_TYPES:
+                value = _normalize(value)
+            values.append(value)
+            present += 1
+        else:
+            values.append(_ABSENT_EXT)
+    if present != len(fields) - (0 if validated else 1):
+        # the message has fields which are not in the schema
+        return _packer.pack(_normalize(_with_op(msg) if validated else msg))
+    while values[-1] is _ABSENT_EXT:
+        values.pop()
+    return _packer.pack(values)
+
+
+def pack_serialized(msg: bytes) -> bytes:
+    """
+    Pack an already serialized message to be put in a batch
+    """
+    return _packer.pack(msg)
+
+
+def pack_batch(packed_msgs: Sequence[bytes]) -> bytes:
+    """
+    Make a binary batch of packed messages
+    """
+    return _array_header(len(packed_msgs) + 1) + _BATCH_MARKER + b''.join(packed_msgs)
+
+
+def unpack_messages(frame: bytes) -> List:
+    """
+    Unpack all messages of a binary frame.
+    Packed messages are returned as dicts, serialized ones as strings.
+
+    :raises ValueError: if the frame is malformed
+    """
+    size = len(frame)
+    unpacked = msgpack.unpackb(frame,
+                               encoding='utf-8',
+                               ext_hook=_ext_hook,
+                               max_str_len=size,
+                               max_bin_len=size,
+                               max_array_len=size,
+                               max_map_len=size,
+                               max_ext_len=size)
+    if isinstance(unpacked, list) and unpacked and unpacked[0] is None:
+        return [_from_packed(item) for item in unpacked[1:]]
+    return [_from_packed(unpacked)]
+
+
+def _from_packed(item):
+    if not isinstance(item, list):
+        return item
+    if not item:
+        raise ValueError("packed message has no op")
+    op = item[0]
+    schema = _schema(op)
+    if schema is None:
+        raise ValueError("packed message has unknown op {}".format(op))
+    names = schema[0]
+    if len(item) - 1 > len(names):
+        raise ValueError("packed message {} has {} values while its schema has {} fields"
+                         .format(op, len(item) - 1, len(names)))
+    msg = {OP_FIELD_NAME: op}
+    for name, value in zip(names, item[1:]):
+        if value is not _ABSENT:
+            msg[name] = value
+    return msg
+
+
+def _ext_hook(code, data):
+    if code == _ABSENT_EXT_CODE:
+        return _ABSENT
+    raise ValueError("unknown ext type {}".format(code))
+
+
+def _array_header(size: int) -> bytes:
+    if size < 16:
+        return bytes((0x90 | size,))
+    if size < 2 ** 16:
+        return b'\xdc' + struct.pack('>H', size)
+    return b'\xdd' + struct.pack('>I', size)
+
+
+def _with_op(msg: MessageBase) -> dict:
+    fields = dict(msg.items())
+    fields[OP_FIELD_NAME] = msg.typename
+    return fields
+
+
+def _schema(op) -> Optional[Tuple[Tuple[str, ...], Tuple[bool, ...]]]:
+    if not isinstance(op, str):
+        return None
+    schema = _schemas_cache.get(op)
+    if schema is None:
+        try:
+            cls = node_message_factory.get_type(op)
+        except InvalidNodeOp:
+            return None
+        schema = _schemas_cache[op] = (tuple(name for name, _ in cls.schema),
+                                       tuple(_is_scalar(field) for _, field in cls.schema))
+    return schema
+
+
+def _is_scalar(field) -> bool:
+    # Valid values of the field are scalars or lists of scalars
+    if isinstance(field, IterableField):
+        return _is_scalar(field.inner_field_type)
+    base_types = getattr(field, '_base_types', None)
+    return bool(base_types) and all(t in _PLAIN_TYPES for t in base_types)
+
+
+def _normalize(value):
+    if type(value) in _PLAIN_TYPES or _is_native(value):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [v if type(v) in _PLAIN_TYPES else _normalize(v) for v in value]
+    if isinstance(value, dict) or isinstance(value, Mapping):
+        return {k if type(k) is str else _normalize_key(k): v if type(v) in _PLAIN_TYPES else _normalize(v)
+                for k, v in value.items()}
+    raise TypeError("cannot pack value {} of type {}".format(value, type(value)))
+
+
+def _is_native(value) -> bool:
+    # Checking is much cheaper than converting, and most of values
+    # don't need to be converted
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if type(k) is not str or (type(v) not in _PLAIN_TYPES and not _is_native(v)):
+                return False
+        return True
+    if isinstance(value, (list, tuple)):
+        for v in value:
+            if type(v) not in _PLAIN_TYPES and not _is_native(v):
+                return False
+        return True
+    return False
+
+
+def _normalize_key(key):
+    if isinstance(key, str):
+        return key
+    if isinstance(key, int) and not isinstance(key, bool):
+        return str(key)
+    raise TypeError("cannot pack key {} of type {}".format(key, type(key)))
@@ -46,12 +46,27 @@ class MessageFactory:
         msg = self.__msg_without_op_field(message_raw)
         return cls(**msg)
 
+    def get_lazy_instance(self, **message_raw):
+        """
+        Same as `get_instance` but only header fields of messages which
+        have them are validated, see `MessageBase.create_lazily`
+        """
+        message_op = message_raw.get(OP_FIELD_NAME, None)
+        if message_op is None:
+            raise MissingNodeOp
+        cls = self.get_type(message_op)
+        msg = self.__msg_without_op_field(message_raw)
+        return cls.create_lazily(**msg)
+
     def get_type(self, message_op):
         message_cls = self.__classes.get(message_op, None)
         if message_cls is None:
             raise InvalidNodeOp(message_op)
         return message_cls
 
+    def get_types(self):
+        return list(self.__classes.values())
+
     @staticmethod
     def __msg_without_op_field(msg):
         return {k: v for k, v in msg.items() if k != OP_FIELD_NAME}
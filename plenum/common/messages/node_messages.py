@@ -161,6 +161,7 @@ class Prepare(MessageBase):
                                                    nullable=True)),
         (f.PLUGIN_FIELDS.nm, AnyMapField(optional=True, nullable=True))
     )
+    header_fields = (f.INST_ID.nm, f.VIEW_NO.nm, f.PP_SEQ_NO.nm)
 
 
 class Commit(MessageBase):
@@ -175,6 +176,7 @@ class Commit(MessageBase):
         # consistency
         (f.PLUGIN_FIELDS.nm, AnyMapField(optional=True, nullable=True))
     )
+    header_fields = (f.INST_ID.nm, f.VIEW_NO.nm, f.PP_SEQ_NO.nm)
 
 
 class Checkpoint(MessageBase):
@@ -51,6 +51,9 @@ class MetricsName(IntEnum):
     CATCHUP_TXNS_SENT = 15
     # Number of txns received through catchup
     CATCHUP_TXNS_RECEIVED = 16
+    # Number of proof cache hits and misses when serving catchup
+    CATCHUP_PROOF_CACHE_HITS = 17
+    CATCHUP_PROOF_CACHE_MISSES = 18
 
     # Average throughput measured by monitor on backup instances
     BACKUP_MONITOR_AVG_THROUGHPUT = 20
@@ -128,6 +131,20 @@ class MetricsName(IntEnum):
     PROCESS_ORDERED_TIME = 213
     MONITOR_REQUEST_ORDERED_TIME = 214
     EXECUTE_BATCH_TIME = 215
+    # Number of client requests in one batch of parallel signature verification
+    SIG_VERIFICATION_BATCH_SIZE = 216
+    # Time between submitting a batch for signature verification and its delivery
+    SIG_VERIFICATION_BATCH_TIME = 217
+    # Number of client requests with invalid signatures in one verification batch
+    SIG_VERIFICATION_BATCH_FAILED = 218
+    # Number of verkey cache hits and misses in client authenticator
+    VERKEY_CACHE_HITS = 219
+    VERKEY_CACHE_MISSES = 220
+    # Number of decoded trie node cache hits and misses in all states since the last flush
+    STATE_NODE_CACHE_HITS = 221
+    STATE_NODE_CACHE_MISSES = 222
+    # Time between submitting a read request to workers and delivery of its result
+    READ_REQUEST_WORKER_TIME = 223
 
     # Replica specific metrics
     SERVICE_REPLICA_QUEUES_TIME = 300
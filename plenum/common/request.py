@@ -1,7 +1,7 @@
 from hashlib import sha256
 from typing import Mapping, NamedTuple, Dict
 
-from common.serializers.serialization import serialize_msg_for_signing
+from common.serializers.serialization import signing_serializer
 from plenum.common.constants import REQKEY, FORCE, TXN_TYPE, OPERATION_SCHEMA_IS_STRICT
 from plenum.common.messages.client_request import ClientMessageValidator
 from plenum.common.types import f, OPERATION
@@ -34,6 +34,9 @@ class Request:
         self.endorser = endorser
         self._digest = None
         self._payload_digest = None
+        # serialized forms of the signed containers (like operation), they
+        # are shared by the digest, the payload digest and the hash
+        self._signing_memo = {}
         for nm in PLUGIN_CLIENT_REQUEST_FIELDS:
             if nm in kwargs:
                 setattr(self, nm, kwargs[nm])
@@ -84,13 +87,19 @@ class Request:
         return self.digest
 
     def getDigest(self):
-        return sha256(serialize_msg_for_signing(self.signingState())).hexdigest()
+        return sha256(self._serialize_for_signing(self.signingState())).hexdigest()
 
     def getPayloadDigest(self):
-        return sha256(serialize_msg_for_signing(self.signingPayloadState())).hexdigest()
+        return sha256(self._serialize_for_signing(self.signingPayloadState())).hexdigest()
+
+    def _serialize_for_signing(self, state: Dict) -> bytes:
+        memo = self.__dict__.get('_signing_memo')
+        if memo is None:
+            memo = self._signing_memo = {}
+        return signing_serializer.serialize_memoized(state, memo)
 
     def __getstate__(self):
-        return self.__dict__
+        return {k: v for k, v in self.__dict__.items() if k != '_signing_memo'}
 
     def signingState(self, identifier=None):
         state = self.signingPayloadState(identifier)
@@ -131,7 +140,7 @@ class Request:
         return obj
 
     def serialized(self):
-        return serialize_msg_for_signing(self.__getstate__())
+        return self._serialize_for_signing(self.__getstate__())
 
     def isForced(self):
         force = self.operation.get(FORCE)
@@ -8,6 +8,7 @@ from plenum.common.batched import Batched, logger
 from plenum.common.config_util import getConfig, \
     get_global_config_else_read_config
 from plenum.common.message_processor import MessageProcessor
+from plenum.common.messages.node_message_codec import schema_fingerprint
 from plenum.common.metrics_collector import NullMetricsCollector, MetricsName
 from plenum.recorder.simple_zstack_with_recorder import SimpleZStackWithRecorder
 from plenum.recorder.simple_zstack_with_silencer import SimpleZStackWithSilencer
@@ -178,6 +179,8 @@ class NodeZStack(Batched, KITZStack):
         MessageProcessor.__init__(self, allowDictOnly=False)
         self.listenerQuota = config.NODE_TO_NODE_STACK_QUOTA
         self.listenerSize = config.NODE_TO_NODE_STACK_SIZE
+        if config.ENABLE_BINARY_NODE_MESSAGES:
+            self.announce_wire_protocol('msgpack.{}'.format(schema_fingerprint()))
 
     # TODO: Reconsider defaulting `reSetupAuth` to True.
     def start(self, restricted=None, reSetupAuth=True):
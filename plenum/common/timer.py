@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from functools import wraps
-from typing import Callable, NamedTuple
+from typing import Callable, NamedTuple, Optional
 
 import time
 
@@ -31,6 +31,13 @@ class QueueTimer(TimerService):
     def queue_size(self):
         return len(self._events)
 
+    def next_event_time(self) -> Optional[float]:
+        """
+        Time when the earliest scheduled event is due, None if there are
+        no events
+        """
+        return self._next_timestamp() if len(self._events) else None
+
     def service(self):
         while len(self._events) and self._next_timestamp() <= self._get_current_time():
             self._pop_event().callback()
@@ -47,6 +47,7 @@ class f:  # provides a namespace for reusable field constants
     IS_STABLE = Field('isStable', bool)
     MSGS = Field('messages', List[Mapping])
     SIG = Field('signature', Optional[str])
+    WIRE_PROTOCOL = Field('wireProtocol', str)
     PROTOCOL_VERSION = Field('protocolVersion', int)
     SUSP_CODE = Field('suspicionCode', int)
     ELECTION_DATA = Field('electionData', Any)
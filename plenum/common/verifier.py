@@ -1,4 +1,6 @@
+import threading
 from abc import abstractmethod
+from contextlib import contextmanager
 from typing import Dict
 
 from common.exceptions import ValueUndefinedError
@@ -8,6 +10,26 @@ from plenum.common.exceptions import InvalidKey
 from stp_core.crypto.nacl_wrappers import Verifier as NaclVerifier
 
 
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_sig_checks():
+    """
+    Within this context `DidVerifier.verify` does not verify signatures in
+    the calling thread but records them as `(signature, message, raw verkey)`
+    tuples and optimistically reports success. The recorded checks are
+    yielded to the caller which is responsible for verifying them.
+    """
+    checks = []
+    prev = getattr(_deferred, 'checks', None)
+    _deferred.checks = checks
+    try:
+        yield checks
+    finally:
+        _deferred.checks = prev
+
+
 class Verifier:
     @abstractmethod
     def __init__(self, *args, **kwargs):
@@ -52,4 +74,8 @@ class DidVerifier(Verifier):
         self._vr = NaclVerifier(b58decode(value))
 
     def verify(self, sig, msg) -> bool:
+        checks = getattr(_deferred, 'checks', None)
+        if checks is not None:
+            checks.append((sig, msg, self._vr.keyraw))
+            return True
         return self._vr.verify(sig, msg)
@@ -120,6 +120,14 @@ db_node_status_db_config = rocksdb_node_status_db_config
 db_state_signature_config = rocksdb_state_signature_config
 db_state_ts_db_config = rocksdb_state_ts_db_config
 
+# Writes of an ordered 3PC batch to RocksDB storages (states, ledgers, hash
+# stores, seqNoDB, timestamp and BLS stores) are collected and written with
+# one write batch per storage when the 3PC batch is committed
+DB_GROUP_COMMIT = False
+# Fsync write-ahead logs of RocksDB storages every given number of committed
+# 3PC batches, 0 means that fsync is left to OS like for single writes
+DB_GROUP_COMMIT_FSYNC_PERIOD = 0
+
 DefaultPluginPath = {
     # PLUGIN_BASE_DIR_PATH: "<abs path of plugin directory can be given here,
     #  if not given, by default it will pickup plenum/server/plugin path>",
@@ -250,6 +258,46 @@ log_override_tags = dict(cli={}, demo={})
 LISTENER_MESSAGE_QUOTA = 100
 REMOTES_MESSAGE_QUOTA = 100
 
+# Send messages to other nodes in the compact binary (msgpack) form. Node
+# announces the binary form on connection and uses it only with nodes which
+# announced the same one, JSON is used with all other nodes.
+ENABLE_BINARY_NODE_MESSAGES = False
+
+# Validate only the fields needed to route PREPARE and COMMIT messages when
+# they are received, the rest are validated when the messages are processed
+# (and not at all for stashed messages which are discarded later).
+LAZY_3PC_MESSAGE_VALIDATION = False
+
+# Number of workers verifying signatures of client requests received in one
+# looper run (0 to verify them one by one in the looper thread). Thread
+# workers are used unless CLIENT_SIG_VERIFICATION_USE_PROCESSES is set,
+# libsodium releases GIL during verification.
+CLIENT_SIG_VERIFICATION_WORKERS = 0
+CLIENT_SIG_VERIFICATION_USE_PROCESSES = False
+
+# Number of worker threads serving read requests from snapshots of committed
+# ledgers and states (0 to serve them on the looper), workers need RocksDB
+# transaction logs and hash stores
+READ_REQUEST_WORKERS = 0
+
+# Max number of known DIDs whose verifiers built from their verkeys are
+# cached by client authenticator (0 to disable caching)
+VERKEY_CACHE_SIZE = 10000
+
+# Max number of merkle tree hashes of ledger ranges which are cached to build
+# consistency proofs for catching up nodes (0 to disable caching)
+CATCHUP_PROOF_CACHE_SIZE = 10000
+
+# Max number of decoded trie nodes which are cached by every state to read
+# committed state (0 to disable caching)
+STATE_NODE_CACHE_SIZE = 5000
+
+# Whether a state which is recreated from its ledger on start is built from
+# final values of its keys at once instead of applying txns to the trie one
+# by one. Request handlers may only get, set and remove values while
+# applying txns then.
+STATE_BULK_LOAD_ON_REGENERATION = False
+
 # After `Max3PCBatchSize` requests or `Max3PCBatchWait`, whichever is earlier,
 # a 3 phase batch is sent
 # Max batch size for 3 phase commit
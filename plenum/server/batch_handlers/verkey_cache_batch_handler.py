@@ -0,0 +1,37 @@
+from typing import Iterable, List
+
+from plenum.common.constants import DOMAIN_LEDGER_ID, NYM, TARGET_NYM
+from plenum.common.txn_util import get_type, get_payload_data
+from plenum.server.batch_handlers.batch_request_handler import BatchRequestHandler
+from plenum.server.batch_handlers.three_pc_batch import ThreePcBatch
+
+
+class VerkeyCacheBatchHandler(BatchRequestHandler):
+    # Keeps verkey caches of node's client authenticators consistent with
+    # domain state: verkeys of DIDs touched by NYM txns are dropped when
+    # these txns are applied or committed, and all cached verkeys are
+    # dropped when a batch is rejected.
+
+    def __init__(self, database_manager, node):
+        super().__init__(database_manager, DOMAIN_LEDGER_ID)
+        self.node = node
+
+    def post_batch_applied(self, three_pc_batch: ThreePcBatch, prev_handler_result=None):
+        txn_count = len(three_pc_batch.valid_digests)
+        if txn_count:
+            self.node.clientAuthNr.invalidate_verkeys(
+                self.nym_targets(self.ledger.uncommittedTxns[-txn_count:]))
+        return prev_handler_result
+
+    def commit_batch(self, three_pc_batch: ThreePcBatch, prev_handler_result=None):
+        if prev_handler_result:
+            self.node.clientAuthNr.invalidate_verkeys(self.nym_targets(prev_handler_result))
+
+    def post_batch_rejected(self, ledger_id, prev_handler_result=None):
+        self.node.clientAuthNr.clear_verkey_cache()
+        return prev_handler_result
+
+    @staticmethod
+    def nym_targets(txns: Iterable) -> List[str]:
+        return [get_payload_data(txn).get(TARGET_NYM)
+                for txn in txns if get_type(txn) == NYM]
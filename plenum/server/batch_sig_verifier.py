@@ -0,0 +1,206 @@
+"""
+Verification of client request signatures in batches on a pool of workers.
+
+Requests received by the client stack during one looper run are staged,
+their signature checks are collected on the looper thread (verkeys are read
+from the state which is not thread-safe) and then the actual ed25519
+verifications are spread over a pool of workers. Verified requests are
+delivered back in the order they were received.
+"""
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, List, Tuple, Any, Optional
+
+from plenum.common.metrics_collector import MetricsCollector, NullMetricsCollector, MetricsName
+from plenum.common.request import Request
+from plenum.common.verifier import deferred_sig_checks
+from plenum.server.req_authenticator import ReqAuthenticator
+from stp_core.common.log import getlogger
+from stp_core.crypto.nacl_wrappers import verify_batch
+
+logger = getlogger()
+
+# (signature, message, raw verkey)
+SigCheck = Tuple[bytes, bytes, bytes]
+
+
+def verify_sig_checks(checks: List[SigCheck]) -> List[bool]:
+    """
+    Verify signature checks collected by `deferred_sig_checks`.
+    This is executed by workers so it must stay a picklable module level
+    function which doesn't touch any node state.
+    """
+    results = [True] * len(checks)
+    for idx in verify_batch(checks):
+        results[idx] = False
+    return results
+
+
+class _StagedRequest:
+    __slots__ = ('msg', 'frm', 'req_data', 'key', 'authnr',
+                 'identifiers', 'checks', 'error')
+
+    def __init__(self, msg: Request, frm: str, get_authnr: Callable[[dict], ReqAuthenticator]):
+        self.msg = msg
+        self.frm = frm
+        self.req_data = msg.as_dict
+        self.key = msg.key
+        self.authnr = get_authnr(self.req_data)
+        self.identifiers = None
+        self.checks = []  # type: List[SigCheck]
+        self.error = None  # type: Optional[Exception]
+
+
+class _SubmittedBatch:
+    def __init__(self, reqs: List[_StagedRequest], futures: List, started: float):
+        self.reqs = reqs
+        self.futures = futures
+        self.started = started
+
+    def done(self) -> bool:
+        return all(fut.done() for fut in self.futures)
+
+    def results(self) -> List[bool]:
+        results = []
+        for fut in self.futures:
+            results.extend(fut.result())
+        return results
+
+
+class BatchSigVerifier:
+    """
+    Stage in front of the node's client inbox which verifies signatures of
+    client requests in batches using a pool of workers.
+
+    Semantics of the `ReqAuthenticator` cache of verified requests are kept:
+    already verified requests are not checked again and successfully
+    verified requests are added to the cache. Requests failing the batch
+    verification are authenticated once more on the looper thread, so that
+    exactly the same exceptions as in the sequential path are reported.
+    """
+
+    def __init__(self,
+                 get_authnr: Callable[[dict], ReqAuthenticator],
+                 on_verified: Callable[[Request, str], None],
+                 on_failed: Callable[[Exception, Tuple[Any, str]], None],
+                 workers: int,
+                 use_processes: bool = False,
+                 executor=None,
+                 metrics: MetricsCollector = NullMetricsCollector()):
+        if workers < 1:
+            raise ValueError("number of workers should be positive, got {}".format(workers))
+        self._get_authnr = get_authnr
+        self._on_verified = on_verified
+        self._on_failed = on_failed
+        self._workers = workers
+        self._use_processes = use_processes
+        self._executor = executor
+        self._metrics = metrics
+
+        self._staged = []  # type: List[_StagedRequest]
+        self._submitted = deque()  # type: deque[_SubmittedBatch]
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._staged) + sum(len(b.reqs) for b in self._submitted)
+
+    def add(self, msg: Request, frm: str):
+        """
+        Stage a client request for verification, it will be submitted
+        to workers on the next `flush`
+        """
+        self._staged.append(_StagedRequest(msg, frm, self._get_authnr))
+
+    def flush(self):
+        """
+        Collect signature checks of all staged requests and submit them
+        to workers as one batch
+        """
+        if not self._staged:
+            return
+        reqs, self._staged = self._staged, []
+
+        checks = []
+        for req in reqs:
+            self._collect_checks(req)
+            checks.extend(req.checks)
+
+        self._submitted.append(_SubmittedBatch(reqs, self._submit(checks), time.perf_counter()))
+        self._metrics.add_event(MetricsName.SIG_VERIFICATION_BATCH_SIZE, len(reqs))
+
+    def service(self) -> int:
+        """
+        Deliver results of all finished batches, stopping at the first
+        unfinished one to preserve order of requests
+        :return: number of delivered requests
+        """
+        count = 0
+        while self._submitted and self._submitted[0].done():
+            batch = self._submitted.popleft()
+            count += self._deliver(batch)
+        return count
+
+    def stop(self):
+        self._staged.clear()
+        self._submitted.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _collect_checks(self, req: _StagedRequest):
+        if req.authnr.is_verified(req.req_data, req.key):
+            req.identifiers = req.authnr.get_verified_identifiers(req.key)
+            return
+        try:
+            with deferred_sig_checks() as checks:
+                req.identifiers = req.authnr.authenticate_uncached(req.req_data)
+        except Exception as ex:
+            req.error = ex
+            return
+        req.checks = checks
+
+    def _submit(self, checks: List[SigCheck]) -> List:
+        if not checks:
+            return []
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._workers) \
+                if self._use_processes else ThreadPoolExecutor(self._workers)
+        chunk_size = -(-len(checks) // self._workers)
+        return [self._executor.submit(verify_sig_checks, checks[i:i + chunk_size])
+                for i in range(0, len(checks), chunk_size)]
+
+    def _deliver(self, batch: _SubmittedBatch) -> int:
+        results = batch.results()
+        failed = 0
+        pos = 0
+        for req in batch.reqs:
+            verified = all(results[pos:pos + len(req.checks)])
+            pos += len(req.checks)
+
+            if req.error is not None:
+                failed += 1
+                self._on_failed(req.error, (req.msg, req.frm))
+                continue
+
+            if verified:
+                if req.key and req.identifiers:
+                    req.authnr.add_verified(req.key, req.req_data, req.identifiers)
+            else:
+                # Redo authentication in the looper thread to get
+                # exactly the same error as in the sequential path
+                try:
+                    req.identifiers = req.authnr.authenticate(req.req_data, key=req.key)
+                except Exception as ex:
+                    failed += 1
+                    self._on_failed(ex, (req.msg, req.frm))
+                    continue
+
+            logger.debug("authenticated {} signature on request {}".
+                         format(req.identifiers, req.req_data.get('reqId')),
+                         extra={"cli": True, "tags": ["node-msg-processing"]})
+            self._on_verified(req.msg, req.frm)
+
+        self._metrics.add_event(MetricsName.SIG_VERIFICATION_BATCH_TIME, time.perf_counter() - batch.started)
+        self._metrics.add_event(MetricsName.SIG_VERIFICATION_BATCH_FAILED, failed)
+        return len(batch.reqs)
@@ -1,5 +1,3 @@
-from collections import defaultdict
-from heapq import merge
 from random import shuffle
 from typing import Optional, List, Tuple, Any, Dict
 
@@ -9,6 +7,7 @@ from plenum.common.ledger import Ledger
 from plenum.common.messages.node_messages import CatchupRep, CatchupReq
 from plenum.common.metrics_collector import MetricsCollector, MetricsName
 from plenum.common.timer import TimerService
+from plenum.common.util import SortedDict
 from plenum.server.catchup.utils import CatchupDataProvider, LedgerCatchupComplete, CatchupTill, LedgerCatchupStart
 from stp_core.common.log import getlogger
 
@@ -41,8 +40,11 @@ class CatchupRepService:
         # for them and waits a CatchupRep message.
         self._wait_catchup_rep_from = set()
 
-        self._received_catchup_replies_from = defaultdict(list)  # type: Dict[int, List]
-        self._received_catchup_txns = []  # type: List[Tuple[int, Any]]
+        # Received catchup replies which are not applied yet, keyed by
+        # (first seq_no, last seq_no, sender) of transactions in them
+        self._received_catchup_replies = SortedDict()  # type: SortedDict[Tuple[int, int, str], CatchupRep]
+        # Received transactions which are not applied yet, keyed by seq_no
+        self._received_catchup_txns = SortedDict()  # type: SortedDict[int, Any]
 
     def __repr__(self):
         return "{}:CatchupRepService:{}".format(self._provider.node_name(), self._ledger_id)
@@ -90,19 +92,16 @@ class CatchupRepService:
         logger.info("{} found {} interesting transactions in the catchup from {}".format(self, len(txns), frm))
         self.metrics.add_event(MetricsName.CATCHUP_TXNS_RECEIVED, len(txns))
 
-        self._received_catchup_replies_from[frm].append(rep)
-
-        txns_already_rcvd_in_catchup = self._merge_catchup_txns(self._received_catchup_txns, txns)
+        self._received_catchup_replies[(txns[0][0], txns[-1][0], frm)] = rep
+        self._merge_catchup_txns(self._received_catchup_txns, txns)
         logger.info("{} merged catchups, there are {} of them now, from {} to {}".
-                    format(self, len(txns_already_rcvd_in_catchup), txns_already_rcvd_in_catchup[0][0],
-                           txns_already_rcvd_in_catchup[-1][0]))
-
-        num_processed = self._process_catchup_txns(txns_already_rcvd_in_catchup)
-        logger.info("{} processed {} catchup replies with sequence numbers {}".
-                    format(self, num_processed,
-                           [seq_no for seq_no, _ in txns_already_rcvd_in_catchup[:num_processed]]))
+                    format(self, len(self._received_catchup_txns), self._received_catchup_txns.peekitem(0)[0],
+                           self._received_catchup_txns.peekitem(-1)[0]))
 
-        self._received_catchup_txns = txns_already_rcvd_in_catchup[num_processed:]
+        ledger_size = self._ledger.size
+        num_processed = self._process_catchup_txns()
+        logger.info("{} processed {} catchup replies, ledger size changed from {} to {}".
+                    format(self, num_processed, ledger_size, self._ledger.size))
 
         if self._ledger.size >= self._catchup_till.final_size:
             self._finish()
@@ -114,7 +113,7 @@ class CatchupRepService:
 
         self._is_working = False
         self._received_catchup_txns.clear()
-        self._received_catchup_replies_from.clear()
+        self._received_catchup_replies.clear()
         self._provider.notify_catchup_complete(self._ledger_id)
 
         logger.info("{}{} completed catching up ledger {}, caught up {} in total"
@@ -256,8 +255,7 @@ class CatchupRepService:
             left_missing -= to - frm + 1
             reqs += self._send_catchup_reqs(eligible_nodes, frm, to)
 
-        txns = self._received_catchup_txns
-        for seqNo, txn in txns:
+        for seqNo in self._received_catchup_txns:
             if (seqNo - last_seen_seq_no) != 1:
                 send_reqs_for_missing(last_seen_seq_no + 1, seqNo - 1)
             last_seen_seq_no = seqNo
@@ -316,89 +314,102 @@ class CatchupRepService:
         return txns
 
     @staticmethod
-    def _merge_catchup_txns(existing_txns, new_txns):
+    def _merge_catchup_txns(existing_txns: SortedDict, new_txns: List[Tuple[int, Any]]):
         """
-        Merge any newly received txns during catchup with already received txns
+        Merge any newly received txns during catchup with already received txns,
+        already received txns are not replaced
         :param existing_txns:
         :param new_txns:
-        :return:
         """
-        # TODO: Can we replace this with SortedDict and before merging substract existing transactions from new?
-        idx_to_remove = []
-        start_seq_no = new_txns[0][0]
-        end_seq_no = new_txns[-1][0]
-        for seq_no, _ in existing_txns:
-            if seq_no < start_seq_no:
-                continue
-            if seq_no > end_seq_no:
-                break
-            idx_to_remove.append(seq_no - start_seq_no)
-        for idx in reversed(idx_to_remove):
-            new_txns.pop(idx)
+        for seq_no, txn in new_txns:
+            existing_txns.setdefault(seq_no, txn)
 
-        return list(merge(existing_txns, new_txns, key=lambda v: v[0]))
+    def _process_catchup_txns(self) -> int:
+        """
+        Apply received transactions which follow the ledger and have
+        verified catchup replies, transactions which could not be verified
+        are discarded
+
+        :return: number of transactions removed from received ones
+        """
+        txns = self._received_catchup_txns
 
-    def _process_catchup_txns(self, txns: List[Tuple[int, Any]]) -> int:
         # Removing transactions for sequence numbers are already
         # present in the ledger
-        # TODO: Inefficient, should check list in reverse and stop at first
-        # match since list is already sorted
-        num_processed = sum(1 for s, _ in txns if s <= self._ledger.size)
+        already_processed = list(txns.irange(maximum=self._ledger.size))
+        for seq_no in already_processed:
+            del txns[seq_no]
+        num_processed = len(already_processed)
         if num_processed:
             logger.info("{} found {} already processed transactions in the catchup replies".
                         format(self, num_processed))
 
         # If `catchUpReplies` has any transaction that has not been applied
         # to the ledger
-        txns = txns[num_processed:]
-        while txns and txns[0][0] - self._ledger.seqNo == 1:
-            seq_no = txns[0][0]
-            result, node_name, to_be_processed = self._has_valid_catchup_replies(seq_no, txns)
+        while txns and txns.peekitem(0)[0] - self._ledger.seqNo == 1:
+            seq_no = txns.peekitem(0)[0]
+            rep_key, catchup_rep = self._find_catchup_reply_for_seq_no(seq_no)
+            if rep_key is None:
+                logger.warning("{} has no catchup reply with transaction {}".format(self, seq_no))
+                break
+            node_name = rep_key[2]
+            del self._received_catchup_replies[rep_key]
+            result, rep_txns, transformed_txns = self._has_valid_catchup_replies(seq_no, catchup_rep)
             if result:
-                for _, txn in txns[:to_be_processed]:
-                    self._add_txn(txn)
-                self._remove_processed_catchup_reply(node_name, seq_no)
-                num_processed += to_be_processed
-                txns = txns[to_be_processed:]
+                for s in range(seq_no, seq_no + len(rep_txns)):
+                    txns.pop(s, None)
+                num_processed += len(rep_txns)
+                self._add_txns(rep_txns, transformed_txns)
             else:
                 self._provider.blacklist_node(
                     node_name,
                     reason="Sent transactions that could not be verified")
-                self._remove_processed_catchup_reply(node_name, seq_no)
-                # Invalid transactions have to be discarded so letting
-                # the caller know how many txns have to removed from
-                # `self.receivedCatchUpReplies`
-                return num_processed + to_be_processed
+                # Invalid transactions have to be discarded, the same
+                # transactions from other replies can still be applied
+                self._restore_received_catchup_txns(seq_no, rep_key[1])
 
         return num_processed
 
-    def _has_valid_catchup_replies(self, seq_no: int, txns_to_process: List[Tuple[int, Any]]) -> Tuple[bool, str, int]:
+    def _restore_received_catchup_txns(self, first: int, last: int):
+        """
+        Replace received transactions from `first` to `last` with the ones
+        from catchup replies which are still kept, after the reply which
+        might have given them was discarded
+        """
+        txns = self._received_catchup_txns
+        for s in list(txns.irange(first, last)):
+            del txns[s]
+        for (rep_first, rep_last, _), rep in self._received_catchup_replies.items():
+            if rep_first > last:
+                break
+            if rep_last < first:
+                continue
+            self._merge_catchup_txns(txns, [(s, rep.txns[str(s)])
+                                            for s in range(max(first, rep_first), min(last, rep_last) + 1)])
+
+    def _has_valid_catchup_replies(self, seq_no: int, catchup_rep: CatchupRep) -> Tuple[bool, List, List]:
         """
         Transforms transactions for ledger!
 
         Returns:
             Whether catchup reply corresponding to seq_no
-            Name of node from which txns came
-            Number of transactions ready to be processed
+            Transactions of the reply from seq_no which are ready to be
+            processed
+            The same transactions transformed for ledger
         """
 
-        # TODO: Remove after stop passing seqNo here
-        assert seq_no == txns_to_process[0][0]
-
         # Here seqNo has to be the seqNo of first transaction of
-        # `catchupReplies`
-
-        # Get the transactions in the catchup reply which has sequence
-        # number `seqNo`
-        node_name, catchup_rep = self._find_catchup_reply_for_seq_no(seq_no)
-        txns = catchup_rep.txns
+        # received transactions
 
         # Add only those transaction in the temporary tree from the above
-        # batch which are not present in the ledger
+        # batch which are not present in the ledger. Transactions of the
+        # reply itself are checked against its proof, other replies might
+        # have given different ones for the same seq_nos.
         # Integer keys being converted to strings when marshaled to JSON
-        txns = [self._provider.transform_txn_for_ledger(txn)
-                for s, txn in txns_to_process[:len(txns)]
-                if str(s) in txns]
+        rep_txns = []
+        while str(seq_no + len(rep_txns)) in catchup_rep.txns:
+            rep_txns.append(catchup_rep.txns[str(seq_no + len(rep_txns))])
+        txns = [self._provider.transform_txn_for_ledger(txn) for txn in rep_txns]
 
         # Creating a temporary tree which will be used to verify consistency
         # proof, by inserting transactions. Duplicating a merkle tree is not
@@ -423,30 +434,33 @@ class CatchupRepService:
         except Exception as ex:
             logger.info("{} could not verify catchup reply {} since {}".format(self, catchup_rep, ex))
             verified = False
-        return bool(verified), node_name, len(txns)
-
-    def _find_catchup_reply_for_seq_no(self, seq_no: int) -> Tuple[str, CatchupRep]:
-        # This is inefficient if we have large number of nodes but since
-        # number of node are always between 60-120, this is ok.
-        for frm, reps in self._received_catchup_replies_from.items():
-            for rep in reps:
-                if str(seq_no) in rep.txns:
-                    return frm, rep
-
-    def _add_txn(self, txn):
-        self._ledger.add(self._provider.transform_txn_for_ledger(txn))
-        self._provider.notify_transaction_added_to_ledger(self._ledger_id, txn)
-
-    def _remove_processed_catchup_reply(self, node: str, seq_no: str):
-        for i, rep in enumerate(self._received_catchup_replies_from[node]):
-            if str(seq_no) in rep.txns:
-                break
-        self._received_catchup_replies_from[node].pop(i)
+        return bool(verified), rep_txns, txns
+
+    def _find_catchup_reply_for_seq_no(self, seq_no: int) \
+            -> Tuple[Optional[Tuple[int, int, str]], Optional[CatchupRep]]:
+        # The reply which starts last not after seq_no contains it unless it
+        # ends before seq_no. Such replies are not needed anymore since all
+        # their transactions are already in the ledger, so they are removed.
+        replies = self._received_catchup_replies
+        while True:
+            index = replies.bisect_right((seq_no, float('inf')))
+            if index == 0:
+                return None, None
+            key, rep = replies.peekitem(index - 1)
+            if key[1] >= seq_no:
+                return key, rep
+            del replies[key]
+
+    def _add_txns(self, txns: List[Any], transformed_txns: List[Any]):
+        # Transactions of a verified catchup reply are written to the ledger
+        # at once, so each storage is written (and synced) once per reply
+        self._ledger.add_batch(transformed_txns)
+        self._provider.notify_transactions_added_to_ledger(self._ledger_id, txns)
 
     def _reset(self):
         self._is_working = False
         self._catchup_till = None
 
         self._wait_catchup_rep_from.clear()
-        self._received_catchup_replies_from.clear()
+        self._received_catchup_replies.clear()
         self._received_catchup_txns.clear()
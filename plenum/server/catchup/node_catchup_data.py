@@ -57,6 +57,14 @@ class CatchupNodeDataProvider(CatchupDataProvider):
         if info is not None and info.postTxnAddedToLedgerClbk:
             info.postTxnAddedToLedgerClbk(ledger_id, txn)
 
+    def notify_transactions_added_to_ledger(self, ledger_id: int, txns: List[dict]):
+        info = self._ledger_info(ledger_id)
+        if info is not None and info.postTxnsAddedToLedgerClbk:
+            info.postTxnsAddedToLedgerClbk(ledger_id, txns)
+            return
+        for txn in txns:
+            self.notify_transaction_added_to_ledger(ledger_id, txn)
+
     def send_to(self, msg: Any, to: str, message_splitter: Optional[Callable] = None):
         if self._node.nodestack.hasRemote(to):
             self._node.sendToNodes(msg, [to], message_splitter)
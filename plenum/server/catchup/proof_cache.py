@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from functools import partial
+from typing import List, Optional
+
+from plenum.common.ledger import Ledger
+from plenum.common.metrics_collector import MetricsCollector, NullMetricsCollector, MetricsName
+
+
+class ProofCache:
+    """
+    Cache of merkle tree hashes of committed ranges of ledgers, which
+    consistency proofs and roots sent to catching up nodes consist of.
+    Entries are keyed by (ledger_id, start, end) and the least recently
+    used ones are evicted when the cache is full.
+
+    Committed transactions never change, so an entry is valid until the
+    ledger is reset. Only ranges of ledgers registered with
+    `register_ledger` are cached, entries of a ledger are cleared when it
+    is reset.
+    """
+
+    def __init__(self, size: int, metrics: MetricsCollector = NullMetricsCollector()):
+        self._size = size
+        self._metrics = metrics
+        self._hashes = OrderedDict()
+        self._ledgers = {}
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def register_ledger(self, ledger_id: int, ledger: Ledger):
+        """
+        Cache ranges of the ledger and clear them when it is reset
+        """
+        if self._ledgers.get(ledger_id) is ledger:
+            return
+        self.clear(ledger_id)
+        self._ledgers[ledger_id] = ledger
+        ledger.register_reset_handler(partial(self.clear, ledger_id))
+
+    def merkle_tree_hash(self, ledger_id: int, ledger: Ledger, start: int, end: int) -> str:
+        """
+        Return hash of the range of leaves of the ledger as a string
+        """
+        return self._merkle_tree_hash(ledger_id, ledger, start, end)
+
+    def consistency_proof(self, ledger_id: int, ledger: Ledger, first: int, second: int) -> List[str]:
+        """
+        Return consistency proof between sizes `first` and `second` of the
+        ledger as a list of strings
+        """
+        return [self._merkle_tree_hash(ledger_id, ledger, start, end)
+                for start, end in ledger.tree.consistency_proof_ranges(first, second)]
+
+    def clear(self, ledger_id: Optional[int] = None):
+        if ledger_id is None:
+            self._hashes.clear()
+            return
+        for key in [key for key in self._hashes if key[0] == ledger_id]:
+            del self._hashes[key]
+
+    def _merkle_tree_hash(self, ledger_id: int, ledger: Ledger, start: int, end: int) -> str:
+        key = (ledger_id, start, end)
+        cached = self._size > 0 and self._ledgers.get(ledger_id) is ledger
+        h = self._hashes.get(key) if cached else None
+        if h is not None:
+            self._hashes.move_to_end(key)
+            self._metrics.add_event(MetricsName.CATCHUP_PROOF_CACHE_HITS, 1)
+            return h
+        self._metrics.add_event(MetricsName.CATCHUP_PROOF_CACHE_MISSES, 1)
+
+        h = Ledger.hashToStr(ledger.tree.merkle_tree_hash(start, end))
+        if cached:
+            self._hashes[key] = h
+            if len(self._hashes) > self._size:
+                self._hashes.popitem(last=False)
+        return h
@@ -5,6 +5,7 @@ from plenum.common.channel import RxChannel, Router
 from plenum.common.ledger import Ledger
 from plenum.common.messages.node_messages import CatchupReq, CatchupRep, ConsistencyProof, LedgerStatus
 from plenum.common.util import SortedDict
+from plenum.server.catchup.proof_cache import ProofCache
 from plenum.server.catchup.utils import CatchupDataProvider, build_ledger_status
 from stp_core.common.log import getlogger
 
@@ -12,11 +13,13 @@ logger = getlogger()
 
 
 class SeederService:
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider,
+                 proof_cache: Optional[ProofCache] = None):
         router = Router(input)
         router.add(LedgerStatus, self.process_ledger_status)
         router.add(CatchupReq, self.process_catchup_req)
         self._provider = provider
+        self._proof_cache = proof_cache if proof_cache is not None else ProofCache(size=0)
 
     def __repr__(self):
         return self._provider.node_name()
@@ -82,8 +85,7 @@ class SeederService:
                                    .format(req.catchupTill, ledger.size), logMethod=logger.warning)
             return
 
-        cons_proof = ledger.tree.consistency_proof(end, req.catchupTill)
-        cons_proof = [Ledger.hashToStr(p) for p in cons_proof]
+        cons_proof = self._make_consistency_proof(ledger_id, ledger, end, req.catchupTill)
 
         txns = {}
         for seq_no, txn in ledger.getAllTxn(start, end):
@@ -98,11 +100,8 @@ class SeederService:
         ledger_id = req.ledgerId
         return ledger_id, self._provider.ledger(ledger_id)
 
-    @staticmethod
-    def _make_consistency_proof(ledger: Ledger, seq_no_start: int, seq_no_end: int):
-        proof = ledger.tree.consistency_proof(seq_no_start, seq_no_end)
-        string_proof = [Ledger.hashToStr(p) for p in proof]
-        return string_proof
+    def _make_consistency_proof(self, ledger_id: int, ledger: Ledger, seq_no_start: int, seq_no_end: int):
+        return self._proof_cache.consistency_proof(ledger_id, ledger, seq_no_start, seq_no_end)
 
     def _build_consistency_proof(self, ledger_id: int,
                                  seq_no_start: int, seq_no_end: int) -> Optional[ConsistencyProof]:
@@ -131,12 +130,10 @@ class SeederService:
             old_root = Ledger.hashToStr(old_root)
             proof = [old_root, ]
         else:
-            proof = self._make_consistency_proof(ledger, seq_no_start, seq_no_end)
-            old_root = ledger.tree.merkle_tree_hash(0, seq_no_start)
-            old_root = Ledger.hashToStr(old_root)
+            proof = self._make_consistency_proof(ledger_id, ledger, seq_no_start, seq_no_end)
+            old_root = self._proof_cache.merkle_tree_hash(ledger_id, ledger, 0, seq_no_start)
 
-        new_root = ledger.tree.merkle_tree_hash(0, seq_no_end)
-        new_root = Ledger.hashToStr(new_root)
+        new_root = self._proof_cache.merkle_tree_hash(ledger_id, ledger, 0, seq_no_end)
 
         view_no, pp_seq_no = (0, 0)
 
@@ -162,13 +159,15 @@ class SeederService:
             left_last_seq_no = left[-1][0]
             right = txns[divider:]
             right_last_seq_no = right[-1][0]
-            left_cons_proof = self._make_consistency_proof(ledger,
+            ledger_id = message.ledgerId
+            left_cons_proof = self._make_consistency_proof(ledger_id,
+                                                           ledger,
                                                            left_last_seq_no,
                                                            initial_seq_no)
-            right_cons_proof = self._make_consistency_proof(ledger,
+            right_cons_proof = self._make_consistency_proof(ledger_id,
+                                                            ledger,
                                                             right_last_seq_no,
                                                             initial_seq_no)
-            ledger_id = message.ledgerId
 
             left_rep = CatchupRep(ledger_id, SortedDict(left), left_cons_proof)
             right_rep = CatchupRep(ledger_id, SortedDict(right), right_cons_proof)
@@ -182,8 +181,9 @@ class SeederService:
 
 
 class ClientSeederService(SeederService):
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
-        SeederService.__init__(self, input, provider)
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider,
+                 proof_cache: Optional[ProofCache] = None):
+        SeederService.__init__(self, input, provider, proof_cache)
 
     def _on_ledger_status_up_to_date(self, ledger_id: int, frm: str):
         ledger_status = build_ledger_status(ledger_id, self._provider)
@@ -191,8 +191,9 @@ class ClientSeederService(SeederService):
 
 
 class NodeSeederService(SeederService):
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
-        SeederService.__init__(self, input, provider)
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider,
+                 proof_cache: Optional[ProofCache] = None):
+        SeederService.__init__(self, input, provider, proof_cache)
 
     def _on_ledger_status_up_to_date(self, ledger_id: int, frm: str):
         pass
@@ -2,11 +2,13 @@
 Clients are authenticated with a digital signature.
 """
 from abc import abstractmethod
-from typing import Dict, Optional, Sequence
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Iterable
 
 import base58
 from common.serializers.serialization import serialize_msg_for_signing
 from plenum.common.constants import VERKEY, ROLE, GET_TXN, NYM, IDENTIFIER
+from plenum.common.metrics_collector import MetricsCollector, NullMetricsCollector, MetricsName
 from plenum.common.exceptions import EmptySignature, \
     MissingSignature, EmptyIdentifier, \
     MissingIdentifier, CouldNotAuthenticate, \
@@ -81,6 +83,17 @@ class ClientAuthNr:
         :return: the verification key
         """
 
+    def invalidate_verkeys(self, identifiers: Iterable[str]):
+        """
+        Drop any cached verification data for the given identifiers, called
+        when their verkeys may have changed.
+        """
+
+    def clear_verkey_cache(self):
+        """
+        Drop all cached verification data.
+        """
+
 
 class NaclAuthNr(ClientAuthNr):
 
@@ -101,12 +114,7 @@ class NaclAuthNr(ClientAuthNr):
 
             ser = self.serializeForSig(msg, identifier=idr)
 
-            verkey = self.getVerkey(idr, msg)
-            if verkey is None:
-                raise CouldNotAuthenticate(
-                    'Can not find verkey for {}'.format(idr))
-
-            vr = verifier(verkey, identifier=idr)
+            vr = self._get_verifier(idr, msg, verifier)
             if vr.verify(sig, ser):
                 correct_sigs_from.append(idr)
                 if len(correct_sigs_from) == threshold:
@@ -116,6 +124,16 @@ class NaclAuthNr(ClientAuthNr):
                                                 threshold)
         return correct_sigs_from
 
+    def _get_verifier(self, idr, msg, verifier: Verifier = DidVerifier) -> Verifier:
+        return self._create_verifier(idr, self.getVerkey(idr, msg), verifier)
+
+    @staticmethod
+    def _create_verifier(idr, verkey, verifier: Verifier = DidVerifier) -> Verifier:
+        if verkey is None:
+            raise CouldNotAuthenticate(
+                'Can not find verkey for {}'.format(idr))
+        return verifier(verkey, identifier=idr)
+
     @abstractmethod
     def addIdr(self, identifier, verkey, role=None):
         pass
@@ -135,11 +153,17 @@ class SimpleAuthNr(NaclAuthNr):
     secure system.
     """
 
-    def __init__(self, state=None):
+    def __init__(self, state=None, verkey_cache_size: int = 0,
+                 metrics: MetricsCollector = NullMetricsCollector()):
         # key: some identifier, value: verification key
         self.clients = {}  # type: Dict[str, Dict]
         self.state = state
         self.specific_verkey_validation = {NYM: self.nym_specific_auth}
+        # LRU of verifiers built from verkeys of known identifiers,
+        # key: identifier, value: dict of verifier class -> verifier
+        self._verifiers = OrderedDict()  # type: OrderedDict
+        self._verkey_cache_size = verkey_cache_size
+        self.metrics = metrics
 
     def addIdr(self, identifier, verkey, role=None):
         if identifier in self.clients:
@@ -149,8 +173,18 @@ class SimpleAuthNr(NaclAuthNr):
             VERKEY: verkey,
             ROLE: role
         }
+        self.invalidate_verkeys([identifier])
 
     def getVerkey(self, ident, request):
+        nym = self._get_nym(ident)
+        if not nym:
+            # If DID wasn't found in ledger and state, it might be
+            # non-ledger request, so we need to look for verkey in request
+            verkey = self.get_verkey_specific(request)
+            return verkey
+        return nym.get(VERKEY)
+
+    def _get_nym(self, ident):
         nym = self.clients.get(ident)
         if not nym:
             # Querying uncommitted identities since a batch might contain
@@ -159,12 +193,43 @@ class SimpleAuthNr(NaclAuthNr):
             # batches in progress and identity creation request might
             # still be in an earlier uncommited batch
             nym = get_nym_details(self.state, ident, is_committed=False)
-            if not nym:
-                # If DID wasn't found in ledger and state, it might be
-                # non-ledger request, so we need to look for verkey in request
-                verkey = self.get_verkey_specific(request)
-                return verkey
-        return nym.get(VERKEY)
+        return nym
+
+    def _get_verifier(self, idr, msg, verifier: Verifier = DidVerifier) -> Verifier:
+        if not self._verkey_cache_size:
+            return super()._get_verifier(idr, msg, verifier)
+
+        idr_verifiers = self._verifiers.get(idr)
+        vr = idr_verifiers.get(verifier) if idr_verifiers is not None else None
+        if vr is not None:
+            self._verifiers.move_to_end(idr)
+            self.metrics.add_event(MetricsName.VERKEY_CACHE_HITS, 1)
+            return vr
+        self.metrics.add_event(MetricsName.VERKEY_CACHE_MISSES, 1)
+
+        nym = self._get_nym(idr)
+        if not nym:
+            # Verkeys taken from the request itself are not cached
+            return self._create_verifier(idr, self.get_verkey_specific(msg), verifier)
+
+        vr = self._create_verifier(idr, nym.get(VERKEY), verifier)
+        if idr_verifiers is None:
+            idr_verifiers = self._verifiers[idr] = {}
+            if len(self._verifiers) > self._verkey_cache_size:
+                self._verifiers.popitem(last=False)
+        else:
+            self._verifiers.move_to_end(idr)
+        idr_verifiers[verifier] = vr
+        return vr
+
+    def invalidate_verkeys(self, identifiers: Iterable[str]):
+        if not self._verifiers:
+            return
+        for idr in identifiers:
+            self._verifiers.pop(idr, None)
+
+    def clear_verkey_cache(self):
+        self._verifiers.clear()
 
     def authenticate(self,
                      msg: Dict,
@@ -270,6 +335,8 @@ class CoreAuthMixin:
 
 
 class CoreAuthNr(CoreAuthMixin, SimpleAuthNr):
-    def __init__(self, write_types, query_types, action_types, state=None):
-        SimpleAuthNr.__init__(self, state)
+    def __init__(self, write_types, query_types, action_types, state=None,
+                 verkey_cache_size: int = 0,
+                 metrics: MetricsCollector = NullMetricsCollector()):
+        SimpleAuthNr.__init__(self, state, verkey_cache_size, metrics)
         CoreAuthMixin.__init__(self, write_types, query_types, action_types)
@@ -1,4 +1,5 @@
 from plenum.common.messages.internal_messages import NewViewCheckpointsApplied
+from plenum.common.messages.message_base import MessageBase
 from plenum.common.messages.node_messages import Commit, Checkpoint
 from plenum.common.stashing_router import PROCESS, DISCARD
 from plenum.common.types import f
@@ -6,7 +7,7 @@ from plenum.common.util import compare_3PC_keys
 from plenum.server.consensus.consensus_shared_data import ConsensusSharedData
 from plenum.server.replica_validator_enums import INCORRECT_PP_SEQ_NO, ALREADY_ORDERED, STASH_VIEW, \
     FUTURE_VIEW, OLD_VIEW, GREATER_PREP_CERT, STASH_CATCH_UP, CATCHING_UP, STASH_WATERMARKS, \
-    OUTSIDE_WATERMARKS, INCORRECT_INSTANCE, ALREADY_STABLE
+    OUTSIDE_WATERMARKS, INCORRECT_INSTANCE, ALREADY_STABLE, INVALID_MESSAGE
 
 
 class ThreePCMsgValidator:
@@ -58,7 +59,7 @@ class ThreePCMsgValidator:
         # ToDo: we assume, that only is_participating needs checking orderability
         # If Catchup in View Change finished then process Commit messages
         if self._data.is_synced and self._data.legacy_vc_in_progress:
-            return PROCESS, None
+            return self._validate_deferred(msg)
 
         # 5. Check if Participating
         if not self._data.is_participating:
@@ -68,6 +69,17 @@ class ThreePCMsgValidator:
         if not (self._data.low_watermark < pp_seq_no <= self._data.high_watermark):
             return STASH_WATERMARKS, OUTSIDE_WATERMARKS
 
+        return self._validate_deferred(msg)
+
+    @staticmethod
+    def _validate_deferred(msg):
+        # Messages created lazily are fully validated only when processed,
+        # the sender of an invalid one is reported by the ordering service
+        if isinstance(msg, MessageBase):
+            try:
+                msg.validate_deferred()
+            except (TypeError, ValueError):
+                return DISCARD, INVALID_MESSAGE
         return PROCESS, None
 
 
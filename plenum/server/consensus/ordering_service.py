@@ -47,7 +47,7 @@ from plenum.server.replica_freshness_checker import FreshnessChecker
 from plenum.server.replica_helper import replica_batch_digest
 from plenum.server.replica_validator_enums import INCORRECT_INSTANCE, INCORRECT_PP_SEQ_NO, ALREADY_ORDERED, \
     STASH_VIEW, FUTURE_VIEW, OLD_VIEW, GREATER_PREP_CERT, STASH_CATCH_UP, CATCHING_UP, OUTSIDE_WATERMARKS, \
-    STASH_WATERMARKS
+    STASH_WATERMARKS, INVALID_MESSAGE
 from plenum.server.request_managers.write_request_manager import WriteRequestManager
 from plenum.server.suspicion_codes import Suspicions
 from stp_core.common.log import getlogger
@@ -255,6 +255,8 @@ class OrderingService:
         :param sender: name of the node that sent the PREPARE
         """
         result, reason = self._validate(prepare)
+        if reason == INVALID_MESSAGE:
+            self.report_suspicious_node(SuspiciousNode(sender, Suspicions.PR_INVALID, prepare))
         if result != PROCESS:
             return result, reason
 
@@ -464,6 +466,8 @@ class OrderingService:
         :param sender: name of the node that sent the COMMIT
         """
         result, reason = self._validate(commit)
+        if reason == INVALID_MESSAGE:
+            self.report_suspicious_node(SuspiciousNode(sender, Suspicions.CM_INVALID, commit))
         if result != PROCESS:
             return result, reason
 
@@ -3,7 +3,7 @@ from typing import Dict, Optional
 from common.exceptions import LogicError
 from common.serializers.serialization import state_roots_serializer
 from plenum.common.constants import BLS_LABEL, TS_LABEL, IDR_CACHE_LABEL, ATTRIB_LABEL, SEQ_NO_DB_LABEL
-from plenum.common.ledger import Ledger
+from plenum.common.ledger import Ledger, LedgerView
 from state.state import State
 
 
@@ -110,6 +110,23 @@ class DatabaseManager():
     def seq_no_db(self):
         return self.get_store(SEQ_NO_DB_LABEL)
 
+    def committed_snapshot(self) -> 'DatabaseManager':
+        """
+        Database manager with read-only views of committed ledgers and
+        states pinned to their current sizes and roots, which can be used
+        by read request handlers in other threads. Stores and trackers are
+        shared with this database manager.
+        """
+        snapshot = DatabaseManager()
+        for lid, db in self.databases.items():
+            state = db.state.committed_view() if db.state else None
+            snapshot.databases[lid] = Database(LedgerView(db.ledger), state,
+                                               taa_acceptance_required=db.taa_acceptance_required)
+        snapshot._init_db_list()
+        snapshot.stores = self.stores
+        snapshot.trackers = self.trackers
+        return snapshot
+
     # ToDo: implement it and use on close all KV stores
     def close(self):
         # Close all states
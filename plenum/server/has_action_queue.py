@@ -47,6 +47,15 @@ class HasActionQueue:
 
         return self.aid
 
+    def _next_action_time(self) -> float:
+        """
+        Time when `_serviceActions` has something to run, `inf` if nothing
+        is scheduled
+        """
+        if self.actionQueue:
+            return 0
+        return self.aqNextCheck if self.aqStash else float('inf')
+
     def _cancel(self, action: Callable = None, aid: int = None):
         """
         Cancel scheduled events
@@ -86,7 +95,7 @@ class HasActionQueue:
                     if tm > nxt:
                         self.actionQueue.appendleft(action)
                         self.aqStash.remove(d)
-                    if nxt < earliest:
+                    elif nxt < earliest:
                         earliest = nxt
                 self.aqNextCheck = earliest
         count = len(self.actionQueue)
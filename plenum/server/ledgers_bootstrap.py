@@ -227,9 +227,11 @@ class LedgersBootstrap:
                     storage_name,
                     self.data_location,
                     db_name,
-                    db_config=self.config.db_state_config))
+                    db_config=self.config.db_state_config),
+                node_cache_size=self.config.STATE_NODE_CACHE_SIZE)
         else:
-            return PruningState(KeyValueStorageInMemory())
+            return PruningState(KeyValueStorageInMemory(),
+                                node_cache_size=self.config.STATE_NODE_CACHE_SIZE)
 
     def _init_state_from_ledger(self, ledger_id: int):
         """
@@ -240,10 +242,18 @@ class LedgersBootstrap:
         if state.isEmpty:
             logger.info('{} found state to be empty, recreating from ledger {}'.format(self, ledger_id))
             ledger = self.db_manager.get_ledger(ledger_id)
-            for seq_no, txn in ledger.getAllTxn():
-                txn = self._update_txn_with_extra_data(txn)
-                self.write_manager.update_state(txn, isCommitted=True)
-                state.commit(rootHash=state.headHash)
+            if self.config.STATE_BULK_LOAD_ON_REGENERATION and isinstance(state, PruningState):
+                # Final values are collected in memory and the trie is
+                # built from them once
+                with state.bulk_load():
+                    for seq_no, txn in ledger.getAllTxn():
+                        txn = self._update_txn_with_extra_data(txn)
+                        self.write_manager.update_state(txn, isCommitted=True)
+            else:
+                for seq_no, txn in ledger.getAllTxn():
+                    txn = self._update_txn_with_extra_data(txn)
+                    self.write_manager.update_state(txn, isCommitted=True)
+                    state.commit(rootHash=state.headHash)
 
         logger.info(
             "{} initialized state for ledger {}: state root {}".format(
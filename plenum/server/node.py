@@ -27,6 +27,9 @@ from plenum.common.metrics_collector import KvStoreMetricsCollector, NullMetrics
 from plenum.common.timer import QueueTimer
 from plenum.server.backup_instance_faulty_processor import BackupInstanceFaultyProcessor
 from plenum.server.batch_handlers.three_pc_batch import ThreePcBatch
+from plenum.server.batch_handlers.verkey_cache_batch_handler import VerkeyCacheBatchHandler
+from plenum.server.batch_sig_verifier import BatchSigVerifier
+from plenum.server.read_request_pool import ReadRequestPool, check_storages_for_workers
 from plenum.server.inconsistency_watchers import NetworkInconsistencyWatcher
 from plenum.server.last_sent_pp_store_helper import LastSentPpStoreHelper
 from plenum.server.quota_control import StaticQuotaControl, RequestQueueQuotaControl
@@ -37,10 +40,12 @@ from plenum.server.request_managers.read_request_manager import ReadRequestManag
 from plenum.server.request_managers.write_request_manager import WriteRequestManager
 from plenum.server.view_change.node_view_changer import create_view_changer
 from state.pruning_state import PruningState
+from storage.group_commit import GroupCommit
 from storage.helper import initKeyValueStorage, initHashStore, initKeyValueStorageIntKeys
 from storage.state_ts_store import StateTsDbStorage
 from stp_core.common.log import getlogger
 from stp_core.crypto.signer import Signer
+from stp_core.loop.looper import Looper
 from stp_core.network.exceptions import RemoteNotFound
 from stp_core.network.network_interface import NetworkInterface
 from stp_core.types import HA
@@ -94,6 +99,7 @@ from plenum.common.util import friendlyEx, getMaxFailures, pop_keys, \
 from plenum.common.verifier import DidVerifier
 from plenum.common.config_helper import PNodeConfigHelper
 
+from plenum.persistence.db_hash_store import DbHashStore
 from plenum.persistence.req_id_to_txn import ReqIdrToTxn
 from plenum.persistence.storage import Storage, initStorage
 from plenum.bls.bls_crypto_factory import create_default_bls_crypto_factory
@@ -181,6 +187,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.metrics = self._createMetricsCollector()
         if self.config.METRICS_COLLECTOR_TYPE is not None:
             self._gc_time_tracker = GcTimeTracker(self.metrics)
+        # Total hits and misses of state node caches at the last metrics flush
+        self._flushed_state_node_cache_stats = (0, 0)
 
         self._info_tool = self._info_tool_class(self)
 
@@ -189,6 +197,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.init_req_managers()
         # init storages and request handlers
         self._bootstrap_node(bootstrap_cls, storage)
+        self.db_group_commit = self._create_db_group_commit()
 
         # ToDo: refactor this on pluggable req handler integration phase
         self.register_executer(POOL_LEDGER_ID, self.execute_pool_txns)
@@ -205,6 +214,12 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.total_read_request_number = 0
 
         self.clientAuthNr = clientAuthNr or self.defaultAuthNr()
+        self.client_sig_verifier = self._create_client_sig_verifier()
+        self.read_request_pool = self._create_read_request_pool()
+        # Snapshot of committed databases used by the read request pool
+        # and data it was taken at
+        self._read_snapshot = None  # type: Optional[DatabaseManager]
+        self._read_snapshot_key = None
 
         self.addGenesisNyms()
 
@@ -404,6 +419,25 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         # noinspection PyCallingNonCallable
         self.clientstack = cls(**kwargs)
 
+    def _create_client_sig_verifier(self) -> Optional[BatchSigVerifier]:
+        if not self.config.CLIENT_SIG_VERIFICATION_WORKERS:
+            return None
+        return BatchSigVerifier(get_authnr=self.authNr,
+                                on_verified=self._on_client_msg_sig_verified,
+                                on_failed=self._on_client_msg_exception,
+                                workers=self.config.CLIENT_SIG_VERIFICATION_WORKERS,
+                                use_processes=self.config.CLIENT_SIG_VERIFICATION_USE_PROCESSES,
+                                metrics=self.metrics)
+
+    def _create_read_request_pool(self) -> Optional[ReadRequestPool]:
+        if not self.config.READ_REQUEST_WORKERS:
+            return None
+        check_storages_for_workers(self.db_manager)
+        return ReadRequestPool(on_result=self._on_read_request_result,
+                               on_failed=self._on_read_request_failed,
+                               workers=self.config.READ_REQUEST_WORKERS,
+                               metrics=self.metrics)
+
     def monitor_init(self, pluginPaths):
         # QUESTION: Why does the monitor need blacklister?
         self.monitor = Monitor(self.name,
@@ -581,7 +615,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.configLedger,
             preCatchupStartClbk=self.preConfigLedgerCatchup,
             postCatchupCompleteClbk=self.postConfigLedgerCaughtUp,
-            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+            postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
         self.on_new_ledger_added(CONFIG_LEDGER_ID)
 
     def prePoolLedgerCatchup(self, **kwargs):
@@ -871,7 +906,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 self.poolLedger,
                 preCatchupStartClbk=self.prePoolLedgerCatchup,
                 postCatchupCompleteClbk=self.postPoolLedgerCaughtUp,
-                postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+                postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+                postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
             self.on_new_ledger_added(POOL_LEDGER_ID)
 
     def _add_domain_ledger(self):
@@ -880,7 +916,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.domainLedger,
             preCatchupStartClbk=self.preDomainLedgerCatchup,
             postCatchupCompleteClbk=self.postDomainLedgerCaughtUp,
-            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+            postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
         self.on_new_ledger_added(DOMAIN_LEDGER_ID)
 
     def _add_audit_ledger(self):
@@ -889,7 +926,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.auditLedger,
             preCatchupStartClbk=self.preAuditLedgerCatchup,
             postCatchupCompleteClbk=self.postAuditLedgerCaughtUp,
-            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+            postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
         self.on_new_ledger_added(AUDIT_LEDGER_ID)
 
     def getHashStore(self, name) -> HashStore:
@@ -1062,6 +1100,10 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         self.nodestack.stop()
         self.clientstack.stop()
+        if self.client_sig_verifier is not None:
+            self.client_sig_verifier.stop()
+        if self.read_request_pool is not None:
+            self.read_request_pool.stop()
 
         self.closeAllKVStores()
 
@@ -1130,6 +1172,37 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         return c
 
+    def get_wakeup_fds(self) -> Optional[List[int]]:
+        fds = []
+        for stack in (self.nodestack, self.clientstack):
+            stack_fds = stack.get_wakeup_fds()
+            if stack_fds is None:
+                return None
+            fds.extend(stack_fds)
+        return fds
+
+    def has_pending_events(self) -> bool:
+        return self.nodestack.has_pending_messages() or \
+            self.clientstack.has_pending_messages()
+
+    def get_next_wakeup(self) -> Optional[float]:
+        if self.client_sig_verifier is not None and \
+                self.client_sig_verifier.pending_count > 0 or \
+                self.read_request_pool is not None and \
+                self.read_request_pool.pending_count > 0:
+            # results of signature verification and read requests are not
+            # signalled by any descriptor, so keep polling until they are
+            # delivered
+            return time.perf_counter() + Looper.pollInterval
+        times = [self._next_action_time(),
+                 self.monitor._next_action_time(),
+                 self.nodestack.nextCheck]
+        times.extend(replica._next_action_time() for replica in self.replicas.values())
+        timer_time = self.timer.next_event_time()
+        if timer_time is not None:
+            times.append(timer_time)
+        return min(times)
+
     @async_measure_time(MetricsName.SERVICE_REPLICAS_TIME)
     async def serviceReplicas(self, limit) -> int:
         """
@@ -1173,7 +1246,14 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         c = await self.clientstack.service(limit, self.quota_control.client_quota)
         self.metrics.add_event(MetricsName.CLIENT_STACK_MESSAGES_PROCESSED, c)
 
+        if self.client_sig_verifier is not None:
+            self.client_sig_verifier.flush()
+            c += self.client_sig_verifier.service()
+
         await self.processClientInBox()
+
+        if self.read_request_pool is not None:
+            c += self.read_request_pool.service()
         return c
 
     @async_measure_time(MetricsName.SERVICE_VIEW_CHANGER_TIME)
@@ -1686,7 +1766,10 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         with self.metrics.measure_time(MetricsName.INT_VALIDATE_NODE_MSG_TIME):
             try:
-                message = node_message_factory.get_instance(**msg)
+                if self.config.LAZY_3PC_MESSAGE_VALIDATION:
+                    message = node_message_factory.get_lazy_instance(**msg)
+                else:
+                    message = node_message_factory.get_instance(**msg)
             except (MissingNodeOp, InvalidNodeOp) as ex:
                 raise ex
             except Exception as ex:
@@ -1762,12 +1845,23 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         except BlowUp:
             raise
         except Exception as ex:
-            msg, frm = wrappedMsg
-            friendly = friendlyEx(ex)
-            if isinstance(ex, SuspiciousClient):
-                self.reportSuspiciousClient(frm, friendly)
+            self._on_client_msg_exception(ex, wrappedMsg)
+
+    def _on_client_msg_sig_verified(self, msg, frm):
+        try:
+            self.unpackClientMsg(msg, frm)
+        except BlowUp:
+            raise
+        except Exception as ex:
+            self._on_client_msg_exception(ex, (msg, frm))
+
+    def _on_client_msg_exception(self, ex, wrappedMsg):
+        msg, frm = wrappedMsg
+        friendly = friendlyEx(ex)
+        if isinstance(ex, SuspiciousClient):
+            self.reportSuspiciousClient(frm, friendly)
 
-            self.handleInvalidClientMsg(ex, wrappedMsg)
+        self.handleInvalidClientMsg(ex, wrappedMsg)
 
     def handleInvalidClientMsg(self, ex, wrappedMsg):
         msg, frm = wrappedMsg
@@ -1844,6 +1938,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.doStaticValidation(cMsg)
 
         self.internal_bus.send(PreSigVerification(cMsg))
+        if self.client_sig_verifier is not None and isinstance(cMsg, Request):
+            # Signature is verified in a batch together with other requests
+            # received during this looper run, see `serviceClientMsgs`
+            self.client_sig_verifier.add(cMsg, frm)
+            return None
         self.verifySignature(cMsg)
         logger.trace("{} received CLIENT message: {}".
                      format(self.clientstack.name, cMsg))
@@ -1948,6 +2047,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.postRecvTxnFromCatchup(ledger_id, txn)
         if self.write_manager.is_valid_type(typ):
             self.write_manager.update_state(txn, isCommitted=True)
+            if ledger_id == DOMAIN_LEDGER_ID:
+                self.clientAuthNr.invalidate_verkeys(VerkeyCacheBatchHandler.nym_targets([txn]))
             state = self.getState(ledger_id)
             if state:
                 state.commit(rootHash=state.headHash)
@@ -1963,6 +2064,39 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.updateSeqNoMap([txn], ledger_id)
         self._clear_request_for_txn(ledger_id, txn)
 
+    def postTxnsFromCatchupAddedToLedger(self, ledger_id: int, txns: List[Any]):
+        """
+        The same as calling `postTxnFromCatchupAddedToLedger` for every txn,
+        but the seqNo map is updated once. The state is still committed
+        after every txn since handlers read previous values of keys from
+        committed state and a reply may have several txns for the same key.
+        """
+        state = self.getState(ledger_id)
+        record_ts = self.stateTsDbStorage and (ledger_id == DOMAIN_LEDGER_ID or ledger_id == CONFIG_LEDGER_ID)
+        state_updated = False
+        for txn in txns:
+            self.postRecvTxnFromCatchup(ledger_id, txn)
+            if not self.write_manager.is_valid_type(get_type(txn)):
+                continue
+            self.write_manager.update_state(txn, isCommitted=True)
+            state_updated = True
+            if state:
+                state.commit(rootHash=state.headHash)
+                if record_ts:
+                    timestamp = get_txn_time(txn)
+                    if timestamp is not None:
+                        self.stateTsDbStorage.set(timestamp, state.headHash)
+        if state_updated:
+            if ledger_id == DOMAIN_LEDGER_ID:
+                self.clientAuthNr.invalidate_verkeys(VerkeyCacheBatchHandler.nym_targets(txns))
+            if state:
+                logger.trace("{} added transactions with seqNos {} to {} to ledger {} during catchup, state root {}"
+                             .format(self, get_seq_no(txns[0]), get_seq_no(txns[-1]), ledger_id,
+                                     state_roots_serializer.serialize(bytes(state.committedHeadHash))))
+        self.updateSeqNoMap([txn for txn in txns if get_req_id(txn)], ledger_id)
+        for txn in txns:
+            self._clear_request_for_txn(ledger_id, txn)
+
     def _clear_request_for_txn(self, ledger_id, txn):
         req_key = get_digest(txn)
         if req_key is not None:
@@ -2371,9 +2505,34 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         except Exception as ex:
             self.send_nack_to_client((request.identifier, request.reqId),
                                      str(ex), frm)
+        if self.read_request_pool is not None:
+            snapshot = self._committed_read_snapshot()
+            self.read_request_pool.submit(request, frm,
+                                          lambda: Reply(self.read_manager.get_result_for_snapshot(request, snapshot)))
+            return
         result = self.read_manager.get_result(request)
         self.transmitToClient(Reply(result), frm)
 
+    def _committed_read_snapshot(self) -> DatabaseManager:
+        # A new snapshot is taken only when committed data changes
+        key = tuple((lid, db.ledger.size, db.state.committedHeadHash if db.state else None)
+                    for lid, db in self.db_manager.databases.items())
+        if key != self._read_snapshot_key:
+            self._read_snapshot = self.db_manager.committed_snapshot()
+            self._read_snapshot_key = key
+        return self._read_snapshot
+
+    def _on_read_request_result(self, reply, request: Request, frm: str):
+        self.transmitToClient(reply, frm)
+
+    def _on_read_request_failed(self, ex: Exception, msg: Tuple[Request, str]):
+        if isinstance(ex, InvalidClientMessageException):
+            self.handleInvalidClientMsg(ex, msg)
+            return
+        request, frm = msg
+        logger.warning("{} failed to get result of read request {}: {}".format(self, request, ex))
+        self.send_nack_to_client((request.identifier, request.reqId), str(ex), frm)
+
     def process_action(self, request, frm):
         # Process an execute action request
         self.send_ack_to_client((request.identifier, request.reqId), frm)
@@ -2466,10 +2625,15 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                      frm)
             return
 
-        seq_no = request.operation.get(DATA)
         self.send_ack_to_client((request.identifier, request.reqId), frm)
-        ledger = self.getLedger(ledger_id)
+        if self.read_request_pool is not None:
+            ledger = self._committed_read_snapshot().get_ledger(ledger_id)
+            self.read_request_pool.submit(request, frm, lambda: self._get_txn_reply(request, ledger))
+            return
+        self.transmitToClient(self._get_txn_reply(request, self.getLedger(ledger_id)), frm)
 
+    def _get_txn_reply(self, request: Request, ledger) -> Reply:
+        seq_no = request.operation.get(DATA)
         try:
             txn = self.getReplyFromLedger(ledger, seq_no)
         except KeyError:
@@ -2491,7 +2655,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             result[DATA] = txn.result
             result[f.SEQ_NO.nm] = get_seq_no(txn.result)
 
-        self.transmitToClient(Reply(result), frm)
+        return Reply(result)
 
     @measure_time(MetricsName.PROCESS_ORDERED_TIME)
     def processOrdered(self, ordered: Ordered):
@@ -2654,6 +2818,16 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.metrics.add_event(MetricsName.DOMAIN_LEDGER_UNCOMMITTED_SIZE, len(self.domainLedger.uncommittedTxns))
         self.metrics.add_event(MetricsName.CONFIG_LEDGER_UNCOMMITTED_SIZE, len(self.configLedger.uncommittedTxns))
 
+        # Caches count hits and misses since start, report them since the
+        # last flush like per lookup counters of other caches. States other
+        # than PruningState (e.g. from plugins) have no node cache.
+        hits = sum(getattr(state, 'node_cache_hits', 0) for state in self.states.values())
+        misses = sum(getattr(state, 'node_cache_misses', 0) for state in self.states.values())
+        flushed_hits, flushed_misses = self._flushed_state_node_cache_stats
+        self.metrics.add_event(MetricsName.STATE_NODE_CACHE_HITS, hits - flushed_hits)
+        self.metrics.add_event(MetricsName.STATE_NODE_CACHE_MISSES, misses - flushed_misses)
+        self._flushed_state_node_cache_stats = (hits, misses)
+
         # Collections metrics
         def sum_for_values(obj):
             # We don't want to get 0 if we have huge dictionary of empty queues, hence +1
@@ -3173,8 +3347,9 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
     def commitAndSendReplies(self, three_pc_batch: ThreePcBatch) -> List:
         logger.trace('{} going to commit and send replies to client'.format(self))
-        committed_txns = self.write_manager.commit_batch(three_pc_batch)
-        self.updateSeqNoMap(committed_txns, three_pc_batch.ledger_id)
+        with self.db_group_commit.group():
+            committed_txns = self.write_manager.commit_batch(three_pc_batch)
+            self.updateSeqNoMap(committed_txns, three_pc_batch.ledger_id)
         updated_committed_txns = list(map(self.update_txn_with_extra_data, committed_txns))
         self.sendRepliesToClients(updated_committed_txns, three_pc_batch.pp_time)
         return committed_txns
@@ -3259,7 +3434,9 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         return CoreAuthNr(self.write_manager.txn_types,
                           self.read_manager.txn_types,
                           self.action_manager.txn_types,
-                          state=state)
+                          state=state,
+                          verkey_cache_size=self.config.VERKEY_CACHE_SIZE,
+                          metrics=self.metrics)
 
     def defaultAuthNr(self) -> ReqAuthenticator:
         req_authnr = ReqAuthenticator()
@@ -3592,6 +3769,47 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
     def _bootstrap_node(self, bootstrap_cls, storage):
         bootstrap_cls(self).init(domain_storage=storage)
 
+    def _create_db_group_commit(self) -> GroupCommit:
+        """
+        Group writes to RocksDB storages made on commit of a 3PC batch.
+        Storages are written in the same order as they are written without
+        grouping: ledgers first, then states and the timestamp store, the
+        audit ledger and the rest, so that after a crash storages are
+        recovered the same way as before.
+        """
+        from storage.kv_store_rocksdb import KeyValueStorageRocksdb
+
+        group_commit = GroupCommit(fsync_period=self.config.DB_GROUP_COMMIT_FSYNC_PERIOD)
+        if not self.config.DB_GROUP_COMMIT:
+            return group_commit
+
+        def ledger_storages(ledger_ids):
+            storages = []
+            for ledger_id in ledger_ids:
+                ledger = self.db_manager.get_ledger(ledger_id)
+                if not isinstance(ledger, Ledger):
+                    continue
+                storages.append(ledger._transactionLog)
+                hash_store = ledger.tree.hashStore
+                if isinstance(hash_store, DbHashStore):
+                    storages.extend([hash_store.leavesDb, hash_store.nodesDb])
+            return storages
+
+        storages = ledger_storages(lid for lid in self.db_manager.ledgers if lid != AUDIT_LEDGER_ID)
+        storages.extend(state._kv for state in self.states.values())
+        if self.stateTsDbStorage is not None:
+            storages.extend(self.stateTsDbStorage._storages.values())
+        storages.extend(ledger_storages([AUDIT_LEDGER_ID]))
+        if self.seqNoDB is not None:
+            storages.append(self.seqNoDB._keyValueStorage)
+        if self.bls_bft is not None:
+            storages.append(self.bls_bft.bls_store._kvs)
+
+        for storage in storages:
+            if isinstance(storage, KeyValueStorageRocksdb):
+                group_commit.add_storage(storage)
+        return group_commit
+
     def get_validators(self):
         return self.poolManager.node_ids_ordered_by_rank(
             self.nodeReg, self.poolManager.get_node_ids())
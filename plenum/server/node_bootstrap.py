@@ -2,6 +2,7 @@ from crypto.bls.bls_bft import BlsBft
 from plenum.bls.bls_bft_factory import create_default_bls_bft_factory
 from plenum.common.ledger_manager import LedgerManager
 from plenum.server.batch_handlers.ts_store_batch_handler import TsStoreBatchHandler
+from plenum.server.batch_handlers.verkey_cache_batch_handler import VerkeyCacheBatchHandler
 from plenum.server.future_primaries_batch_handler import FuturePrimariesBatchHandler
 from plenum.server.last_sent_pp_store_helper import LastSentPpStoreHelper
 from plenum.server.ledgers_bootstrap import LedgersBootstrap
@@ -105,6 +106,11 @@ class NodeBootstrap(LedgersBootstrap):
         future_primaries_handler = FuturePrimariesBatchHandler(self.db_manager, self.node)
         self.write_manager.register_batch_handler(future_primaries_handler)
 
+    def _register_domain_batch_handlers(self):
+        super()._register_domain_batch_handlers()
+        verkey_cache_handler = VerkeyCacheBatchHandler(self.db_manager, self.node)
+        self.write_manager.register_batch_handler(verkey_cache_handler)
+
     def register_ts_store_batch_handlers(self):
         ts_store_b_h = TsStoreBatchHandler(self.node.db_manager)
         for lid in [DOMAIN_LEDGER_ID, CONFIG_LEDGER_ID]:
@@ -0,0 +1,117 @@
+"""
+Serving of read requests on a pool of worker threads.
+
+Requests are answered from read-only views of committed ledgers and
+states (see `DatabaseManager.committed_snapshot`) taken on the looper
+thread when the request is submitted, so workers never see changes made
+by ordering after that and never touch uncommitted data. Results are
+delivered back on the looper thread in the order requests were submitted.
+"""
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Any, Tuple
+
+from plenum.common.constants import KeyValueStorageType
+from plenum.common.metrics_collector import MetricsCollector, NullMetricsCollector, MetricsName
+from plenum.common.request import Request
+from plenum.persistence.db_hash_store import DbHashStore
+from plenum.server.database_manager import DatabaseManager
+from storage.kv_store_rocksdb import KeyValueStorageRocksdb
+
+
+def check_storages_for_workers(db_manager: DatabaseManager):
+    """
+    Raise if transaction logs or hash stores of ledgers cannot be read by
+    workers while the node keeps writing them. Only RocksDB ones can:
+    chunked file stores share open chunks and file positions, the memory
+    mapped hash store closes its map when the file grows.
+    """
+    for ledger_id, ledger in db_manager.ledgers.items():
+        hash_store = ledger.tree.hashStore
+        if not isinstance(ledger._transactionLog, KeyValueStorageRocksdb) or \
+                not isinstance(hash_store, DbHashStore) or \
+                hash_store.db_type != KeyValueStorageType.Rocksdb:
+            raise RuntimeError('read request workers need RocksDB transaction log and hash store, '
+                               'ledger {} has {} and {}'.format(ledger_id,
+                                                                type(ledger._transactionLog).__name__,
+                                                                type(hash_store).__name__))
+
+
+class _SubmittedRequest:
+    __slots__ = ('msg', 'frm', 'future', 'started')
+
+    def __init__(self, msg: Request, frm: str, future, started: float):
+        self.msg = msg
+        self.frm = frm
+        self.future = future
+        self.started = started
+
+
+class ReadRequestPool:
+    """
+    Runs functions getting results of read requests on a pool of worker
+    threads. Worker threads are used instead of processes since handlers
+    read databases opened by the node, which keeps writing them.
+    """
+
+    def __init__(self,
+                 on_result: Callable[[Any, Request, str], None],
+                 on_failed: Callable[[Exception, Tuple[Request, str]], None],
+                 workers: int,
+                 executor=None,
+                 metrics: MetricsCollector = NullMetricsCollector()):
+        if workers < 1:
+            raise ValueError("number of workers should be positive, got {}".format(workers))
+        self._on_result = on_result
+        self._on_failed = on_failed
+        self._workers = workers
+        self._executor = executor
+        self._metrics = metrics
+        self._submitted = deque()  # type: deque[_SubmittedRequest]
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._submitted)
+
+    def submit(self, msg: Request, frm: str, get_result: Callable[[], Any]):
+        """
+        Start getting result of the request in a worker, `get_result` must
+        only read from database snapshots
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._workers)
+        self._submitted.append(_SubmittedRequest(msg, frm,
+                                                 self._executor.submit(get_result),
+                                                 time.perf_counter()))
+
+    def service(self) -> int:
+        """
+        Deliver results of all finished requests, stopping at the first
+        unfinished one to preserve order of replies
+        :return: number of delivered results
+        """
+        count = 0
+        while self._submitted and self._submitted[0].future.done():
+            req = self._submitted.popleft()
+            self._metrics.add_event(MetricsName.READ_REQUEST_WORKER_TIME, time.perf_counter() - req.started)
+            count += 1
+            try:
+                result = req.future.result()
+            except Exception as ex:
+                self._on_failed(ex, (req.msg, req.frm))
+                continue
+            self._on_result(result, req.msg, req.frm)
+        return count
+
+    def stop(self):
+        """
+        Drop requests which are not started yet and wait for the ones being
+        served, so that databases can be closed after that
+        """
+        for req in self._submitted:
+            req.future.cancel()
+        self._submitted.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
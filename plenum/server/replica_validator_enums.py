@@ -19,3 +19,4 @@ GREATER_PREP_CERT = "Greater than last prepared certificate"
 ALREADY_ORDERED = "Already ordered"
 ALREADY_STABLE = "Already stable checkpoint"
 WAITING_FOR_NEW_VIEW = "View change in progress; waiting for New View from a new Primary"
+INVALID_MESSAGE = "Invalid message"
@@ -30,11 +30,24 @@ class ReqAuthenticator:
         :param req_data:
         :return:
         """
-        identifiers = set()
-        typ = req_data.get(OPERATION, {}).get(TXN_TYPE)
         if key and self._check_and_verify_existing_req(req_data, key):
             return self._verified_reqs[key]['identifiers']
 
+        identifiers = self.authenticate_uncached(req_data)
+        if key and identifiers:
+            self.add_verified(key, req_data, identifiers)
+        return identifiers
+
+    def authenticate_uncached(self, req_data):
+        """
+        Same as `authenticate` but neither consults nor updates the cache of
+        already verified requests.
+        :param req_data:
+        :return: identifiers whose signatures were verified, empty set for
+        queries
+        """
+        identifiers = set()
+        typ = req_data.get(OPERATION, {}).get(TXN_TYPE)
         for authenticator in self._authenticators:
             if authenticator.is_query(typ):
                 return set()
@@ -46,11 +59,18 @@ class ReqAuthenticator:
 
         if not identifiers:
             raise NoAuthenticatorFound
-        if key:
-            self._verified_reqs[key] = {'signature': req_data.get(f.SIG.nm)}
-            self._verified_reqs[key]['identifiers'] = identifiers
         return identifiers
 
+    def is_verified(self, req_data: dict, key: str):
+        return bool(key) and self._check_and_verify_existing_req(req_data, key)
+
+    def add_verified(self, key: str, req_data: dict, identifiers):
+        self._verified_reqs[key] = {'signature': req_data.get(f.SIG.nm)}
+        self._verified_reqs[key]['identifiers'] = identifiers
+
+    def get_verified_identifiers(self, key: str):
+        return self._verified_reqs[key]['identifiers']
+
     def _check_and_verify_existing_req(self, req_data: dict, key: str):
         if key in self._verified_reqs:
             if req_data.get(f.SIG.nm) == self._verified_reqs[key]['signature']:
@@ -68,6 +88,14 @@ class ReqAuthenticator:
             if isinstance(authnr, authnr_type):
                 return authnr
 
+    def invalidate_verkeys(self, identifiers):
+        for authenticator in self._authenticators:
+            authenticator.invalidate_verkeys(identifiers)
+
+    def clear_verkey_cache(self):
+        for authenticator in self._authenticators:
+            authenticator.clear_verkey_cache()
+
     def clean_from_verified(self, key):
         if key in self._verified_reqs:
             self._verified_reqs.pop(key)
@@ -1,9 +1,11 @@
+from copy import copy
 from typing import Dict
 
 from common.exceptions import LogicError
 from plenum.common.constants import TXN_TYPE
 from plenum.common.messages.node_messages import RequestNack
 from plenum.common.request import Request
+from plenum.server.database_manager import DatabaseManager
 from plenum.server.request_handlers.handler_interfaces.read_request_handler import ReadRequestHandler
 from plenum.server.request_managers.request_manager import RequestManager
 
@@ -29,3 +31,15 @@ class ReadRequestManager(RequestManager):
         if handler is None:
             return RequestNack(request.identifier, request.reqId)
         return handler.get_result(request)
+
+    def get_result_for_snapshot(self, request: Request, snapshot: DatabaseManager):
+        """
+        Get result of the request using the given database snapshot instead
+        of databases of the handler, see `DatabaseManager.committed_snapshot`
+        """
+        handler = self.request_handlers.get(request.operation[TXN_TYPE], None)
+        if handler is None:
+            return RequestNack(request.identifier, request.reqId)
+        handler = copy(handler)
+        handler.database_manager = snapshot
+        return handler.get_result(request)
@@ -88,6 +88,8 @@ class Suspicions:
                                                  "incorrect audit ledger transaction root hash")
 
     REPLICAS_COUNT_CHANGED = Suspicion(46, "Replica's count changed")
+    PR_INVALID = Suspicion(47, "Prepare message is not valid")
+    CM_INVALID = Suspicion(48, "Commit message is not valid")
 
     @classmethod
     def get_list(cls):
@@ -0,0 +1,100 @@
+import msgpack
+import pytest
+
+from plenum.common.messages.node_message_codec import pack_message, pack_serialized, \
+    pack_batch, unpack_messages, is_binary_frame, schema_fingerprint
+from plenum.common.messages.node_messages import PrePrepare, Commit, CatchupRep, ViewChange, \
+    Checkpoint, LedgerStatus, Prepare
+from plenum.common.util import get_utc_epoch
+from stp_zmq.zstack import ZStack
+
+ROOT = '5BU5Rc3sRtTJB6tVprGiTSqiRaa9o6ei11MjH4Vu16ms'
+
+MESSAGES = [
+    PrePrepare(0, 1, 2, get_utc_epoch(), ['a' * 20, 'b' * 20], None, 'd' * 64, 1,
+               ROOT, ROOT, 0, True, ROOT, ROOT),
+    Prepare(0, 1, 2, get_utc_epoch(), 'd' * 64, ROOT, ROOT),
+    Commit(0, 1, 2),
+    Commit(0, 1, 2, 'sig', {'a': [1, 2]}),
+    CatchupRep(1, {1: {'a': 1}, 2: {'b': [1, 2]}}, [ROOT]),
+    ViewChange(1, 10, [(0, 1, 'd')], [], [Checkpoint(0, 0, 1, 10, ROOT)]),
+    LedgerStatus(1, 10, None, None, ROOT, 2),
+]
+
+
+def json_round_trip(msg):
+    return ZStack.deserializeMsg(ZStack.serializeMsg(msg))
+
+
+@pytest.mark.parametrize('as_dict', [False, True])
+@pytest.mark.parametrize('msg', MESSAGES, ids=lambda msg: msg.typename)
+def test_unpacked_message_is_the_same_as_from_json(msg, as_dict):
+    packed = pack_message(msg._asdict() if as_dict else msg)
+
+    assert is_binary_frame(packed)
+    assert len(packed) < len(ZStack.serializeMsg(msg._asdict()))
+    assert unpack_messages(packed) == [json_round_trip(msg._asdict())]
+
+
+def test_absent_optional_fields_are_not_unpacked():
+    msg = PrePrepare(0, 1, 2, get_utc_epoch(), [], None, 'd' * 64, 1,
+                     ROOT, ROOT, 0, True, None, ROOT)._asdict()
+    del msg['poolStateRootHash']
+
+    unpacked = unpack_messages(pack_message(msg))[0]
+
+    assert 'poolStateRootHash' not in unpacked
+    assert unpacked == json_round_trip(msg)
+
+
+def test_messages_without_schema_are_packed_as_maps():
+    msg = {'op': 'UNKNOWN', 'a': (1, 2), 'b': {3: None}}
+    assert unpack_messages(pack_message(msg)) == [json_round_trip(msg)]
+
+    msg = Commit(0, 1, 2)._asdict()
+    msg['extra'] = 1
+    assert unpack_messages(pack_message(msg)) == [json_round_trip(msg)]
+
+
+def test_values_which_json_cannot_have_are_not_packed():
+    msg = Commit(0, 1, 2)._asdict()
+    msg['plugin_fields'] = {'a': object()}
+    with pytest.raises(TypeError):
+        pack_message(msg)
+
+
+@pytest.mark.parametrize('count', [1, 20, 70000])
+def test_batch_unpacks_into_messages(count):
+    msgs = [MESSAGES[i % len(MESSAGES)]._asdict() for i in range(count)]
+    frame = pack_batch([pack_message(m) for m in msgs] +
+                       [pack_serialized(b'pi'), pack_serialized(ZStack.serializeMsg(msgs[0]))])
+
+    assert is_binary_frame(frame)
+    unpacked = unpack_messages(frame)
+
+    assert unpacked[:len(msgs)] == [json_round_trip(m) for m in msgs]
+    assert unpacked[len(msgs):] == ['pi', ZStack.serializeMsg(msgs[0]).decode()]
+
+
+def test_json_and_health_messages_are_not_binary():
+    assert not is_binary_frame(ZStack.serializeMsg(Commit(0, 1, 2)._asdict()))
+    assert not is_binary_frame(b'pi')
+    assert not is_binary_frame(b'')
+
+
+@pytest.mark.parametrize('frame', [
+    msgpack.packb(['UNKNOWN', 1]),
+    msgpack.packb([]),
+    msgpack.packb(['COMMIT', 0, 1, 2, None, None, None]),
+    msgpack.packb(['COMMIT', msgpack.ExtType(5, b'')]),
+    b'\xa2\xff\xfe',
+    msgpack.packb(['COMMIT', 0, 1, 2])[:-1],
+    msgpack.packb(['COMMIT', 0, 1, 2]) + b'\x01',
+])
+def test_malformed_frames_are_rejected(frame):
+    with pytest.raises(Exception):
+        unpack_messages(frame)
+
+
+def test_schema_fingerprint_is_stable():
+    assert schema_fingerprint() == schema_fingerprint()
@@ -0,0 +1,51 @@
+import pickle
+from hashlib import sha256
+
+from common.serializers.serialization import serialize_msg_for_signing
+from plenum.common.request import Request
+
+
+def make_request():
+    return Request(identifier='L5AD5g65TDQr1PPHHRoiGf',
+                   reqId=1513945121191691,
+                   operation={'type': '1', 'dest': 'GEzcdDLhCpGCYRHW82kjHd'},
+                   signature='sig',
+                   protocolVersion=2,
+                   taaAcceptance={'mechanism': 'click', 'time': 1513900000})
+
+
+def test_digests_are_same_as_with_plain_serialization():
+    req = make_request()
+    assert req.digest == \
+        sha256(serialize_msg_for_signing(req.signingState())).hexdigest()
+    assert req.payload_digest == \
+        sha256(serialize_msg_for_signing(req.signingPayloadState())).hexdigest()
+    assert req.serialized() == serialize_msg_for_signing(req.__getstate__())
+
+
+def test_signed_containers_are_serialized_once():
+    req = make_request()
+    req.getDigest()
+    memoized_operation = req._signing_memo['operation']
+    req.getPayloadDigest()
+    req.serialized()
+    assert req._signing_memo['operation'] is memoized_operation
+
+
+def test_replaced_operation_is_serialized_again():
+    req = make_request()
+    digest = req.getDigest()
+    req.operation = {'type': '2'}
+    assert req.getDigest() != digest
+    assert req.getDigest() == \
+        sha256(serialize_msg_for_signing(req.signingState())).hexdigest()
+
+
+def test_memo_is_not_part_of_state():
+    req = make_request()
+    req.getDigest()
+    assert '_signing_memo' not in req.__getstate__()
+
+    restored = Request.fromState(req.__getstate__())
+    assert restored.getDigest() == req.getDigest()
+    assert pickle.loads(pickle.dumps(req)).getPayloadDigest() == req.getPayloadDigest()
@@ -4,9 +4,12 @@ import pytest
 
 from plenum.common.exceptions import SuspiciousNode
 from plenum.common.messages.internal_messages import RaisedSuspicion
+from plenum.common.messages.node_messages import Prepare
+from plenum.common.stashing_router import DISCARD
 from plenum.common.util import updateNamedTuple
 from plenum.server.consensus.ordering_service_msg_validator import OrderingServiceMsgValidator
 from plenum.server.models import ThreePhaseVotes
+from plenum.server.replica_validator_enums import INVALID_MESSAGE
 from plenum.server.suspicion_codes import Suspicions
 from plenum.test.consensus.order_service.helper import _register_pp_ts, check_suspicious
 from plenum.test.helper import generate_state_root, create_prepare_from_pre_prepare
@@ -43,6 +46,22 @@ def test_process_valid_prepare(o, pre_prepare, prepare):
     assert o.prepares.hasPrepareFrom(prepare, NON_PRIMARY_NAME)
 
 
+def test_process_invalid_lazily_created_prepare(o, pre_prepare, prepare):
+    handler = Mock()
+    o._bus.subscribe(RaisedSuspicion, handler)
+    o.process_preprepare(pre_prepare, PRIMARY_NAME)
+    raw = prepare._asdict()
+    raw['digest'] = 1
+    invalid = Prepare.create_lazily(**raw)
+    assert o.process_prepare(invalid, NON_PRIMARY_NAME) == (DISCARD, INVALID_MESSAGE)
+    assert handler.call_count == 1
+    ex = handler.call_args[0][0].ex
+    expected = SuspiciousNode(NON_PRIMARY_NAME, Suspicions.PR_INVALID, invalid)
+    assert (ex.node, ex.code) == (expected.node, expected.code)
+    assert ex.offendingMsg is invalid
+    assert not o.prepares.hasPrepareFrom(prepare, NON_PRIMARY_NAME)
+
+
 def test_validate_prepare_from_primary(o, prepare):
     handler = Mock()
     o._bus.subscribe(RaisedSuspicion, handler)
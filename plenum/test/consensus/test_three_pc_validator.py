@@ -1,10 +1,12 @@
 import pytest
 
+from plenum.common.messages.node_messages import Prepare
 from plenum.common.startable import Mode
 from plenum.common.stashing_router import PROCESS, DISCARD
 from plenum.server.consensus.ordering_service import ThreePCMsgValidator
 from plenum.server.replica_validator_enums import INCORRECT_PP_SEQ_NO, ALREADY_ORDERED, FUTURE_VIEW, \
-    STASH_VIEW, OLD_VIEW, STASH_CATCH_UP, CATCHING_UP, OUTSIDE_WATERMARKS, STASH_WATERMARKS, GREATER_PREP_CERT
+    STASH_VIEW, OLD_VIEW, STASH_CATCH_UP, CATCHING_UP, OUTSIDE_WATERMARKS, STASH_WATERMARKS, GREATER_PREP_CERT, \
+    INVALID_MESSAGE
 from plenum.test.bls.helper import generate_state_root
 from plenum.test.helper import create_pre_prepare_no_bls, create_prepare, create_commit_no_bls_sig
 
@@ -286,3 +288,33 @@ def test_check_ordered_not_participating(validator, pp_seq_no, result, inst_id):
                                pp_seq_no=pp_seq_no,
                                inst_id=inst_id):
         assert validator.validate(msg) == result
+
+
+def test_process_lazily_created(validator, inst_id):
+    for msg in create_3pc_msgs(view_no=validator._data.view_no,
+                               pp_seq_no=1,
+                               inst_id=inst_id)[1:]:
+        lazy = msg.create_lazily(**msg._asdict())
+        assert validator.validate(lazy) == (PROCESS, None)
+        assert lazy == msg
+
+
+@pytest.mark.parametrize('index, field', [(1, 'digest'), (2, 'blsSig')])
+def test_discard_invalid_lazily_created(validator, inst_id, index, field):
+    msg = create_3pc_msgs(view_no=validator._data.view_no,
+                          pp_seq_no=1,
+                          inst_id=inst_id)[index]
+    raw = msg._asdict()
+    raw[field] = 1
+    assert validator.validate(msg.create_lazily(**raw)) == (DISCARD, INVALID_MESSAGE)
+
+
+def test_stash_invalid_lazily_created_without_validation(validator, inst_id):
+    prepare = create_3pc_msgs(view_no=validator._data.view_no + 1,
+                              pp_seq_no=1,
+                              inst_id=inst_id)[1]
+    raw = prepare._asdict()
+    raw['digest'] = 1
+    msg = Prepare.create_lazily(**raw)
+    assert validator.validate(msg) == (STASH_VIEW, FUTURE_VIEW)
+    assert msg._deferred_input is not None
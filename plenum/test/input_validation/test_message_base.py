@@ -1,6 +1,6 @@
 import pytest
 
-from plenum.common.messages.fields import NonNegativeNumberField
+from plenum.common.messages.fields import NonNegativeNumberField, NonEmptyStringField, LimitedLengthStringField
 from plenum.common.messages.message_base import MessageBase
 
 
@@ -12,6 +12,25 @@ class MessageTest(MessageBase):
     )
 
 
+class MessageWithHeaderTest(MessageBase):
+    typename = 'MessageWithHeaderTest'
+    schema = (
+        ('a', NonNegativeNumberField()),
+        ('b', NonNegativeNumberField()),
+    )
+    header_fields = ('a',)
+
+
+class MessageWithOptionalTest(MessageBase):
+    typename = 'MessageWithOptionalTest'
+    schema = (
+        ('a', NonNegativeNumberField()),
+        ('name', NonEmptyStringField(optional=True)),
+        ('items', NonNegativeNumberField(optional=True)),
+        ('note', LimitedLengthStringField(max_length=3, nullable=True)),
+    )
+
+
 def test_init_args():
     msg = MessageTest(1, 2)
     assert msg
@@ -30,3 +49,116 @@ def test_message_base_init_with_both_args_kwargs():
     with pytest.raises(ValueError) as excinfo:
         MessageTest(1, b=3)
     assert "*args, **kwargs cannot be used together" == str(excinfo.value)
+
+
+def test_validation_errors():
+    with pytest.raises(TypeError) as excinfo:
+        MessageTest(a=1)
+    assert "validation error [MessageTest]: missed fields - b. " == str(excinfo.value)
+
+    with pytest.raises(TypeError) as excinfo:
+        MessageTest(a=1, b=-2)
+    assert "validation error [MessageTest]: negative value (b=-2)" == str(excinfo.value)
+
+    with pytest.raises(TypeError) as excinfo:
+        MessageTest(a='1', b=2)
+    assert "validation error [MessageTest]: expected types 'int', got 'str' (a=1)" == str(excinfo.value)
+
+    with pytest.raises(TypeError) as excinfo:
+        MessageWithOptionalTest(a=1, note='long')
+    assert "validation error [MessageWithOptionalTest]: " \
+           "long is longer than 3 symbols (note=long)" == str(excinfo.value)
+
+
+def test_nullable_and_optional_fields():
+    msg = MessageWithOptionalTest(a=1, note=None)
+    assert msg.note is None
+    assert list(msg.keys()) == ['a', 'note']
+    with pytest.raises(AttributeError) as excinfo:
+        msg.name
+    assert "'MessageWithOptionalTest' object has no attribute 'name'" == str(excinfo.value)
+    assert getattr(msg, 'name', 'default') == 'default'
+
+
+def test_fields_are_attributes():
+    msg = MessageWithOptionalTest(note='abc', a=1)
+    assert list(msg.keys()) == ['a', 'note']
+    # the field which name is a method of mapping is not an attribute
+    assert callable(msg.items)
+
+    msg._fields['a'] = 2
+    assert msg.a == 2
+    assert msg == MessageWithOptionalTest(a=2, note='abc')
+
+    # a value assigned to an attribute overrides the field
+    msg.a = 3
+    assert msg.a == 3
+    assert msg._fields['a'] == 2
+
+
+def test_schema_replaced_in_class():
+    class MessageToExtend(MessageBase):
+        typename = 'MessageToExtend'
+        schema = (
+            ('a', NonNegativeNumberField()),
+        )
+
+    assert MessageToExtend(a=1).a == 1
+    MessageToExtend.schema = MessageToExtend.schema + (('b', NonEmptyStringField()),)
+
+    msg = MessageToExtend(a=1, b='b')
+    assert msg.b == 'b'
+    with pytest.raises(TypeError) as excinfo:
+        MessageToExtend(a=1, b='')
+    assert "validation error [MessageToExtend]: empty string (b=)" == str(excinfo.value)
+
+
+def test_create_lazily_validates_header_only():
+    msg = MessageWithHeaderTest.create_lazily(a=1, b=-2)
+    assert msg.a == 1
+    assert str(msg) == "MessageWithHeaderTest{'a': 1, 'b': -2}"
+
+    with pytest.raises(TypeError) as excinfo:
+        msg.validate_deferred()
+    assert "validation error [MessageWithHeaderTest]: negative value (b=-2)" == str(excinfo.value)
+
+
+def test_invalid_lazily_created_message_has_no_fields():
+    msg = MessageWithHeaderTest.create_lazily(a=1, b=-2)
+    with pytest.raises(AttributeError) as excinfo:
+        msg.b
+    assert "validation error [MessageWithHeaderTest]: negative value (b=-2)" in str(excinfo.value)
+    assert not hasattr(msg, 'b')
+    assert getattr(msg, 'c', None) is None
+    assert msg.a == 1
+
+    # the message is validated once
+    with pytest.raises(TypeError) as first:
+        msg.validate_deferred()
+    with pytest.raises(TypeError) as second:
+        msg.validate_deferred()
+    assert first.value is second.value
+
+
+def test_create_lazily_with_invalid_header():
+    with pytest.raises(TypeError) as excinfo:
+        MessageWithHeaderTest.create_lazily(a=-1, b=2)
+    assert "validation error [MessageWithHeaderTest]: negative value (a=-1)" == str(excinfo.value)
+
+    with pytest.raises(TypeError) as excinfo:
+        MessageWithHeaderTest.create_lazily(b=2)
+    assert "validation error [MessageWithHeaderTest]: missed fields - a. " == str(excinfo.value)
+
+
+def test_lazily_created_message_is_validated_on_access():
+    msg = MessageWithHeaderTest.create_lazily(b=2, a=1)
+    assert msg == MessageWithHeaderTest(a=1, b=2)
+    assert list(msg.keys()) == ['a', 'b']
+
+    msg._fields['a'] = 3
+    assert msg.a == 3
+
+
+def test_message_without_header_is_not_created_lazily():
+    with pytest.raises(TypeError):
+        MessageTest.create_lazily(a=1, b=-2)
@@ -0,0 +1,160 @@
+import json
+import os
+
+import pytest
+
+from common.serializers.serialization import ledger_txn_serializer
+from ledger.util import F
+from plenum.common.constants import AUDIT_TXN_LEDGER_ROOT, AUDIT_TXN_LEDGERS_SIZE, AUDIT_TXN_STATE_ROOT, \
+    DOMAIN_LEDGER_ID, POOL_LEDGER_ID, CONFIG_LEDGER_ID
+from plenum.common.ledger import Ledger
+from plenum.common.ledger_import import read_txns_dump, ledger_summary_from_audit_txn, create_node_ledger, \
+    create_node_state, create_state_updater, import_txns, LedgerImportError
+from plenum.common.txn_util import init_empty_txn, set_payload_data, append_txn_metadata
+from plenum.server.request_handlers.utils import get_nym_details
+from state.pruning_state import PruningState
+from storage.kv_in_memory import KeyValueStorageInMemory
+
+TXN_COUNT = 25
+
+
+@pytest.fixture()
+def source_ledger(tdir_for_func, tconf):
+    ledger = create_node_ledger(os.path.join(tdir_for_func, 'source'), 'domain', tconf)
+    txns = []
+    for i in range(TXN_COUNT):
+        txn = init_empty_txn(txn_type='1')
+        txns.append(append_txn_metadata(set_payload_data(txn, {'dest': 'dest{}'.format(i)}), txn_time=i))
+    ledger.add_batch(txns)
+    yield ledger
+    ledger.stop()
+
+
+@pytest.fixture()
+def target_ledger(tdir_for_func, tconf):
+    ledger = create_node_ledger(os.path.join(tdir_for_func, 'target'), 'domain', tconf)
+    yield ledger
+    ledger.stop()
+
+
+@pytest.fixture()
+def source_state_root(source_ledger, tconf):
+    # State recreated from the ledger the way a node does it on start
+    state = PruningState(KeyValueStorageInMemory())
+    update_state = create_state_updater(DOMAIN_LEDGER_ID, source_ledger, state, tconf)
+    for _, txn in source_ledger.getAllTxn():
+        update_state(txn)
+        state.commit(rootHash=state.headHash)
+    return Ledger.hashToStr(state.committedHeadHash)
+
+
+@pytest.fixture()
+def target_state(tdir_for_func, tconf):
+    state = create_node_state(os.path.join(tdir_for_func, 'target'), 'domain', tconf)
+    yield state
+    state.close()
+
+
+@pytest.fixture(params=['msgpack', 'json'])
+def dump(request, source_ledger, tdir_for_func):
+    txns = [txn for _, txn in source_ledger.getAllTxn()]
+    if request.param == 'json':
+        path = os.path.join(tdir_for_func, 'dump.jsonl')
+        with open(path, 'w') as f:
+            for txn in txns:
+                f.write(json.dumps(txn) + '\n')
+    else:
+        path = os.path.join(tdir_for_func, 'dump.msgpack')
+        with open(path, 'wb') as f:
+            for txn in txns:
+                f.write(ledger_txn_serializer.serialize(txn))
+    return path
+
+
+def test_import_dump(dump, source_ledger, target_ledger):
+    count = import_txns(target_ledger, read_txns_dump(dump),
+                        expected_size=TXN_COUNT,
+                        expected_root=source_ledger.root_hash,
+                        chunk_size=7)
+    assert count == TXN_COUNT
+    assert target_ledger.size == TXN_COUNT
+    assert target_ledger.root_hash == source_ledger.root_hash
+    assert list(target_ledger.getAllTxn()) == list(source_ledger.getAllTxn())
+
+
+def test_import_replays_state(dump, source_ledger, source_state_root, target_ledger, target_state, tconf):
+    import_txns(target_ledger, read_txns_dump(dump),
+                expected_size=TXN_COUNT,
+                expected_root=source_ledger.root_hash,
+                chunk_size=7,
+                state=target_state,
+                update_state=create_state_updater(DOMAIN_LEDGER_ID, target_ledger, target_state, tconf),
+                expected_state_root=source_state_root)
+    assert Ledger.hashToStr(target_state.committedHeadHash) == source_state_root
+    assert get_nym_details(target_state, 'dest3')[F.seqNo.name] == 4
+
+
+def test_import_with_wrong_state_root_resets_ledger_and_state(dump, source_ledger, target_ledger,
+                                                              target_state, tconf):
+    with pytest.raises(LedgerImportError):
+        import_txns(target_ledger, read_txns_dump(dump),
+                    expected_root=source_ledger.root_hash,
+                    state=target_state,
+                    update_state=create_state_updater(DOMAIN_LEDGER_ID, target_ledger, target_state, tconf),
+                    expected_state_root='wrong')
+    assert target_ledger.size == 0
+    assert target_state.isEmpty
+
+
+def test_import_with_wrong_root_does_not_load_state(dump, target_ledger, target_state, tconf):
+    with pytest.raises(LedgerImportError):
+        import_txns(target_ledger, read_txns_dump(dump),
+                    expected_root='wrong',
+                    state=target_state,
+                    update_state=create_state_updater(DOMAIN_LEDGER_ID, target_ledger, target_state, tconf))
+    assert target_ledger.size == 0
+    assert target_state.isEmpty
+
+
+def test_import_with_wrong_root_resets_ledger(dump, target_ledger):
+    with pytest.raises(LedgerImportError):
+        import_txns(target_ledger, read_txns_dump(dump), expected_root='wrong')
+    assert target_ledger.size == 0
+    assert list(target_ledger.getAllTxn()) == []
+
+
+def test_import_with_wrong_size_resets_ledger(dump, source_ledger, target_ledger):
+    with pytest.raises(LedgerImportError):
+        import_txns(target_ledger, read_txns_dump(dump),
+                    expected_size=TXN_COUNT + 1,
+                    expected_root=source_ledger.root_hash)
+    assert target_ledger.size == 0
+
+
+def test_import_with_gap_in_seq_nos_fails(source_ledger, target_ledger):
+    txns = [txn for seq_no, txn in source_ledger.getAllTxn() if seq_no != 10]
+    with pytest.raises(LedgerImportError):
+        import_txns(target_ledger, txns, chunk_size=5)
+    assert target_ledger.size == 0
+
+
+def test_import_into_not_empty_ledger_fails(source_ledger):
+    with pytest.raises(LedgerImportError):
+        import_txns(source_ledger, [])
+    assert source_ledger.size == TXN_COUNT
+
+
+def test_ledger_summary_from_audit_txn(source_ledger):
+    audit_txn = set_payload_data(init_empty_txn(txn_type='2'), {
+        AUDIT_TXN_LEDGERS_SIZE: {str(POOL_LEDGER_ID): 4, str(DOMAIN_LEDGER_ID): TXN_COUNT},
+        AUDIT_TXN_LEDGER_ROOT: {str(POOL_LEDGER_ID): 3, str(DOMAIN_LEDGER_ID): source_ledger.root_hash},
+        AUDIT_TXN_STATE_ROOT: {str(DOMAIN_LEDGER_ID): 'state_root'}
+    })
+    assert ledger_summary_from_audit_txn(audit_txn, DOMAIN_LEDGER_ID) == \
+        (TXN_COUNT, source_ledger.root_hash, 'state_root')
+
+    # Root hash of pool ledger is a reference to an earlier audit txn
+    with pytest.raises(ValueError):
+        ledger_summary_from_audit_txn(audit_txn, POOL_LEDGER_ID)
+    with pytest.raises(ValueError):
+        ledger_summary_from_audit_txn(audit_txn, CONFIG_LEDGER_ID)
@@ -0,0 +1,89 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.common.ledger import Ledger
+from plenum.common.txn_util import init_empty_txn, set_payload_data
+
+BATCH_SIZE = 3
+
+
+def create_batch(start):
+    txns = []
+    for i in range(start, start + BATCH_SIZE):
+        txn = init_empty_txn(txn_type='1')
+        txns.append(set_payload_data(txn, {'dest': 'dest{}'.format(i)}))
+    return txns
+
+
+@pytest.fixture()
+def standalone_ledger(tdir_for_func):
+    ledger = Ledger(CompactMerkleTree(), dataDir=tdir_for_func)
+    ledger.add_batch(create_batch(0))
+    yield ledger
+    ledger.stop()
+
+
+def append_batches(ledger, count):
+    roots = []
+    for i in range(count):
+        txns = create_batch(ledger.uncommitted_size)
+        ledger.append_txns_metadata(txns)
+        ledger.appendTxns(txns)
+        roots.append(ledger.uncommittedRootHash)
+    return roots
+
+
+def check_uncommitted_root(ledger):
+    assert ledger.uncommittedRootHash == ledger.treeWithAppliedTxns(ledger.uncommittedTxns).root_hash
+
+
+def test_discard_batches_does_not_hash_txns(standalone_ledger, monkeypatch):
+    roots = append_batches(standalone_ledger, 4)
+
+    monkeypatch.setattr(standalone_ledger, 'treeWithAppliedTxns', None)
+    standalone_ledger.discardTxns(BATCH_SIZE)
+    assert standalone_ledger.uncommittedRootHash == roots[2]
+    standalone_ledger.discardTxns(2 * BATCH_SIZE)
+    assert standalone_ledger.uncommittedRootHash == roots[0]
+    standalone_ledger.discardTxns(BATCH_SIZE)
+    assert standalone_ledger.uncommittedRootHash is None
+    assert standalone_ledger.uncommitted_root_hash == standalone_ledger.tree.root_hash
+
+
+def test_discard_part_of_batch(standalone_ledger):
+    append_batches(standalone_ledger, 2)
+
+    standalone_ledger.discardTxns(BATCH_SIZE + 1)
+    assert standalone_ledger.uncommitted_size == standalone_ledger.size + BATCH_SIZE - 1
+    check_uncommitted_root(standalone_ledger)
+
+    roots = append_batches(standalone_ledger, 1)
+    standalone_ledger.discardTxns(BATCH_SIZE)
+    check_uncommitted_root(standalone_ledger)
+    assert standalone_ledger.uncommittedRootHash != roots[0]
+
+
+def test_discard_after_commit(standalone_ledger):
+    roots = append_batches(standalone_ledger, 4)
+
+    standalone_ledger.commitTxns(BATCH_SIZE)
+    standalone_ledger.discardTxns(BATCH_SIZE)
+    assert standalone_ledger.uncommittedRootHash == roots[2]
+    check_uncommitted_root(standalone_ledger)
+
+    standalone_ledger.commitTxns(BATCH_SIZE + 1)
+    assert standalone_ledger.uncommittedRootHash == roots[2]
+    standalone_ledger.discardTxns(1)
+    check_uncommitted_root(standalone_ledger)
+    standalone_ledger.discardTxns(1)
+    assert standalone_ledger.uncommittedRootHash is None
+
+
+def test_discard_after_reset_uncommitted(standalone_ledger):
+    append_batches(standalone_ledger, 2)
+    standalone_ledger.reset_uncommitted()
+
+    roots = append_batches(standalone_ledger, 2)
+    standalone_ledger.discardTxns(BATCH_SIZE)
+    assert standalone_ledger.uncommittedRootHash == roots[0]
+    check_uncommitted_root(standalone_ledger)
@@ -41,6 +41,8 @@ def test_kv_store_metrics_config(looper, txnPoolNodeSet, tdir, tconf, sdk_pool_h
         unexpected_events = {
             MetricsName.CATCHUP_TXNS_SENT,
             MetricsName.CATCHUP_TXNS_RECEIVED,
+            MetricsName.CATCHUP_PROOF_CACHE_HITS,
+            MetricsName.CATCHUP_PROOF_CACHE_MISSES,
 
             MetricsName.GC_GEN2_TIME,
             MetricsName.GC_UNCOLLECTABLE_OBJECTS,
@@ -0,0 +1,230 @@
+import logging
+from copy import deepcopy
+from typing import List, Any, Optional, Callable
+
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from ledger.merkle_verifier import MerkleVerifier
+from plenum.common.channel import create_direct_channel
+from plenum.common.constants import DOMAIN_LEDGER_ID
+from plenum.common.ledger import Ledger
+from plenum.common.messages.node_messages import CatchupRep
+from plenum.common.metrics_collector import NullMetricsCollector
+from plenum.common.txn_util import init_empty_txn, set_payload_data, get_seq_no
+from plenum.common.util import SortedDict
+from plenum.server.catchup.catchup_rep_service import CatchupRepService
+from plenum.server.catchup.utils import CatchupDataProvider, CatchupTill
+
+LEDGER_SIZE = 12
+REPLY_SIZE = 4
+
+
+class FakeCatchupProvider(CatchupDataProvider):
+    def __init__(self, ledger):
+        self._ledger = ledger
+        self.transformed = 0
+        self.added = []
+        self.blacklisted = []
+
+    def all_nodes_names(self):
+        pass
+
+    def node_name(self) -> str:
+        return 'Alpha'
+
+    def ledgers(self) -> List[int]:
+        return [DOMAIN_LEDGER_ID]
+
+    def ledger(self, ledger_id: int) -> Ledger:
+        return self._ledger
+
+    def verifier(self, ledger_id: int) -> MerkleVerifier:
+        return MerkleVerifier()
+
+    def eligible_nodes(self) -> List[str]:
+        pass
+
+    def update_txn_with_extra_data(self, txn: dict) -> dict:
+        pass
+
+    def transform_txn_for_ledger(self, txn: dict) -> dict:
+        self.transformed += 1
+        return txn
+
+    def notify_catchup_start(self, ledger_id: int):
+        pass
+
+    def notify_catchup_complete(self, ledger_id: int):
+        pass
+
+    def notify_transaction_added_to_ledger(self, ledger_id: int, txn: dict):
+        self.added.append([get_seq_no(txn)])
+
+    def notify_transactions_added_to_ledger(self, ledger_id: int, txns: List[dict]):
+        self.added.append([get_seq_no(txn) for txn in txns])
+
+    def send_to(self, msg: Any, to: str, message_splitter: Optional[Callable] = None):
+        pass
+
+    def send_to_nodes(self, msg: Any, nodes=None):
+        pass
+
+    def blacklist_node(self, node_name: str, reason: str):
+        self.blacklisted.append(node_name)
+
+    def discard(self, msg, reason, logMethod=logging.error, cliOutput=False):
+        pass
+
+
+class FakeOutput:
+    def put_nowait(self, msg):
+        pass
+
+
+def create_ledger(data_dir):
+    return Ledger(CompactMerkleTree(hashStore=FileHashStore(data_dir)), dataDir=data_dir)
+
+
+@pytest.fixture()
+def seeder_ledger(tdir_for_func):
+    ledger = create_ledger(tdir_for_func)
+    txns = []
+    for i in range(LEDGER_SIZE):
+        txn = init_empty_txn(txn_type='1')
+        txns.append(set_payload_data(txn, {'dest': 'dest{}'.format(i)}))
+    ledger.add_batch(txns)
+    yield ledger
+    ledger.stop()
+
+
+@pytest.fixture()
+def leecher_ledger(tdir_for_func):
+    ledger = create_ledger(tdir_for_func + '_leecher')
+    yield ledger
+    ledger.stop()
+
+
+@pytest.fixture()
+def provider(leecher_ledger):
+    return FakeCatchupProvider(leecher_ledger)
+
+
+@pytest.fixture()
+def service(provider, seeder_ledger):
+    _, input_rx = create_direct_channel()
+    service = CatchupRepService(ledger_id=DOMAIN_LEDGER_ID,
+                                config=None,
+                                input=input_rx,
+                                output=FakeOutput(),
+                                timer=None,
+                                metrics=NullMetricsCollector(),
+                                provider=provider)
+    service._is_working = True
+    service._catchup_till = CatchupTill(start_size=0,
+                                        final_size=LEDGER_SIZE,
+                                        final_hash=Ledger.hashToStr(seeder_ledger.tree.root_hash))
+    return service
+
+
+def build_catchup_rep(ledger, start, end):
+    txns = {str(seq_no): txn for seq_no, txn in ledger.getAllTxn(start, end)}
+    cons_proof = [Ledger.hashToStr(h) for h in ledger.tree.consistency_proof(end, LEDGER_SIZE)]
+    return CatchupRep(DOMAIN_LEDGER_ID, SortedDict(txns), cons_proof)
+
+
+def build_catchup_reps(ledger):
+    return [build_catchup_rep(ledger, start, start + REPLY_SIZE - 1)
+            for start in range(1, LEDGER_SIZE + 1, REPLY_SIZE)]
+
+
+def test_replies_are_applied_to_ledger_in_bulk(service, provider, seeder_ledger, leecher_ledger):
+    reps = build_catchup_reps(seeder_ledger)
+
+    # Replies are applied only when all preceding ones are received
+    service.process_catchup_rep(reps[2], 'Beta')
+    service.process_catchup_rep(reps[1], 'Gamma')
+    assert leecher_ledger.size == 0
+    assert provider.added == []
+
+    service.process_catchup_rep(reps[0], 'Delta')
+    assert leecher_ledger.size == LEDGER_SIZE
+    assert leecher_ledger.root_hash == seeder_ledger.root_hash
+    assert not service.is_working()
+
+    # Each reply is added to ledger and reported as a whole and every txn
+    # is transformed for ledger only once
+    assert provider.added == [list(range(start, start + REPLY_SIZE))
+                              for start in range(1, LEDGER_SIZE + 1, REPLY_SIZE)]
+    assert provider.transformed == LEDGER_SIZE
+    assert provider.blacklisted == []
+
+
+def test_reply_with_wrong_proof_is_not_applied(service, provider, seeder_ledger, leecher_ledger):
+    reps = build_catchup_reps(seeder_ledger)
+    bad_rep = CatchupRep(DOMAIN_LEDGER_ID, reps[0].txns, reps[1].consProof)
+
+    service.process_catchup_rep(reps[1], 'Beta')
+    service.process_catchup_rep(bad_rep, 'Gamma')
+    assert leecher_ledger.size == 0
+    assert provider.added == []
+    assert provider.blacklisted == ['Gamma']
+
+
+def test_overlapping_replies_are_applied_once(service, provider, seeder_ledger, leecher_ledger):
+    reps = build_catchup_reps(seeder_ledger)
+
+    service.process_catchup_rep(build_catchup_rep(seeder_ledger, 3, 8), 'Beta')
+    service.process_catchup_rep(reps[1], 'Gamma')
+    service.process_catchup_rep(reps[2], 'Delta')
+    assert len(service._received_catchup_replies) == 3
+    assert len(service._received_catchup_txns) == LEDGER_SIZE - 2
+
+    service.process_catchup_rep(reps[0], 'Epsilon')
+    assert leecher_ledger.size == LEDGER_SIZE
+    assert leecher_ledger.root_hash == seeder_ledger.root_hash
+    assert provider.added == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12]]
+    assert provider.transformed == LEDGER_SIZE
+    assert provider.blacklisted == []
+
+
+def build_tampered_catchup_rep(rep, seq_no):
+    txns = deepcopy(rep.txns)
+    set_payload_data(txns[str(seq_no)], {'dest': 'tampered'})
+    return CatchupRep(DOMAIN_LEDGER_ID, txns, rep.consProof)
+
+
+@pytest.mark.parametrize('bad_sender, good_sender', [('Beta', 'Gamma'), ('Gamma', 'Beta')])
+def test_overlapping_reply_is_checked_with_own_txns(service, provider, seeder_ledger, leecher_ledger,
+                                                    bad_sender, good_sender):
+    reps = build_catchup_reps(seeder_ledger)
+    bad_rep = build_tampered_catchup_rep(reps[1], 6)
+
+    # Both replies for the same txns are received before they can be applied
+    service.process_catchup_rep(bad_rep, bad_sender)
+    service.process_catchup_rep(reps[1], good_sender)
+    service.process_catchup_rep(reps[2], 'Delta')
+    service.process_catchup_rep(reps[0], 'Epsilon')
+
+    assert leecher_ledger.size == LEDGER_SIZE
+    assert leecher_ledger.root_hash == seeder_ledger.root_hash
+    # A sender is blacklisted only when its own txns don't match its proof,
+    # a reply which is not needed anymore is not checked
+    assert provider.blacklisted == ([bad_sender] if bad_sender > good_sender else [])
+
+
+def test_find_catchup_reply_for_seq_no(service):
+    replies = service._received_catchup_replies
+    for key in [(1, 4, 'Beta'), (3, 8, 'Gamma'), (5, 12, 'Delta'), (9, 10, 'Epsilon')]:
+        replies[key] = key
+
+    assert service._find_catchup_reply_for_seq_no(4) == ((3, 8, 'Gamma'), (3, 8, 'Gamma'))
+    # Replies which end before the seq_no are dropped when they are looked at
+    assert service._find_catchup_reply_for_seq_no(11) == ((5, 12, 'Delta'), (5, 12, 'Delta'))
+    assert (9, 10, 'Epsilon') not in replies
+
+    # No reply contains the seq_no
+    assert service._find_catchup_reply_for_seq_no(13) == (None, None)
+    assert not replies
+    assert service._find_catchup_reply_for_seq_no(1) == (None, None)
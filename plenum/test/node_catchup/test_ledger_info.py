@@ -15,6 +15,7 @@ from plenum.common.ledger_info import LedgerInfo
 from plenum.common.ledger_manager import LedgerManager
 from plenum.common.messages.node_messages import ConsistencyProof
 from plenum.common.metrics_collector import NullMetricsCollector
+from plenum.common.util import SortedDict
 from plenum.server.catchup.catchup_rep_service import CatchupRepService
 from plenum.server.catchup.utils import CatchupDataProvider, CatchupTill
 
@@ -112,24 +113,24 @@ def test_missing_txn_request(ledger_no_genesis):
     ct = CatchupTill(start_size=1, final_size=10,
                      final_hash='Gv9AdSeib9EnBakfpgkU79dPMtjcnFWXvXeiCX4QAgAC')
     service._catchup_till = ct
-    service._received_catchup_txns = [(i, {}) for i in range(1, 15)]
+    service._received_catchup_txns = SortedDict((i, {}) for i in range(1, 15))
     assert service._num_missing_txns() == 0
 
     # Ledger is behind but catchup replies present
     ct = CatchupTill(start_size=1, final_size=30,
                      final_hash='EEUnqHf2GWEpvmibiXDCZbNDSpuRgqdvCpJjgp3KFbNC')
     service._catchup_till = ct
-    service._received_catchup_txns = [(i, {}) for i in range(21, 31)]
+    service._received_catchup_txns = SortedDict((i, {}) for i in range(21, 31))
     assert service._num_missing_txns() == 0
-    service._received_catchup_txns = [(i, {}) for i in range(21, 35)]
+    service._received_catchup_txns = SortedDict((i, {}) for i in range(21, 35))
     assert service._num_missing_txns() == 0
 
     # Ledger is behind
     ct = CatchupTill(start_size=1, final_size=30,
                      final_hash='EEUnqHf2GWEpvmibiXDCZbNDSpuRgqdvCpJjgp3KFbNC')
     service._catchup_till = ct
-    service._received_catchup_txns = [(i, {}) for i in range(21, 26)]
+    service._received_catchup_txns = SortedDict((i, {}) for i in range(21, 26))
     assert service._num_missing_txns() == 5
 
-    service._received_catchup_txns = [(i, {}) for i in range(26, 31)]
+    service._received_catchup_txns = SortedDict((i, {}) for i in range(26, 31))
     assert service._num_missing_txns() == 5
@@ -0,0 +1,46 @@
+from copy import deepcopy
+
+from plenum.common.constants import DOMAIN_LEDGER_ID, TXN_TYPE, NYM, TARGET_NYM, ROLE, VERKEY, STEWARD
+from plenum.common.request import Request
+from plenum.common.txn_util import reqToTxn
+from plenum.common.util import randomString
+from plenum.server.request_handlers.utils import get_nym_details
+
+
+def nym_txn(identifier, req_id, dest, **data):
+    operation = {TXN_TYPE: NYM, TARGET_NYM: dest}
+    operation.update(data)
+    return reqToTxn(Request(identifier=identifier, reqId=req_id,
+                            operation=operation, protocolVersion=2))
+
+
+def add_txns_to_ledger(node, txns):
+    node.domainLedger.append_txns_metadata(txns, txn_time=13439852)
+    node.domainLedger.appendTxns(txns)
+    node.domainLedger.commitTxns(len(txns))
+
+
+def test_txns_for_same_nym_in_one_catchup_reply(looper, txnPoolNodeSet):
+    # A new NYM and its key rotation by the owner get into one catchup
+    # reply, the rotation must be applied on top of the created NYM
+    dest = randomString(16)
+    reply_txns = [nym_txn('trustee', 1, dest, **{ROLE: STEWARD, VERKEY: '~' + randomString(22)}),
+                  nym_txn(dest, 2, dest, **{VERKEY: 'rotated'})]
+
+    batched_node, node = txnPoolNodeSet[:2]
+    txns = deepcopy(reply_txns)
+    add_txns_to_ledger(batched_node, txns)
+    batched_node.postTxnsFromCatchupAddedToLedger(DOMAIN_LEDGER_ID, txns)
+
+    # The same txns applied one by one
+    txns = deepcopy(reply_txns)
+    add_txns_to_ledger(node, txns)
+    for txn in txns:
+        node.postTxnFromCatchupAddedToLedger(DOMAIN_LEDGER_ID, txn)
+
+    state = batched_node.getState(DOMAIN_LEDGER_ID)
+    nym = get_nym_details(state, dest, is_committed=True)
+    assert nym[ROLE] == STEWARD
+    assert nym[VERKEY] == 'rotated'
+    assert nym['identifier'] == 'trustee'
+    assert state.committedHeadHash == node.getState(DOMAIN_LEDGER_ID).committedHeadHash
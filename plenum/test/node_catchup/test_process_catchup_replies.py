@@ -24,15 +24,14 @@ def _add_txns_to_ledger(node, looper, sdk_wallet_client, num_txns_in_reply, repl
     catchup_rep_service = ledger_manager._node_leecher._leechers[ledger_id]._catchup_rep_service
     reqs = sdk_signed_random_requests(looper, sdk_wallet_client, txn_count)
     # add transactions to ledger
-    for req in reqs:
-        txn = append_txn_metadata(reqToTxn(req), txn_time=12345678)
-        catchup_rep_service._add_txn(txn)
+    txns = [append_txn_metadata(reqToTxn(req), txn_time=12345678) for req in reqs]
+    catchup_rep_service._add_txns(txns, [node.transform_txn_for_ledger(txn) for txn in txns])
     # generate CatchupReps
     replies = []
     for i in range(ledger.seqNo - txn_count + 1, ledger.seqNo + 1, num_txns_in_reply):
         start = i
         end = i + num_txns_in_reply - 1
-        cons_proof = ledger_manager._node_seeder._make_consistency_proof(ledger, end, ledger.size)
+        cons_proof = ledger_manager._node_seeder._make_consistency_proof(ledger_id, ledger, end, ledger.size)
         txns = {}
         for seq_no, txn in ledger.getAllTxn(start, end):
             txns[str(seq_no)] = ledger_manager.owner.update_txn_with_extra_data(txn)
@@ -45,12 +44,17 @@ def _add_txns_to_ledger(node, looper, sdk_wallet_client, num_txns_in_reply, repl
                        final_hash=Ledger.hashToStr(ledger.tree.merkle_tree_hash(0, ledger.seqNo))), replies
 
 
+def received_replies_from(catchup_rep_service, frm):
+    return [rep for (_, _, sender), rep in catchup_rep_service._received_catchup_replies.items()
+            if sender == frm]
+
+
 def check_reply_not_applied(old_ledger_size, ledger, catchup_rep_service, frm, reply):
     assert ledger.size == old_ledger_size
     assert ledger.seqNo == old_ledger_size
-    received_replies = {str(seq_no) for seq_no, _ in catchup_rep_service._received_catchup_txns}
+    received_replies = {str(seq_no) for seq_no in catchup_rep_service._received_catchup_txns}
     assert set(reply.txns.keys()).issubset(received_replies)
-    assert reply in catchup_rep_service._received_catchup_replies_from[frm]
+    assert reply in received_replies_from(catchup_rep_service, frm)
 
 
 def check_replies_applied(old_ledger_size, ledger, catchup_rep_service, frm, replies):
@@ -58,11 +62,10 @@ def check_replies_applied(old_ledger_size, ledger, catchup_rep_service, frm, rep
                          for reply in replies])
     assert ledger.size == old_ledger_size + new_txn_count
     assert ledger.seqNo == old_ledger_size + new_txn_count
-    received_replies = {str(seq_no) for seq_no, _ in catchup_rep_service._received_catchup_txns}
+    received_replies = {str(seq_no) for seq_no in catchup_rep_service._received_catchup_txns}
     assert all(not set(getattr(reply, f.TXNS.nm).keys()).issubset(received_replies)
                for reply in replies)
-    assert frm not in catchup_rep_service._received_catchup_replies_from or \
-           all(reply not in catchup_rep_service._received_catchup_replies_from[frm]
+    assert all(reply not in received_replies_from(catchup_rep_service, frm)
                for reply in replies)
     return ledger.size
 
@@ -122,7 +125,7 @@ def test_process_catchup_replies(txnPoolNodeSet, looper, sdk_wallet_client):
     ledger_manager.processCatchupRep(reply5, sdk_wallet_client[1])
     ledger_size = check_replies_applied(ledger_size, ledger, catchup_rep_service, sdk_wallet_client[1], [reply5,
                                                                                                          reply6])
-    assert not catchup_rep_service._received_catchup_replies_from
+    assert not catchup_rep_service._received_catchup_replies
     assert not catchup_rep_service._received_catchup_txns
 
 
@@ -170,9 +173,9 @@ def test_process_invalid_catchup_reply(txnPoolNodeSet, looper, sdk_wallet_client
                                         sdk_wallet_client[1],
                                         [reply1])
     # check that invalid reply was removed from ledger_info.receivedCatchUpReplies
-    received_replies = {str(seq_no) for seq_no, _ in catchup_rep_service._received_catchup_txns}
+    received_replies = {str(seq_no) for seq_no in catchup_rep_service._received_catchup_txns}
     assert not set(reply2.txns.keys()).issubset(received_replies)
-    assert not catchup_rep_service._received_catchup_replies_from[sdk_wallet_client[1]]
+    assert not received_replies_from(catchup_rep_service, sdk_wallet_client[1])
 
     # check that valid reply for 2nd interval was added to ledger
     reply2 = catchup_reps[1]
@@ -182,5 +185,5 @@ def test_process_invalid_catchup_reply(txnPoolNodeSet, looper, sdk_wallet_client
                                         catchup_rep_service,
                                         sdk_wallet_client[1],
                                         [reply2])
-    assert not catchup_rep_service._received_catchup_replies_from
+    assert not catchup_rep_service._received_catchup_replies
     assert not catchup_rep_service._received_catchup_txns
@@ -0,0 +1,123 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from plenum.common.constants import DOMAIN_LEDGER_ID, POOL_LEDGER_ID
+from plenum.common.ledger import Ledger
+from plenum.common.metrics_collector import MetricsName
+from plenum.common.txn_util import init_empty_txn, set_payload_data
+from plenum.server.catchup.proof_cache import ProofCache
+from plenum.test.metrics.helper import MockMetricsCollector
+
+LEDGER_SIZE = 20
+
+
+def add_txns(ledger, count, dest='dest'):
+    txns = []
+    for i in range(count):
+        txn = init_empty_txn(txn_type='1')
+        txns.append(set_payload_data(txn, {'dest': '{}{}'.format(dest, ledger.size + i)}))
+    ledger.add_batch(txns)
+
+
+@pytest.fixture()
+def ledger(tdir_for_func):
+    ledger = Ledger(CompactMerkleTree(hashStore=FileHashStore(tdir_for_func)), dataDir=tdir_for_func)
+    add_txns(ledger, LEDGER_SIZE)
+    yield ledger
+    ledger.stop()
+
+
+@pytest.fixture()
+def metrics():
+    return MockMetricsCollector()
+
+
+def cache_stats(metrics):
+    metrics.flush_accumulated()
+    hits = sum(ev.count for ev in metrics.events if ev.name == MetricsName.CATCHUP_PROOF_CACHE_HITS)
+    misses = sum(ev.count for ev in metrics.events if ev.name == MetricsName.CATCHUP_PROOF_CACHE_MISSES)
+    return hits, misses
+
+
+def create_cache(ledger, metrics, size=100):
+    cache = ProofCache(size=size, metrics=metrics)
+    cache.register_ledger(DOMAIN_LEDGER_ID, ledger)
+    return cache
+
+
+def expected_proof(ledger, first, second):
+    return [Ledger.hashToStr(h) for h in ledger.tree.consistency_proof(first, second)]
+
+
+def test_proofs_and_roots_are_taken_from_cache(ledger, metrics):
+    cache = create_cache(ledger, metrics)
+
+    proof = cache.consistency_proof(DOMAIN_LEDGER_ID, ledger, 5, LEDGER_SIZE)
+    assert proof == expected_proof(ledger, 5, LEDGER_SIZE)
+    assert cache_stats(metrics) == (0, len(proof))
+    assert cache.consistency_proof(DOMAIN_LEDGER_ID, ledger, 5, LEDGER_SIZE) == proof
+    assert cache_stats(metrics) == (len(proof), len(proof))
+
+    root = cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, LEDGER_SIZE)
+    assert root == Ledger.hashToStr(ledger.tree.root_hash)
+    assert cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, LEDGER_SIZE) == root
+    assert cache_stats(metrics) == (len(proof) + 1, len(proof) + 1)
+
+    # Entries of different ledgers don't mix and ranges of ledgers which
+    # are not registered are not cached
+    cache.merkle_tree_hash(POOL_LEDGER_ID, ledger, 0, LEDGER_SIZE)
+    cache.merkle_tree_hash(POOL_LEDGER_ID, ledger, 0, LEDGER_SIZE)
+    assert cache_stats(metrics) == (len(proof) + 1, len(proof) + 3)
+
+
+def test_overlapping_proofs_share_entries(ledger, metrics):
+    cache = create_cache(ledger, metrics)
+
+    cache.consistency_proof(DOMAIN_LEDGER_ID, ledger, 4, LEDGER_SIZE)
+    _, misses = cache_stats(metrics)
+    proof = cache.consistency_proof(DOMAIN_LEDGER_ID, ledger, 3, LEDGER_SIZE)
+    assert proof == expected_proof(ledger, 3, LEDGER_SIZE)
+    hits, _ = cache_stats(metrics)
+    assert hits > 0
+
+
+def test_least_recently_used_entries_are_evicted(ledger, metrics):
+    cache = create_cache(ledger, metrics, size=2)
+
+    for end in (10, 11, 10, 12):
+        cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, end)
+    assert len(cache) == 2
+    assert cache_stats(metrics) == (1, 3)
+
+    cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, 10)
+    cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, 11)
+    assert cache_stats(metrics) == (2, 4)
+
+
+def test_nothing_is_cached_with_zero_size(ledger, metrics):
+    cache = create_cache(ledger, metrics, size=0)
+
+    cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, 10)
+    cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, 10)
+    assert len(cache) == 0
+    assert cache_stats(metrics) == (0, 2)
+
+
+def test_cache_is_cleared_on_ledger_reset(ledger, metrics):
+    cache = create_cache(ledger, metrics)
+    old_root = cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, 5)
+    old_proof = cache.consistency_proof(DOMAIN_LEDGER_ID, ledger, 5, 10)
+    assert len(cache) > 0
+
+    ledger.reset()
+    assert len(cache) == 0
+
+    # The ledger grows back past cached ranges with other txns
+    add_txns(ledger, LEDGER_SIZE, dest='other')
+    new_root = cache.merkle_tree_hash(DOMAIN_LEDGER_ID, ledger, 0, 5)
+    assert new_root != old_root
+    assert new_root == Ledger.hashToStr(ledger.tree.merkle_tree_hash(0, 5))
+    proof = cache.consistency_proof(DOMAIN_LEDGER_ID, ledger, 5, 10)
+    assert proof != old_proof
+    assert proof == expected_proof(ledger, 5, 10)
@@ -0,0 +1,115 @@
+from copy import copy
+
+import pytest
+
+from plenum.common.constants import OP_FIELD_NAME, BATCH
+from plenum.common.messages.node_message_codec import pack_message
+from plenum.common.messages.node_messages import Commit, Prepare
+from plenum.common.stacks import nodeStackClass
+from plenum.common.types import f
+from plenum.common.util import get_utc_epoch
+from plenum.test.helper import assertExp
+from stp_core.loop.eventually import eventually
+from stp_core.network.auth_mode import AuthMode
+from stp_core.network.port_dispenser import genHa
+from stp_core.test.helper import Printer, SMotor, connectStacks
+from stp_zmq.test.helper import genKeys
+
+
+class NodeStackMotor(SMotor):
+    async def prod(self, limit) -> int:
+        c = await super().prod(limit)
+        self.stack.flushOutBoxes()
+        return c
+
+
+@pytest.fixture()
+def registry():
+    return {
+        'Alpha': genHa(),
+        'Beta': genHa(),
+        'Gamma': genHa(),
+    }
+
+
+@pytest.fixture()
+def stacks(tdir, tconf, registry, looper, monkeypatch):
+    genKeys(tdir, registry.keys())
+    stacks = {}
+    printers = {}
+    for name, ha in registry.items():
+        # Gamma is an old node which doesn't know the binary form
+        monkeypatch.setattr(tconf, 'ENABLE_BINARY_NODE_MESSAGES', name != 'Gamma')
+        reg = copy(registry)
+        reg.pop(name)
+        stackParams = dict(name=name, ha=ha, basedirpath=tdir,
+                           auth_mode=AuthMode.RESTRICTED.value)
+        printers[name] = Printer(name)
+        stacks[name] = nodeStackClass(stackParams, printers[name].print, reg, config=tconf)
+        looper.add(NodeStackMotor(stacks[name]))
+    connectStacks(list(stacks.values()))
+    return stacks, printers
+
+
+def test_binary_messages_are_sent_only_to_nodes_announcing_them(stacks, looper):
+    stacks, printers = stacks
+    alpha, beta, gamma = stacks['Alpha'], stacks['Beta'], stacks['Gamma']
+
+    def check_negotiated():
+        assert alpha.wire_protocol_peers == {'Beta'}
+        assert beta.wire_protocol_peers == {'Alpha'}
+        assert gamma.wire_protocol_peers == set()
+
+    looper.run(eventually(check_negotiated, retryWait=.2, timeout=10))
+
+    transmitted = {}
+    orig_transmit = alpha.transmit
+
+    def transmit(msg, uid, timeout=None, serialized=False):
+        transmitted.setdefault(uid, []).append(msg)
+        return orig_transmit(msg, uid, timeout=timeout, serialized=serialized)
+
+    alpha.transmit = transmit
+    printers['Beta'].reset()
+    printers['Gamma'].reset()
+
+    msgs = [Prepare(0, 1, 2, get_utc_epoch(), 'd' * 64, None, None), Commit(0, 1, 2)]
+    for msg in msgs:
+        alpha.send(msg)
+
+    def received(name):
+        rv = []
+        for msg, frm in printers[name].printeds:
+            assert frm == 'Alpha'
+            if msg.get(OP_FIELD_NAME) == BATCH:
+                rv.extend(alpha.deserializeMsg(m) for m in msg[f.MSGS.nm])
+            else:
+                rv.append(msg)
+        return rv
+
+    expected = [alpha.deserializeMsg(alpha.sign_and_serialize(msg)) for msg in msgs]
+
+    def check_received():
+        assert received('Beta') == expected
+        assert received('Gamma') == expected
+
+    looper.run(eventually(check_received, retryWait=.2, timeout=10))
+    assert all(frame[0] >= 0x80 for frame in transmitted['Beta'])
+    assert all(frame[0] < 0x80 for frame in transmitted['Gamma'])
+
+
+def test_binary_messages_are_accepted_only_from_nodes_announcing_them(stacks, looper):
+    stacks, printers = stacks
+    alpha, gamma = stacks['Alpha'], stacks['Gamma']
+
+    looper.run(eventually(lambda: assertExp('Beta' in alpha.wire_protocol_peers), retryWait=.2, timeout=10))
+    printers['Alpha'].reset()
+
+    commit = Commit(0, 1, 2)
+    gamma.transmit(pack_message(commit), 'Alpha', serialized=True)
+    gamma.send(commit)
+
+    def check_received():
+        assert [msg for msg, _ in printers['Alpha'].printeds] == [alpha.deserializeMsg(alpha.sign_and_serialize(commit))]
+
+    looper.run(eventually(check_received, retryWait=.2, timeout=10))
@@ -117,7 +117,7 @@ def test_use_send_from_zstack_on_resend(func_create_stacks, looper):
     looper.run(eventually(rxMsgsNotEmpty))
     while bStack.rxMsgs:
         m, frm = bStack.rxMsgs.popleft()
-        if m.encode() not in bStack.healthMessages:
+        if m not in bStack.healthMessages:
             msg = bStack.deserializeMsg(m)
         else:
             got_pi = True
@@ -60,3 +60,41 @@ def testRecoverLedgerFromHashStore(hashStore, tconf, tdir):
     assert restartedLedger.tree.hashes == updatedTree.hashes
     assert restartedLedger.tree.root_hash == updatedTree.root_hash
     restartedLedger.stop()
+
+
+def testAppendBatch(hashStore):
+    hashStore.reset()
+    leaves = [str(d).encode() for d in range(10)]
+    tree = CompactMerkleTree(hashStore=MemoryHashStore())
+    appended = [(tree.append(leaf), tree.root_hash) for leaf in leaves]
+
+    batchTree = CompactMerkleTree(hashStore=hashStore)
+    assert batchTree.append_batch(leaves[:3]) + batchTree.append_batch(leaves[3:]) == appended
+    assert batchTree.root_hash == tree.root_hash
+    assert hashStore.leafCount == tree.hashStore.leafCount
+    assert hashStore.nodeCount == tree.hashStore.nodeCount
+    assert hashStore.readLeafs(1, 10) == tree.hashStore.readLeafs(1, 10)
+    # MemoryHashStore keeps nodes as (start, height, hash) tuples
+    assert [n[2] if isinstance(n, tuple) else n for n in hashStore.readNodes(1, hashStore.nodeCount)] == \
+        [n[2] for n in tree.hashStore.readNodes(1, tree.hashStore.nodeCount)]
+
+
+def testAppendLeaves(hashStore):
+    hashStore.reset()
+    leaves = [str(d).encode() for d in range(21)]
+    tree = CompactMerkleTree(hashStore=MemoryHashStore())
+    tree.append_batch(leaves)
+
+    leavesTree = CompactMerkleTree(hashStore=hashStore)
+    leavesTree.append_leaves(leaves[:5])
+    leavesTree.append_leaves([])
+    leavesTree.append_leaves(leaves[5:])
+    assert leavesTree.tree_size == tree.tree_size
+    assert leavesTree.hashes == tree.hashes
+    assert leavesTree.root_hash == tree.root_hash
+    assert hashStore.leafCount == tree.hashStore.leafCount
+    assert hashStore.nodeCount == tree.hashStore.nodeCount
+    assert hashStore.readLeafs(1, 21) == tree.hashStore.readLeafs(1, 21)
+    # MemoryHashStore keeps nodes as (start, height, hash) tuples
+    assert [n[2] if isinstance(n, tuple) else n for n in hashStore.readNodes(1, hashStore.nodeCount)] == \
+        [n[2] for n in tree.hashStore.readNodes(1, tree.hashStore.nodeCount)]
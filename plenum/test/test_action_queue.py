@@ -84,3 +84,25 @@ def test_action_cancellation_by_action():
 
         assert 'meth2' in q1.results
         assert 'meth3' not in q1.results
+
+
+def test_next_action_time_after_scheduled_actions_fired():
+    q1 = Q1('q1')
+    q1.meth1 = partial(q1.meth, 'meth1')
+    assert q1._next_action_time() == float('inf')
+
+    q1._schedule(partial(q1.meth1, 1), 0.1)
+    q1._schedule(partial(q1.meth1, 2), 0.2)
+    assert q1._next_action_time() <= time.perf_counter() + 0.1
+
+    time.sleep(0.15)
+    q1._serviceActions()
+    assert [x for x, _ in q1.results['meth1']] == [1]
+    assert time.perf_counter() < q1._next_action_time() <= time.perf_counter() + 0.1
+
+    time.sleep(0.1)
+    q1._serviceActions()
+    assert [x for x, _ in q1.results['meth1']] == [1, 2]
+    # Nothing is left to wait for
+    assert q1._next_action_time() == float('inf')
+    assert q1.aqNextCheck == float('inf')
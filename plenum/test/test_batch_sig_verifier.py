@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from plenum.common.constants import NYM, GET_TXN, TXN_TYPE, TARGET_NYM
+from plenum.common.exceptions import InsufficientCorrectSignatures, InvalidSignatureFormat
+from plenum.common.request import Request
+from plenum.common.signer_simple import SimpleSigner
+from plenum.server.batch_sig_verifier import BatchSigVerifier
+from plenum.server.client_authn import CoreAuthNr
+from plenum.server.req_authenticator import ReqAuthenticator
+
+
+@pytest.fixture()
+def signers():
+    return [SimpleSigner() for _ in range(3)]
+
+
+@pytest.fixture()
+def req_authnr(signers):
+    core_authnr = CoreAuthNr([NYM], [GET_TXN], [])
+    for signer in signers:
+        core_authnr.addIdr(signer.identifier, signer.verkey)
+    authnr = ReqAuthenticator()
+    authnr.register_authenticator(core_authnr)
+    return authnr
+
+
+@pytest.fixture()
+def verifier(req_authnr):
+    verified = []
+    failed = []
+    stage = BatchSigVerifier(get_authnr=lambda req: req_authnr,
+                             on_verified=lambda msg, frm: verified.append((msg, frm)),
+                             on_failed=lambda ex, wrapped: failed.append((ex, wrapped)),
+                             workers=2)
+    yield stage, verified, failed
+    stage.stop()
+
+
+def signed_req(signer, req_id, typ=NYM):
+    req = Request(identifier=signer.identifier,
+                  reqId=req_id,
+                  operation={TXN_TYPE: typ, TARGET_NYM: 'nym{}'.format(req_id)},
+                  protocolVersion=2)
+    req.signature = signer.sign(req.as_dict)
+    return req
+
+
+def deliver_all(stage, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while stage.pending_count > 0 and time.perf_counter() < deadline:
+        stage.service()
+        time.sleep(0.01)
+    assert stage.pending_count == 0
+
+
+def test_verified_requests_are_delivered_in_order(verifier, signers, req_authnr):
+    stage, verified, failed = verifier
+    reqs = [signed_req(signers[i % len(signers)], i) for i in range(20)]
+    for req in reqs:
+        stage.add(req, 'client')
+    stage.flush()
+    deliver_all(stage)
+
+    assert not failed
+    assert [msg for msg, _ in verified] == reqs
+    for req in reqs:
+        assert req_authnr.is_verified(req.as_dict, req.key)
+
+
+def test_failed_requests_get_same_errors_as_sequential_path(verifier, signers):
+    stage, verified, failed = verifier
+    good = signed_req(signers[0], 1)
+    bad_sig = signed_req(signers[1], 2)
+    bad_sig.signature = signed_req(signers[1], 3).signature
+    bad_format = signed_req(signers[2], 4)
+    bad_format.signature = '0' + bad_format.signature[1:]
+
+    for req in (good, bad_sig, bad_format):
+        stage.add(req, 'client')
+    stage.flush()
+    deliver_all(stage)
+
+    assert [msg for msg, _ in verified] == [good]
+    assert [wrapped for _, wrapped in failed] == [(bad_sig, 'client'), (bad_format, 'client')]
+    assert isinstance(failed[0][0], InsufficientCorrectSignatures)
+    assert isinstance(failed[1][0], InvalidSignatureFormat)
+
+
+def test_already_verified_and_query_requests_need_no_workers(verifier, signers, req_authnr):
+    stage, verified, failed = verifier
+    req = signed_req(signers[0], 1)
+    req_authnr.authenticate(req.as_dict, key=req.key)
+    query = signed_req(signers[0], 2, typ=GET_TXN)
+
+    stage.add(req, 'client')
+    stage.add(query, 'client')
+    stage.flush()
+
+    assert stage.service() == 2
+    assert not failed
+    assert [msg for msg, _ in verified] == [req, query]
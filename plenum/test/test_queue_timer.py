@@ -226,3 +226,22 @@ def test_timer_cancels_all_instances_of_callback():
     ts.value += 6
     timer.service()
     assert cb.call_count == 0
+
+
+def test_timer_reports_next_event_time():
+    ts = MockTimestamp(0)
+    timer = QueueTimer(ts)
+    cb1 = Callback()
+    cb2 = Callback()
+    assert timer.next_event_time() is None
+
+    timer.schedule(5, cb1)
+    timer.schedule(3, cb2)
+    assert timer.next_event_time() == 3
+
+    ts.value += 4
+    timer.service()
+    assert timer.next_event_time() == 5
+
+    timer.cancel(cb1)
+    assert timer.next_event_time() is None
@@ -0,0 +1,182 @@
+import threading
+import time
+
+import pytest
+
+from common.serializers.serialization import ledger_txn_serializer
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.common.constants import DOMAIN_LEDGER_ID, POOL_LEDGER_ID, TXN_TYPE, HS_ROCKSDB, HS_FILE
+from plenum.common.ledger import Ledger
+from plenum.common.request import Request
+from plenum.common.txn_util import append_txn_metadata
+from plenum.server.database_manager import DatabaseManager
+from plenum.server.read_request_pool import ReadRequestPool, check_storages_for_workers
+from plenum.server.request_handlers.handler_interfaces.read_request_handler import ReadRequestHandler
+from plenum.server.request_managers.read_request_manager import ReadRequestManager
+from state.pruning_state import PruningState
+from storage.helper import initHashStore
+from storage.kv_store_rocksdb import KeyValueStorageRocksdb
+
+GET_KEY = 'get_key'
+
+
+class GetKeyHandler(ReadRequestHandler):
+    def __init__(self, database_manager):
+        super().__init__(database_manager, GET_KEY, DOMAIN_LEDGER_ID)
+
+    def get_result(self, request: Request):
+        key = request.operation['key'].encode()
+        return {'value': self.state.get(key),
+                'ledger_size': self.ledger.size,
+                'last_txn': self.ledger.getBySeqNo(self.ledger.size)}
+
+
+@pytest.fixture()
+def db_manager(tdir_for_func, tconf):
+    hash_store = initHashStore(tdir_for_func, 'domain', config=tconf, hs_type=HS_ROCKSDB)
+    ledger = Ledger(CompactMerkleTree(hashStore=hash_store),
+                    dataDir=tdir_for_func,
+                    fileName='domain_transactions',
+                    txn_serializer=ledger_txn_serializer,
+                    config=tconf)
+    state = PruningState(KeyValueStorageRocksdb(tdir_for_func, 'domain_state'))
+    db_manager = DatabaseManager()
+    db_manager.register_new_database(DOMAIN_LEDGER_ID, ledger, state)
+    yield db_manager
+    ledger.stop()
+    state.close()
+
+
+@pytest.fixture()
+def read_manager(db_manager):
+    read_manager = ReadRequestManager()
+    read_manager.register_req_handler(GetKeyHandler(db_manager))
+    return read_manager
+
+
+@pytest.fixture()
+def pool():
+    results = []
+    failed = []
+    pool = ReadRequestPool(on_result=lambda result, msg, frm: results.append((result, msg, frm)),
+                           on_failed=lambda ex, wrapped: failed.append((ex, wrapped)),
+                           workers=2)
+    yield pool, results, failed
+    pool.stop()
+
+
+def commit(db_manager, value, txns=1):
+    ledger = db_manager.get_ledger(DOMAIN_LEDGER_ID)
+    state = db_manager.get_state(DOMAIN_LEDGER_ID)
+    start = ledger.size + 1
+    batch = []
+    for seq_no in range(start, start + txns):
+        txn = {'txn': {'type': '1', 'data': {'value': value}, 'metadata': {}},
+               'txnMetadata': {}, 'ver': '1'}
+        append_txn_metadata(txn, seq_no=seq_no, txn_time=1500000000)
+        batch.append(txn)
+    ledger.appendTxns(batch)
+    state.set(b'key', value.encode())
+    ledger.commitTxns(txns)
+    state.commit()
+
+
+def get_key_req(req_id):
+    return Request(identifier='client', reqId=req_id,
+                   operation={TXN_TYPE: GET_KEY, 'key': 'key'},
+                   protocolVersion=2)
+
+
+def deliver_all(pool, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while pool.pending_count > 0 and time.perf_counter() < deadline:
+        pool.service()
+        time.sleep(0.01)
+    assert pool.pending_count == 0
+
+
+def test_snapshot_is_pinned_to_committed_data(db_manager, read_manager):
+    commit(db_manager, 'v1', txns=3)
+    snapshot = db_manager.committed_snapshot()
+
+    # Uncommitted changes are not seen
+    ledger = db_manager.get_ledger(DOMAIN_LEDGER_ID)
+    db_manager.get_state(DOMAIN_LEDGER_ID).set(b'key', b'uncommitted')
+    assert read_manager.get_result_for_snapshot(get_key_req(1), snapshot) == \
+        {'value': b'v1', 'ledger_size': 3, 'last_txn': ledger.getBySeqNo(3)}
+
+    # Changes committed after the snapshot was taken are not seen
+    commit(db_manager, 'v2', txns=2)
+    assert read_manager.get_result_for_snapshot(get_key_req(2), snapshot)['value'] == b'v1'
+    assert snapshot.get_ledger(DOMAIN_LEDGER_ID).size == 3
+    assert snapshot.get_ledger(DOMAIN_LEDGER_ID).getBySeqNo(4) is None
+    assert read_manager.get_result(get_key_req(3))['value'] == b'v2'
+
+
+def test_results_are_delivered_in_order(db_manager, read_manager, pool):
+    pool, results, failed = pool
+    commit(db_manager, 'v1')
+    reqs = []
+    for i in range(1, 21):
+        snapshot = db_manager.committed_snapshot()
+        req = get_key_req(i)
+        reqs.append(req)
+        pool.submit(req, 'client{}'.format(i),
+                    lambda req=req, snapshot=snapshot: read_manager.get_result_for_snapshot(req, snapshot))
+        commit(db_manager, 'v{}'.format(i + 1))
+    deliver_all(pool)
+
+    assert not failed
+    assert [msg for _, msg, _ in results] == reqs
+    assert [frm for _, _, frm in results] == ['client{}'.format(i) for i in range(1, 21)]
+    assert [result['value'] for result, _, _ in results] == ['v{}'.format(i).encode() for i in range(1, 21)]
+    assert [result['ledger_size'] for result, _, _ in results] == list(range(1, 21))
+
+
+def test_failed_requests_are_reported(pool):
+    pool, results, failed = pool
+
+    def fail():
+        raise ValueError('bad request')
+
+    pool.submit(get_key_req(1), 'client', fail)
+    pool.submit(get_key_req(2), 'client', lambda: 'ok')
+    deliver_all(pool)
+
+    assert [(type(ex), wrapped[0].reqId) for ex, wrapped in failed] == [(ValueError, 1)]
+    assert [(result, msg.reqId) for result, msg, _ in results] == [('ok', 2)]
+
+
+def test_pool_needs_workers():
+    with pytest.raises(ValueError):
+        ReadRequestPool(on_result=lambda *args: None, on_failed=lambda *args: None, workers=0)
+
+
+def test_stop_waits_for_started_requests(pool):
+    pool, results, failed = pool
+    started = threading.Event()
+    finished = []
+
+    def serve():
+        started.set()
+        time.sleep(0.2)
+        finished.append(True)
+
+    pool.submit(get_key_req(1), 'client', serve)
+    started.wait(5)
+    pool.stop()
+    assert finished == [True]
+    assert pool.pending_count == 0
+
+
+def test_workers_need_rocksdb_ledger_storages(tdir_for_func, tconf, db_manager):
+    check_storages_for_workers(db_manager)
+
+    ledger = Ledger(CompactMerkleTree(hashStore=initHashStore(tdir_for_func, 'pool', config=tconf, hs_type=HS_FILE)),
+                    dataDir=tdir_for_func,
+                    fileName='pool_transactions',
+                    config=tconf)
+    db_manager.register_new_database(POOL_LEDGER_ID, ledger)
+    with pytest.raises(RuntimeError):
+        check_storages_for_workers(db_manager)
+    ledger.stop()
@@ -0,0 +1,121 @@
+import pytest
+
+from common.serializers.serialization import domain_state_serializer
+from plenum.common.constants import NYM, GET_TXN, TXN_TYPE, TARGET_NYM, VERKEY, DOMAIN_LEDGER_ID
+from plenum.common.exceptions import InsufficientCorrectSignatures
+from plenum.common.metrics_collector import MetricsName
+from plenum.common.request import Request
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.txn_util import reqToTxn, append_txn_metadata
+from plenum.server.batch_handlers.verkey_cache_batch_handler import VerkeyCacheBatchHandler
+from plenum.server.client_authn import CoreAuthNr
+from plenum.server.request_handlers.utils import nym_to_state_key
+from plenum.test.metrics.helper import MockMetricsCollector
+from state.pruning_state import PruningState
+from storage.kv_in_memory import KeyValueStorageInMemory
+
+
+@pytest.fixture()
+def state():
+    return PruningState(KeyValueStorageInMemory())
+
+
+@pytest.fixture()
+def metrics():
+    return MockMetricsCollector()
+
+
+@pytest.fixture()
+def authnr(state, metrics):
+    return CoreAuthNr([NYM], [GET_TXN], [], state=state,
+                      verkey_cache_size=2, metrics=metrics)
+
+
+def set_nym(state, signer):
+    state.set(nym_to_state_key(signer.identifier),
+              domain_state_serializer.serialize({VERKEY: signer.verkey}))
+
+
+def signed_req(signer, identifier, req_id=1):
+    req = Request(identifier=identifier,
+                  reqId=req_id,
+                  operation={TXN_TYPE: NYM, TARGET_NYM: 'some_nym'},
+                  protocolVersion=2)
+    req.signature = signer.sign(req.as_dict)
+    return req.as_dict
+
+
+def cache_stats(metrics):
+    metrics.flush_accumulated()
+    hits = sum(ev.count for ev in metrics.events if ev.name == MetricsName.VERKEY_CACHE_HITS)
+    misses = sum(ev.count for ev in metrics.events if ev.name == MetricsName.VERKEY_CACHE_MISSES)
+    return hits, misses
+
+
+def test_verkey_is_taken_from_cache(state, metrics, authnr):
+    signer = SimpleSigner()
+    set_nym(state, signer)
+
+    for req_id in range(5):
+        authnr.authenticate(signed_req(signer, signer.identifier, req_id))
+
+    assert cache_stats(metrics) == (4, 1)
+
+
+def test_cache_is_bounded(state, metrics, authnr):
+    signers = [SimpleSigner() for _ in range(3)]
+    for signer in signers:
+        set_nym(state, signer)
+        authnr.authenticate(signed_req(signer, signer.identifier))
+
+    authnr.authenticate(signed_req(signers[0], signers[0].identifier))
+    assert cache_stats(metrics) == (0, 4)
+
+
+def test_rotated_verkey_is_used_after_invalidation(state, authnr):
+    old_signer = SimpleSigner()
+    new_signer = SimpleSigner(identifier=old_signer.identifier)
+    set_nym(state, old_signer)
+    authnr.authenticate(signed_req(old_signer, old_signer.identifier))
+
+    set_nym(state, new_signer)
+    txn = append_txn_metadata(reqToTxn(signed_req(new_signer, new_signer.identifier)), seq_no=1)
+    txn_with_target = reqToTxn(Request(identifier=old_signer.identifier, reqId=2,
+                                       operation={TXN_TYPE: NYM, TARGET_NYM: old_signer.identifier},
+                                       protocolVersion=2))
+    assert VerkeyCacheBatchHandler.nym_targets([txn, txn_with_target]) == ['some_nym', old_signer.identifier]
+
+    with pytest.raises(InsufficientCorrectSignatures):
+        authnr.authenticate(signed_req(new_signer, new_signer.identifier, 2))
+
+    authnr.invalidate_verkeys(VerkeyCacheBatchHandler.nym_targets([txn_with_target]))
+    authnr.authenticate(signed_req(new_signer, new_signer.identifier, 2))
+
+    set_nym(state, old_signer)
+    authnr.clear_verkey_cache()
+    authnr.authenticate(signed_req(old_signer, old_signer.identifier, 3))
+
+
+def test_verkeys_from_requests_are_not_cached(metrics, authnr):
+    signer = SimpleSigner()
+    req = Request(identifier=signer.identifier,
+                  reqId=1,
+                  operation={TXN_TYPE: NYM, TARGET_NYM: signer.identifier, VERKEY: signer.verkey},
+                  protocolVersion=2)
+    req.signature = signer.sign(req.as_dict)
+
+    authnr.authenticate(req.as_dict)
+    authnr.authenticate(req.as_dict)
+    assert cache_stats(metrics) == (0, 2)
+
+
+def test_invalidation_drops_only_given_identifiers(state, metrics, authnr):
+    signers = [SimpleSigner() for _ in range(2)]
+    for signer in signers:
+        set_nym(state, signer)
+        authnr.authenticate(signed_req(signer, signer.identifier))
+
+    authnr.invalidate_verkeys([signers[0].identifier, 'unknown_nym'])
+    for signer in signers:
+        authnr.authenticate(signed_req(signer, signer.identifier, 2))
+    assert cache_stats(metrics) == (1, 3)
@@ -0,0 +1,160 @@
+"""
+Measures overhead of buffering and looking up catchup replies received out
+of order. Ledger and merkle proof verification are replaced with fakes, so
+only the work done by CatchupRepService itself is measured.
+
+Run as `python scripts/bench_catchup_rep_buffer.py`
+"""
+import logging
+import random
+import time
+
+from plenum.common.channel import create_direct_channel
+from plenum.common.constants import DOMAIN_LEDGER_ID
+from plenum.common.messages.node_messages import CatchupRep
+from plenum.common.metrics_collector import NullMetricsCollector
+from plenum.common.util import SortedDict
+from plenum.server.catchup.catchup_rep_service import CatchupRepService
+from plenum.server.catchup.utils import CatchupDataProvider, CatchupTill
+
+TXNS = 100000
+REPLY_SIZE = 100
+NODES = 24
+
+
+class FakeTree:
+    def __init__(self, tree_size):
+        self.tree_size = tree_size
+        self.root_hash = b''
+
+
+class FakeLedger:
+    def __init__(self):
+        self.size = 0
+
+    @property
+    def seqNo(self):
+        return self.size
+
+    def treeWithAppliedTxns(self, txns):
+        return FakeTree(self.size + len(txns))
+
+    def add_batch(self, txns):
+        self.size += len(txns)
+
+
+class FakeVerifier:
+    @staticmethod
+    def verify_tree_consistency(*args):
+        return True
+
+
+class BenchCatchupProvider(CatchupDataProvider):
+    def __init__(self, ledger):
+        self._ledger = ledger
+
+    def all_nodes_names(self):
+        pass
+
+    def node_name(self) -> str:
+        return 'Alpha'
+
+    def ledgers(self):
+        return [DOMAIN_LEDGER_ID]
+
+    def ledger(self, ledger_id: int):
+        return self._ledger
+
+    def verifier(self, ledger_id: int):
+        return FakeVerifier()
+
+    def eligible_nodes(self):
+        pass
+
+    def update_txn_with_extra_data(self, txn: dict) -> dict:
+        pass
+
+    def transform_txn_for_ledger(self, txn: dict) -> dict:
+        return txn
+
+    def notify_catchup_start(self, ledger_id: int):
+        pass
+
+    def notify_catchup_complete(self, ledger_id: int):
+        pass
+
+    def notify_transaction_added_to_ledger(self, ledger_id: int, txn: dict):
+        pass
+
+    def notify_transactions_added_to_ledger(self, ledger_id: int, txns):
+        pass
+
+    def send_to(self, msg, to: str, message_splitter=None):
+        pass
+
+    def send_to_nodes(self, msg, nodes=None):
+        pass
+
+    def blacklist_node(self, node_name: str, reason: str):
+        pass
+
+    def discard(self, msg, reason, logMethod=logging.error, cliOutput=False):
+        pass
+
+
+class FakeOutput:
+    def put_nowait(self, msg):
+        pass
+
+
+def make_reps():
+    reps = []
+    for start in range(1, TXNS + 1, REPLY_SIZE):
+        txns = {str(seq_no): {} for seq_no in range(start, start + REPLY_SIZE)}
+        reps.append(CatchupRep(DOMAIN_LEDGER_ID, SortedDict(txns), []))
+    return reps
+
+
+def bench():
+    ledger = FakeLedger()
+    _, input_rx = create_direct_channel()
+    service = CatchupRepService(ledger_id=DOMAIN_LEDGER_ID,
+                                config=None,
+                                input=input_rx,
+                                output=FakeOutput(),
+                                timer=None,
+                                metrics=NullMetricsCollector(),
+                                provider=BenchCatchupProvider(ledger))
+    service._is_working = True
+    service._catchup_till = CatchupTill(start_size=0, final_size=TXNS, final_hash='')
+
+    # All replies except the first one are buffered, then the first one
+    # makes all of them applied
+    reps = make_reps()
+    buffered = reps[1:]
+    random.shuffle(buffered)
+    frms = ['Node{}'.format(i) for i in range(NODES)]
+
+    start = time.perf_counter()
+    for i, rep in enumerate(buffered):
+        service.process_catchup_rep(rep, frms[i % NODES])
+    buffering = time.perf_counter() - start
+
+    start = time.perf_counter()
+    service.process_catchup_rep(reps[0], frms[0])
+    applying = time.perf_counter() - start
+
+    assert ledger.size == TXNS
+    return buffering, applying
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    random.seed(0)
+    buffering, applying = bench()
+    print('{} txns in replies of {} from {} nodes'.format(TXNS, REPLY_SIZE, NODES))
+    print('buffering: {:.1f} ms, applying: {:.1f} ms'.format(buffering * 1e3, applying * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures time of committing a 3PC batch of transactions to a ledger with
+the default (RocksDB) transaction log and different hash stores.
+
+Run as `python scripts/bench_ledger_commit.py`
+"""
+import tempfile
+import time
+
+from common.serializers.serialization import ledger_txn_serializer
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.common.config_util import getConfig
+from plenum.common.constants import HS_FILE, HS_ROCKSDB, HS_MEMORY
+from plenum.common.ledger import Ledger
+from plenum.common.txn_util import append_txn_metadata
+from storage.helper import initHashStore
+
+BATCH_SIZE = 1000
+BATCHES = 5
+
+
+def make_txns(count, start):
+    txns = []
+    for i in range(start, start + count):
+        txn = {'txn': {'type': '1',
+                       'data': {'dest': 'dest{}'.format(i), 'verkey': '~' + 'v' * 21},
+                       'metadata': {'digest': str(i) * 8, 'reqId': i}},
+               'txnMetadata': {},
+               'ver': '1'}
+        append_txn_metadata(txn, txn_time=1500000000)
+        txns.append(txn)
+    return txns
+
+
+def bench(hs_type, batch_size=BATCH_SIZE, batches=BATCHES):
+    config = getConfig()
+    with tempfile.TemporaryDirectory() as data_dir:
+        hash_store = initHashStore(data_dir, 'bench', config=config, hs_type=hs_type)
+        ledger = Ledger(CompactMerkleTree(hashStore=hash_store),
+                        dataDir=data_dir,
+                        fileName='bench_transactions',
+                        txn_serializer=ledger_txn_serializer,
+                        config=config)
+        best = None
+        for i in range(batches):
+            txns = make_txns(batch_size, i * batch_size)
+            ledger.append_txns_metadata(txns)
+            ledger.appendTxns(txns)
+            start = time.perf_counter()
+            ledger.commitTxns(len(txns))
+            t = time.perf_counter() - start
+            best = t if best is None else min(best, t)
+        ledger.stop()
+    return best
+
+
+def main():
+    print('{:<12}{:>20}'.format('hash store', 'ms per {} txns'.format(BATCH_SIZE)))
+    for hs_type in (HS_MEMORY, HS_ROCKSDB, HS_FILE):
+        print('{:<12}{:>20.1f}'.format(hs_type, bench(hs_type) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
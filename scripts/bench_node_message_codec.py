@@ -0,0 +1,81 @@
+"""
+Compares JSON and binary (msgpack) forms of node messages: size of a
+serialized message and time of serialization plus deserialization.
+
+Run as `python scripts/bench_node_message_codec.py`
+"""
+import timeit
+
+from plenum.common.messages.node_message_codec import pack_message, unpack_messages
+from plenum.common.messages.node_messages import PrePrepare, Prepare, Commit, Checkpoint, \
+    InstanceChange, ViewChange, ViewChangeAck, NewView, LedgerStatus, ConsistencyProof, \
+    CatchupReq, CatchupRep, MessageReq, MessageRep, Propagate, BackupInstanceFaulty
+from plenum.common.util import get_utc_epoch
+from stp_zmq.zstack import ZStack
+
+ROOT = '5BU5Rc3sRtTJB6tVprGiTSqiRaa9o6ei11MjH4Vu16ms'
+DIGEST = 'd' * 64
+REQ = {'identifier': '6ouriXMZkLeHsuXrN1X1fd', 'reqId': 1521463564438497,
+       'operation': {'type': '1', 'dest': '4AdS22kC7xzb4bcqg9JATuCfAMNcQYcZa1u5eWzs6cSJ'},
+       'protocolVersion': 2,
+       'signature': '2KS8wWbfPU8kJ2yzL7kgGM6AQuBTZ8grGtGN2N6oAuJ7eUZ2wZs4e8kdHuWfGc8swbKbPsjcA4nrijQYjAc8UJ8M'}
+
+
+def sample_messages():
+    pp_time = get_utc_epoch()
+    checkpoint = Checkpoint(0, 1, 1, 100, ROOT)
+    return [
+        Propagate(REQ, 'client'),
+        PrePrepare(0, 1, 2, pp_time, [DIGEST] * 100, None, DIGEST, 1,
+                   ROOT, ROOT, 0, True, ROOT, ROOT),
+        Prepare(0, 1, 2, pp_time, DIGEST, ROOT, ROOT, ROOT),
+        Commit(0, 1, 2),
+        checkpoint,
+        InstanceChange(1, 25),
+        BackupInstanceFaulty(1, [1, 2], 53),
+        ViewChange(1, 100, [(0, i, DIGEST) for i in range(10)], [], [checkpoint]),
+        ViewChangeAck(1, 'Alpha', DIGEST),
+        NewView(1, [('Alpha', DIGEST), ('Beta', DIGEST), ('Gamma', DIGEST)],
+                checkpoint, [(0, i, DIGEST) for i in range(10)]),
+        LedgerStatus(1, 100, 1, 2, ROOT, 2),
+        ConsistencyProof(1, 10, 100, 1, 2, ROOT, ROOT, [ROOT] * 7),
+        CatchupReq(1, 1, 100, 100),
+        CatchupRep(1, {str(i): {'txn': {'data': REQ['operation'], 'type': '1'},
+                                'txnMetadata': {'seqNo': i, 'txnTime': pp_time}}
+                       for i in range(1, 11)}, [ROOT] * 7),
+        MessageReq('PREPREPARE', {'instId': 0, 'viewNo': 1, 'ppSeqNo': 2}),
+        MessageRep('COMMIT', {'instId': 0, 'viewNo': 1, 'ppSeqNo': 2}, Commit(0, 1, 2)),
+    ]
+
+
+def json_round_trip(msg):
+    return ZStack.deserializeMsg(ZStack.serializeMsg(msg))
+
+
+def binary_round_trip(msg):
+    return unpack_messages(pack_message(msg))
+
+
+def best_time(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def bench(msg, number=1000):
+    json_size = len(ZStack.serializeMsg(msg._asdict()))
+    binary_size = len(pack_message(msg))
+    # Node stack serializes dict form of a message to JSON while
+    # the message itself is packed into binary form
+    json_time = best_time(lambda: json_round_trip(msg._asdict()), number)
+    binary_time = best_time(lambda: binary_round_trip(msg), number)
+    return json_size, binary_size, json_time * 1e6, binary_time * 1e6
+
+
+def main():
+    print('{:<22}{:>12}{:>12}{:>14}{:>14}'.format(
+        'message', 'json bytes', 'bin bytes', 'json us/msg', 'bin us/msg'))
+    for msg in sample_messages():
+        print('{:<22}{:>12}{:>12}{:>14.1f}{:>14.1f}'.format(msg.typename, *bench(msg)))
+
+
+if __name__ == '__main__':
+    main()
@@ -60,7 +60,8 @@ setup(
     extras_require={
         'tests': tests_require,
         'stats': ['python-firebase'],
-        'benchmark': ['pympler']
+        'benchmark': ['pympler'],
+        'speedups': ['orjson']
     },
     tests_require=tests_require,
     scripts=['scripts/init_plenum_keys',
@@ -71,6 +72,7 @@ setup(
              'scripts/udp_sender', 'scripts/udp_receiver', 'scripts/filter_log',
              'scripts/log_stats',
              'scripts/init_bls_keys',
+             'scripts/import_ledger',
              'scripts/process_logs/process_logs',
              'scripts/process_logs/process_logs.yml']
 )
@@ -26,5 +26,8 @@ class PersistentDB(BaseDB):
     def inc_refcount(self, key, value):
         self._keyValueStorage.put(key, value)
 
+    def inc_refcount_batch(self, items):
+        self._keyValueStorage.setBatch(items)
+
     def dec_refcount(self, key):
         pass
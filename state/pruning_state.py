@@ -1,6 +1,8 @@
 from binascii import unhexlify
-from typing import Optional
+from contextlib import contextmanager
+from typing import Optional, Iterable, Tuple
 
+from common.exceptions import LogicError
 from state.db.persistent_db import PersistentDB
 from state.state import State
 from state.trie.pruning_trie import BLANK_ROOT, Trie, BLANK_NODE, \
@@ -25,16 +27,30 @@ class PruningState(State):
     # SOME KEY THAT DOES NOT COLLIDE WITH ANY STATE VARIABLE'S NAME
     rootHashKey = b'\x88\xc8\x88 \x9a\xa7\x89\x1b'
 
-    def __init__(self, keyValueStorage: KeyValueStorage):
+    def __init__(self, keyValueStorage: KeyValueStorage,
+                 deferred_hashing: bool = True,
+                 node_cache_size: int = 0):
+        """
+        :param deferred_hashing: whether trie nodes changed by `set` and
+        `remove` are hashed and stored only when the head hash is needed,
+        so that nodes changed several times in a batch are stored once
+        :param node_cache_size: max number of decoded trie nodes cached for
+        reads of committed state and states with given roots
+        """
         self._kv = keyValueStorage
         if self.rootHashKey in self._kv:
             rootHash = bytes(self._kv.get(self.rootHashKey))
         else:
             rootHash = BLANK_ROOT
             self._kv.put(self.rootHashKey, BLANK_ROOT)
+        self._committed_head_hash = rootHash
+        # Values set during `bulk_load`, None when it's not in progress
+        self._bulk_values = None
         self._trie = Trie(
             PersistentDB(self._kv),
-            rootHash)
+            rootHash,
+            deferred=deferred_hashing,
+            node_cache_size=node_cache_size)
 
     @property
     def head(self):
@@ -57,20 +73,30 @@ class PruningState(State):
             return BLANK_NODE
         return self._trie._decode_to_node(node_hash)
 
+    def _hash_to_node_for_read(self, node_hash):
+        if node_hash == BLANK_ROOT:
+            return BLANK_NODE
+        return self._trie._decode_to_node_for_read(node_hash)
+
     def set(self, key: bytes, value: bytes):
+        if self._bulk_values is not None:
+            self._bulk_values[to_string(key)] = value
+            return
         self._trie.update(key, rlp_encode([value]))
 
     def get(self, key: bytes, isCommitted: bool = True) -> Optional[bytes]:
+        if self._bulk_values is not None:
+            return self._bulk_values.get(to_string(key))
         if not isCommitted:
             val = self._trie.get(key)
         else:
-            val = self._trie._get(self.committedHead,
+            val = self._trie._get(self._hash_to_node_for_read(self.committedHeadHash),
                                   bin_to_nibbles(to_string(key)))
         if val:
             return self.get_decoded(val)
 
     def get_for_root_hash(self, root_hash, key: bytes) -> Optional[bytes]:
-        root = self._hash_to_node(root_hash)
+        root = self._hash_to_node_for_read(root_hash)
         val = self._trie._get(root,
                               bin_to_nibbles(to_string(key)))
         if val:
@@ -82,11 +108,14 @@ class PruningState(State):
         return leaves
 
     def remove(self, key: bytes):
+        if self._bulk_values is not None:
+            self._bulk_values.pop(to_string(key), None)
+            return
         self._trie.delete(key)
 
     def commit(self, rootHash=None, rootNode=None):
         if rootNode:
-            rootHash = self._trie._encode_node(rootNode)
+            rootHash = self._trie._encode_node(rootNode, is_root=True)
         elif rootHash and isHex(rootHash):
             if isinstance(rootHash, str):
                 rootHash = rootHash.encode()
@@ -96,6 +125,41 @@ class PruningState(State):
         else:
             rootHash = self.headHash
         self._kv.put(self.rootHashKey, rootHash)
+        self._committed_head_hash = bytes(rootHash)
+
+    def load_sorted(self, items: Iterable[Tuple[bytes, bytes]]):
+        """
+        Build an empty state from (key, value) pairs sorted by key without
+        duplicates and make it both committed state and head. The trie is
+        built bottom-up with every node written once, its root is the same
+        as if values were set one by one.
+        """
+        self._check_empty_for_loading()
+        self._trie.build_from_sorted((key, rlp_encode([value])) for key, value in items)
+        self.commit(rootHash=self._trie.root_hash)
+
+    @contextmanager
+    def bulk_load(self):
+        """
+        Keep values set and removed in the block in memory, reads in the
+        block return them whether committed state is requested or not, and
+        load them into the empty state with `load_sorted` at exit. Nothing
+        is loaded if the block raises.
+        """
+        self._check_empty_for_loading()
+        self._bulk_values = {}
+        try:
+            yield
+            values = self._bulk_values
+        finally:
+            self._bulk_values = None
+        self.load_sorted(sorted(values.items()))
+
+    def _check_empty_for_loading(self):
+        if self._bulk_values is not None:
+            raise LogicError('State is already being bulk loaded')
+        if not self.isEmpty or self.headHash != BLANK_ROOT:
+            raise LogicError('Only an empty state can be loaded')
 
     def revertToHead(self, headHash=None):
         head = self._hash_to_node(headHash)
@@ -105,6 +169,9 @@ class PruningState(State):
     def generate_state_proof(self, key: bytes, root=None, serialize=False, get_value=False):
         return self._trie.generate_state_proof(key, root, serialize, get_value=get_value)
 
+    def generate_state_proofs(self, keys: Iterable[bytes], root=None, serialize=False, get_value=False):
+        return self._trie.generate_state_proofs(keys, root, serialize, get_value=get_value)
+
     def generate_state_proof_for_keys_with_prefix(self, key_prfx, root=None,
                                                   serialize=False, get_value=False):
         return self._trie.generate_state_proof_for_keys_with_prefix(key_prfx, root,
@@ -143,12 +210,26 @@ class PruningState(State):
 
     @property
     def committedHeadHash(self):
-        return self._kv.get(self.rootHashKey)
+        return self._committed_head_hash
+
+    @property
+    def node_cache_hits(self) -> int:
+        return self._trie.node_cache_hits
+
+    @property
+    def node_cache_misses(self) -> int:
+        return self._trie.node_cache_misses
 
     @property
     def isEmpty(self):
         return self.committedHeadHash == BLANK_ROOT
 
+    def committed_view(self) -> 'PruningStateView':
+        """
+        Read-only view of the current committed state
+        """
+        return PruningStateView(self._kv, self.committedHeadHash)
+
     def close(self):
         if self._kv:
             self._kv.close()
@@ -157,3 +238,40 @@ class PruningState(State):
     @staticmethod
     def get_decoded(encoded):
         return rlp_decode(encoded)[0]
+
+
+class PruningStateView(PruningState):
+    """
+    Read-only view of a state pinned to the given root. Trie nodes are
+    addressed by hashes of their content and never change, so the view can
+    be read from other threads while the state keeps being changed in the
+    main thread. Views have own tries without node cache.
+    """
+
+    def __init__(self, keyValueStorage: KeyValueStorage, root_hash: bytes):
+        self._kv = keyValueStorage
+        self._committed_head_hash = bytes(root_hash)
+        self._bulk_values = None
+        self._trie = Trie(PersistentDB(self._kv), self._committed_head_hash)
+
+    def set(self, key: bytes, value: bytes):
+        raise LogicError('State view is read-only')
+
+    def remove(self, key: bytes):
+        raise LogicError('State view is read-only')
+
+    def commit(self, rootHash=None, rootNode=None):
+        raise LogicError('State view is read-only')
+
+    def revertToHead(self, headHash=None):
+        raise LogicError('State view is read-only')
+
+    def load_sorted(self, items: Iterable[Tuple[bytes, bytes]]):
+        raise LogicError('State view is read-only')
+
+    def bulk_load(self):
+        raise LogicError('State view is read-only')
+
+    def close(self):
+        # Storage belongs to the state the view was taken from
+        self._kv = None
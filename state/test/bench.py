@@ -1 +1,80 @@
-# TODO: Benchmark CRUD over the Trie.
+"""
+Measures time of applying a 3PC batch of NYM transactions to a RocksDB
+based state with and without deferred hashing of trie nodes, including
+getting the head hash for the batch and committing it, and time of
+recreating a state of NYMs from scratch by committing them one by one or
+with a bulk load.
+
+Run as `python -m state.test.bench`
+"""
+import tempfile
+import time
+
+from plenum.server.request_handlers.utils import nym_to_state_key, \
+    encode_state_value
+from state.pruning_state import PruningState
+from storage.kv_store_rocksdb import KeyValueStorageRocksdb
+
+BATCH_SIZE = 1000
+BATCHES = 10
+REGENERATED_NYMS = 20000
+
+
+def make_nyms(count, start):
+    nyms = []
+    for i in range(start, start + count):
+        nym = 'did{:018}'.format(i)
+        value = {'identifier': 'trustee', 'dest': nym, 'verkey': '~' + 'v' * 21, 'role': None}
+        nyms.append((nym_to_state_key(nym), encode_state_value(value, i, 1500000000)))
+    return nyms
+
+
+def bench(deferred_hashing, batch_size=BATCH_SIZE, batches=BATCHES):
+    with tempfile.TemporaryDirectory() as data_dir:
+        state = PruningState(KeyValueStorageRocksdb(data_dir, 'bench_state'),
+                             deferred_hashing=deferred_hashing)
+        best = None
+        for i in range(batches):
+            nyms = make_nyms(batch_size, i * batch_size)
+            start = time.perf_counter()
+            for key, value in nyms:
+                state.set(key, value)
+            state.commit(state.headHash)
+            t = time.perf_counter() - start
+            best = t if best is None else min(best, t)
+        state.close()
+    return best
+
+
+def bench_regeneration(bulk_load, count=REGENERATED_NYMS):
+    nyms = make_nyms(count, 0)
+    with tempfile.TemporaryDirectory() as data_dir:
+        state = PruningState(KeyValueStorageRocksdb(data_dir, 'bench_state'))
+        start = time.perf_counter()
+        if bulk_load:
+            with state.bulk_load():
+                for key, value in nyms:
+                    state.set(key, value)
+        else:
+            for key, value in nyms:
+                state.set(key, value)
+                state.commit(state.headHash)
+        t = time.perf_counter() - start
+        state.close()
+    return t
+
+
+def main():
+    print('{:<20}{:>20}'.format('trie', 'ms per {} NYMs'.format(BATCH_SIZE)))
+    for deferred_hashing in (False, True):
+        name = 'deferred hashing' if deferred_hashing else 'hash on update'
+        print('{:<20}{:>20.1f}'.format(name, bench(deferred_hashing) * 1e3))
+    print()
+    print('{:<20}{:>20}'.format('regeneration', 'ms per {} NYMs'.format(REGENERATED_NYMS)))
+    for bulk_load in (False, True):
+        name = 'bulk load' if bulk_load else 'commit per txn'
+        print('{:<20}{:>20.1f}'.format(name, bench_regeneration(bulk_load) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
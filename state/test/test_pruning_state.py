@@ -1,6 +1,11 @@
 import copy
+import random
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
 
 import pytest
+
+from common.exceptions import LogicError
 from storage.kv_store import KeyValueStorage
 from state.pruning_state import PruningState
 from state.state import State
@@ -320,3 +325,198 @@ def test_get_all_leaves_for_root_hash_commited(state):
 def get_decoded_dict_values(state, head_hash):
     encoded_values = state.get_all_leaves_for_root_hash(head_hash)
     return {k: state.get_decoded(v) for k, v in encoded_values.items()}
+
+
+def stored_nodes(state, head_hash):
+    return set(state._trie.iter_stored_nodes(head_hash))
+
+
+def test_deferred_hashing_gives_same_nodes(db):
+    state = PruningState(db)
+    not_deferred = PruningState(KeyValueStorageInMemory(), deferred_hashing=False)
+    rnd = random.Random(0)
+    keys = [sha256(str(i).encode()).digest() for i in range(200)]
+    for batch in range(10):
+        for _ in range(50):
+            key = rnd.choice(keys)
+            if rnd.random() < 0.2:
+                state.remove(key)
+                not_deferred.remove(key)
+            else:
+                value = str(rnd.random()).encode()
+                state.set(key, value)
+                not_deferred.set(key, value)
+        assert state.headHash == not_deferred.headHash
+        assert stored_nodes(state, state.headHash) == \
+            stored_nodes(not_deferred, not_deferred.headHash)
+        if batch % 3 == 0:
+            state.revertToHead(state.committedHeadHash)
+            not_deferred.revertToHead(not_deferred.committedHeadHash)
+        else:
+            state.commit()
+            not_deferred.commit()
+        assert state.as_dict == not_deferred.as_dict
+    state.close()
+
+
+def test_deferred_hashing_stores_nodes_with_head_hash():
+    kv = KeyValueStorageInMemory()
+    state = PruningState(kv)
+    state.set(b'k1', b'v1')
+    state.commit()
+    stored = kv.size
+
+    for i in range(100):
+        state.set('k{}'.format(i).encode(), 'v{}'.format(i).encode())
+    state.remove(b'k2')
+    assert kv.size == stored
+    assert state.get(b'k5', isCommitted=False) == b'v5'
+    assert state.get(b'k2', isCommitted=False) is None
+    assert state.get(b'k5') is None
+
+    head_hash = state.headHash
+    assert kv.size > stored
+    assert head_hash in kv
+    assert state.get_for_root_hash(head_hash, b'k5') == b'v5'
+
+
+def test_node_cache_for_committed_reads(db):
+    state = PruningState(db, node_cache_size=20)
+    for i in range(100):
+        state.set('k{}'.format(i).encode(), 'v{}'.format(i).encode())
+    state.commit()
+
+    assert state.get(b'k1') == b'v1'
+    misses = state.node_cache_misses
+    assert misses > 0
+    assert state.get(b'k1') == b'v1'
+    assert state.node_cache_misses == misses
+    assert state.node_cache_hits >= misses
+    for i in range(100):
+        assert state.get('k{}'.format(i).encode()) == 'v{}'.format(i).encode()
+    assert len(state._trie._node_cache) == 20
+
+    # Cached nodes are not changed by updates of uncommitted state
+    committed_head_hash = state.committedHeadHash
+    for i in range(100):
+        state.set('k{}'.format(i).encode(), b'new')
+    state.remove(b'k1')
+    for i in range(100):
+        assert state.get('k{}'.format(i).encode()) == 'v{}'.format(i).encode()
+    state.commit()
+    assert state.get(b'k1') is None
+    assert state.get(b'k2') == b'new'
+    assert state.get_for_root_hash(committed_head_hash, b'k1') == b'v1'
+
+    # Proofs are built from cached nodes too
+    proof = state.generate_state_proof(b'k2', root=state.committedHead, serialize=True)
+    assert PruningState.verify_state_proof(state.committedHeadHash, b'k2', b'new',
+                                           proof, serialized=True)
+    state.close()
+
+
+def test_committed_view(state):
+    state.set(b'k1', b'v1')
+    state.commit()
+    view = state.committed_view()
+
+    state.set(b'k1', b'v2')
+    state.set(b'k2', b'v2')
+    assert view.get(b'k1') == b'v1'
+    state.commit()
+    assert view.get(b'k1') == b'v1'
+    assert view.get(b'k1', isCommitted=False) == b'v1'
+    assert view.get(b'k2') is None
+    assert view.committedHeadHash == view.headHash != state.committedHeadHash
+    assert view.get_for_root_hash(state.committedHeadHash, b'k2') == b'v2'
+    proof = view.generate_state_proof(b'k1', root=view.committedHead, serialize=True)
+    assert PruningState.verify_state_proof(view.committedHeadHash, b'k1', b'v1', proof, serialized=True)
+
+    with pytest.raises(LogicError):
+        view.set(b'k1', b'v3')
+    with pytest.raises(LogicError):
+        view.commit()
+    view.close()
+    assert state.get(b'k1') == b'v2'
+
+
+def test_committed_view_read_in_threads(db):
+    state = PruningState(db)
+    for i in range(100):
+        state.set('k{}'.format(i).encode(), b'0')
+    state.commit()
+    view = state.committed_view()
+
+    def read_view():
+        for _ in range(20):
+            for i in range(100):
+                assert view.get('k{}'.format(i).encode()) == b'0'
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(read_view) for _ in range(4)]
+        for n in range(1, 20):
+            for i in range(100):
+                state.set('k{}'.format(i).encode(), str(n).encode())
+            state.commit()
+        for future in futures:
+            future.result()
+    state.close()
+
+
+def test_load_sorted(state):
+    values = {'k{}'.format(i).encode(): 'v{}'.format(i).encode() for i in range(300)}
+    expected = PruningState(KeyValueStorageInMemory())
+    for key, value in values.items():
+        expected.set(key, value)
+    expected.commit()
+
+    state.load_sorted(sorted(values.items()))
+    assert state.committedHeadHash == state.headHash == expected.committedHeadHash
+    assert stored_nodes(state, state.headHash) == stored_nodes(expected, expected.headHash)
+    assert state.get(b'k5') == b'v5'
+    with pytest.raises(LogicError):
+        state.load_sorted([(b'k', b'v')])
+
+    # Loaded root is committed to storage
+    assert PruningState(state._kv).committedHeadHash == expected.committedHeadHash
+
+
+def test_bulk_load(state):
+    expected = PruningState(KeyValueStorageInMemory())
+    with state.bulk_load():
+        for s in (state, expected):
+            for i in range(100):
+                s.set('k{}'.format(i).encode(), 'v{}'.format(i).encode())
+            s.set(b'k1', b'v111')
+            s.remove(b'k2')
+            assert s.get(b'k1', isCommitted=False) == b'v111'
+            assert s.get(b'k2', isCommitted=False) is None
+        # Values are read from memory whether committed state is requested
+        # or not, they get to the trie only at exit
+        assert state.get(b'k1') == b'v111'
+        assert state.committedHeadHash == state.headHash == BLANK_ROOT
+    expected.commit()
+
+    assert state.committedHeadHash == state.headHash == expected.committedHeadHash
+    assert state.as_dict == expected.as_dict
+    state.set(b'k2', b'v2')
+    expected.set(b'k2', b'v2')
+    assert state.headHash == expected.headHash
+
+
+def test_bulk_load_is_dropped_on_exception(state):
+    with pytest.raises(ValueError):
+        with state.bulk_load():
+            state.set(b'k1', b'v1')
+            raise ValueError
+    assert state.headHash == BLANK_ROOT
+    assert state.get(b'k1', isCommitted=False) is None
+
+
+def test_bulk_load_needs_empty_state(state):
+    state.set(b'k1', b'v1')
+    with pytest.raises(LogicError):
+        with state.bulk_load():
+            pass
+    with pytest.raises(LogicError):
+        state.committed_view().load_sorted([])
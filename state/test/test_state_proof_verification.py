@@ -117,3 +117,21 @@ def test_state_proof_for_key_prefix_4(state):
     # More than 16 suffices
     keys_suffices = {random.randint(150, 900) for _ in range(100)}
     add_prefix_nodes_and_verify(state, prefix, keys_suffices)
+
+
+def test_state_proofs_for_several_keys(state):
+    data = {'k{}'.format(i).encode(): 'v{}'.format(i).encode() for i in range(50)}
+    for k, v in data.items():
+        state.set(k, v)
+    state.commit()
+    state.set(b'k1', b'uncommitted')
+
+    proofs = state.generate_state_proofs(list(data) + [b'unknown'], root=state.committedHead,
+                                         serialize=True, get_value=True)
+    for k, v in data.items():
+        proof, value = proofs[k]
+        assert state.get_decoded(value) == v
+        assert PruningState.verify_state_proof(state.committedHeadHash, k, v, proof, serialized=True)
+    proof, value = proofs[b'unknown']
+    assert value is None
+    assert PruningState.verify_state_proof(state.committedHeadHash, b'unknown', None, proof, serialized=True)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from common.exceptions import LogicError, PlenumValueError
+from state.db.persistent_db import PersistentDB
+from state.trie.pruning_trie import Trie, BLANK_ROOT, rlp_encode
+from storage.kv_in_memory import KeyValueStorageInMemory
+
+
+class CountingDB(PersistentDB):
+    def __init__(self, keyValueStorage):
+        super().__init__(keyValueStorage)
+        self.written = []
+
+    def inc_refcount(self, key, value):
+        self.written.append(key)
+        super().inc_refcount(key, value)
+
+    def inc_refcount_batch(self, items):
+        items = list(items)
+        self.written.extend(key for key, _ in items)
+        super().inc_refcount_batch(items)
+
+
+def gen_items(num_keys):
+    items = {}
+    for _ in range(num_keys):
+        key = bytes(random.randint(0, 255) for _ in range(random.randint(1, 6)))
+        # Keys which are prefixes of other keys and have long common prefixes
+        items[key] = rlp_encode([random.choice([b'v', b'value' * random.randint(1, 20)])])
+        items[key[:-1] or b'\x00'] = rlp_encode([key])
+        items[b'prefix' * 3 + key] = rlp_encode([b'v'])
+    return sorted(items.items())
+
+
+def built_by_updates(items, deferred):
+    trie = Trie(PersistentDB(KeyValueStorageInMemory()), deferred=deferred)
+    for key, value in random.sample(items, len(items)):
+        trie.update(key, value)
+    return trie
+
+
+@pytest.mark.parametrize('num_keys', [1, 2, 10, 500])
+def test_build_gives_same_trie_as_updates(num_keys):
+    items = gen_items(num_keys)
+    kv = KeyValueStorageInMemory()
+    db = CountingDB(kv)
+    trie = Trie(db)
+    trie.build_from_sorted(iter(items), batch_size=7)
+
+    expected = built_by_updates(items, deferred=True)
+    assert trie.root_hash == expected.root_hash
+    assert trie.root_hash == built_by_updates(items, deferred=False).root_hash
+    assert trie.to_dict() == dict(items)
+
+    # Only nodes of the final trie are written, identical subtrees at
+    # different places of the trie are the same stored node
+    assert sorted(dict(trie.iter_stored_nodes()).items()) == \
+        sorted(dict(expected.iter_stored_nodes()).items())
+    assert set(db.written) == set(dict(trie.iter_stored_nodes()))
+    assert set(kv.iterator(include_value=False)) == set(db.written)
+
+    # Built trie can be updated further
+    trie.update(b'new key', rlp_encode([b'v']))
+    expected.update(b'new key', rlp_encode([b'v']))
+    assert trie.root_hash == expected.root_hash
+
+
+def test_build_from_no_items():
+    trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    trie.build_from_sorted([])
+    assert trie.root_hash == BLANK_ROOT
+
+
+def test_build_needs_sorted_items():
+    trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    with pytest.raises(PlenumValueError):
+        trie.build_from_sorted([(b'b', b'1'), (b'a', b'2')])
+    trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    with pytest.raises(PlenumValueError):
+        trie.build_from_sorted([(b'a', b'1'), (b'a', b'2')])
+
+
+def test_build_needs_empty_trie():
+    trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    trie.update(b'a', b'1')
+    with pytest.raises(LogicError):
+        trie.build_from_sorted([(b'b', b'2')])
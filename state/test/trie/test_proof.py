@@ -1,7 +1,10 @@
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from random import randint, choice
 
+import pytest
+
 from plenum.common.util import randomString
 from state.db.persistent_db import PersistentDB
 from state.trie.pruning_trie import Trie, rlp_encode, rlp_decode
@@ -393,3 +396,70 @@ def test_get_proof_and_value():
 def test_get_proof_and_value_no_key():
     node_trie = Trie(PersistentDB(KeyValueStorageInMemory()))
     assert ([], None) == node_trie.produce_spv_proof(b"unknown_key", get_value=True)
+
+
+@pytest.mark.parametrize('node_cache_size', [0, 1000])
+def test_proofs_for_several_keys(node_cache_size):
+    test_data = gen_test_data(200)
+    node_trie = Trie(PersistentDB(KeyValueStorageInMemory()),
+                     node_cache_size=node_cache_size)
+    client_trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    for k, v in test_data.items():
+        node_trie.update(k, v)
+
+    unknown_keys = [randomString(64).encode() for _ in range(10)]
+    keys = list(test_data.keys())[:100] + unknown_keys
+    proofs = node_trie.generate_state_proofs(keys, get_value=True)
+    assert set(proofs.keys()) == set(keys)
+    for k in keys:
+        proof, v = proofs[k]
+        assert v == test_data.get(k)
+        # The same nodes as in the proof for a single key
+        single_proof = node_trie.generate_state_proof(k)
+        assert sorted(map(rlp_encode, proof)) == sorted(map(rlp_encode, single_proof))
+        assert client_trie.verify_spv_proof(node_trie.root_hash, k,
+                                            v if v is not None else b'', proof)
+
+    serialized = node_trie.generate_state_proofs(keys, serialize=True)
+    for k in keys:
+        assert client_trie.verify_spv_proof(node_trie.root_hash, k, test_data.get(k, b''),
+                                            serialized[k], serialized=True)
+
+
+def test_proofs_for_several_keys_at_old_root():
+    test_data = gen_test_data(50)
+    node_trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    client_trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    for k, v in test_data.items():
+        node_trie.update(k, v)
+    old_root_hash = node_trie.root_hash
+    old_root = deepcopy(node_trie.root_node)
+    for k in test_data:
+        node_trie.update(k, rlp_encode([randomString(10)]))
+
+    proofs = node_trie.generate_state_proofs(list(test_data), root=old_root, get_value=True)
+    for k, (proof, v) in proofs.items():
+        assert v == test_data[k]
+        assert client_trie.verify_spv_proof(old_root_hash, k, v, proof)
+
+
+def test_proofs_in_threads():
+    test_data = gen_test_data(100)
+    node_trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    for k, v in test_data.items():
+        node_trie.update(k, v)
+    root_hash = node_trie.root_hash
+    keys = list(test_data)
+
+    def check_proofs():
+        for _ in range(10):
+            for k in keys:
+                proof = node_trie.generate_state_proof(k)
+                assert Trie.verify_spv_proof(root_hash, k, test_data[k], proof)
+            proofs = node_trie.generate_state_proofs(keys)
+            assert Trie.verify_spv_proof_multi(root_hash, test_data,
+                                               [node for k in keys for node in proofs[k]])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [executor.submit(check_proofs) for _ in range(4)]:
+            future.result()
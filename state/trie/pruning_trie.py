@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 
 import copy
+import threading
+from collections import OrderedDict
 
-from common.exceptions import PlenumTypeError, PlenumValueError
+from common.exceptions import PlenumTypeError, PlenumValueError, LogicError
 
 import rlp
 from rlp.utils import encode_hex, ascii_chr, str_to_bytes
@@ -53,19 +55,23 @@ NONE = 0
 VERIFYING = -1
 ZERO_ENCODED = encode_int(0)
 
-proving = False
 
-
-class ProofConstructor:
+class ProofConstructor(threading.local):
+    '''
+    Records nodes read from tries for proofs, proofs are recorded
+    separately in every thread
+    '''
 
     def __init__(self):
         self.mode = []
         self.nodes = []
         self.exempt = []
 
+    @property
+    def proving(self):
+        return bool(self.mode)
+
     def push(self, mode, nodes=None):
-        global proving
-        proving = True
         self.mode.append(mode)
         self.exempt.append(set())
         if mode == VERIFYING:
@@ -75,12 +81,9 @@ class ProofConstructor:
             self.nodes.append(set())
 
     def pop(self):
-        global proving
         self.mode.pop()
         self.nodes.pop()
         self.exempt.pop()
-        if not self.mode:
-            proving = False
 
     def get_nodelist(self):
         return list(map(rlp.decode, list(self.nodes[-1])))
@@ -215,14 +218,28 @@ def transient_trie_exception(*args):
 
 class Trie:
 
-    def __init__(self, db: BaseDB, root_hash=BLANK_ROOT, transient=False):
+    def __init__(self, db: BaseDB, root_hash=BLANK_ROOT, transient=False,
+                 deferred=False, node_cache_size=0):
         '''it also present a dictionary like interface
 
         :param db key value database
         :root: blank or trie node in form of [key, value] or [v0,v1..v15,v]
+        :param deferred: keep nodes changed by updates and deletes in memory
+        and hash and store them only when the root hash is needed
+        :param node_cache_size: max number of decoded stored nodes which are
+        cached for reads
         '''
         self._db = db  # Pass in a database object directly
         self.transient = transient
+        self.deferred = deferred
+        # Whether the root node has children which are not hashed and stored
+        self._has_dirty_nodes = False
+        # LRU of decoded stored nodes keyed by their hashes, stored nodes
+        # never change as they are addressed by hashes of their content
+        self._node_cache = OrderedDict()
+        self.node_cache_size = node_cache_size
+        self.node_cache_hits = 0
+        self.node_cache_misses = 0
         if self.transient:
             self.update = self.get = self.delete = transient_trie_exception
         self.set_root_hash(root_hash)
@@ -232,8 +249,7 @@ class Trie:
 
     # For SPV proof production/verification purposes
     def spv_grabbing(self, node):
-        global proving
-        if not proving:
+        if not proof.proving:
             pass
         elif proof.get_mode() == RECORDING:
             proof.add_node(copy.copy(node))
@@ -244,8 +260,7 @@ class Trie:
                 raise InvalidSPVProof("Proof invalid!")
 
     def spv_storing(self, node):
-        global proving
-        if not proving:
+        if not proof.proving:
             pass
         elif proof.get_mode() == RECORDING:
             proof.add_exempt(copy.copy(node))
@@ -264,6 +279,7 @@ class Trie:
         if self.root_node == BLANK_NODE:
             return BLANK_ROOT
         assert isinstance(self.root_node, list)
+        self._store_dirty_nodes()
         val = rlp_encode(self.root_node)
         key = sha3(val)
         self.spv_grabbing(self.root_node)
@@ -274,6 +290,7 @@ class Trie:
         self._delete_node_storage(old_node, is_root=True)
         self._encode_node(new_node, is_root=True)
         self.root_node = new_node
+        self._has_dirty_nodes = False
         # sys.stderr.write('nrh: %s\n' % encode_hex(self.root_hash))
 
     @root_hash.setter
@@ -288,6 +305,7 @@ class Trie:
         if self.transient:
             self.transient_root_hash = root_hash
             return
+        self._has_dirty_nodes = False
         if root_hash == BLANK_ROOT:
             self.root_node = BLANK_NODE
             return
@@ -335,6 +353,18 @@ class Trie:
     def _encode_node(self, node, is_root=False):
         if node == BLANK_NODE:
             return BLANK_NODE
+        if self.deferred:
+            # Changed nodes are kept in their parents as is until the root
+            # is encoded
+            if not is_root:
+                return node
+            nodes = []
+            self._hash_dirty_children(node, nodes)
+            rlpnode = rlp_encode(node)
+            hashkey = sha3(rlpnode)
+            nodes.append((hashkey, rlpnode))
+            self._db.inc_refcount_batch(nodes)
+            return hashkey
         # assert isinstance(node, list)
         rlpnode = rlp_encode(node)
         if len(rlpnode) < 32 and not is_root:
@@ -344,6 +374,37 @@ class Trie:
         self._db.inc_refcount(hashkey, rlpnode)
         return hashkey
 
+    def _hash_dirty_children(self, node, nodes):
+        '''replace children of the node kept in memory with their hashes
+        unless they are small enough to be embedded
+
+        :param nodes: list to add (hash, rlp encoded node) pairs of nodes
+        which need to be stored
+        '''
+        node_type = self._get_node_type(node)
+        if node_type == NODE_TYPE_BRANCH:
+            indexes = range(16)
+        elif node_type == NODE_TYPE_EXTENSION:
+            indexes = (1,)
+        else:
+            return
+        for i in indexes:
+            child = node[i]
+            if not isinstance(child, list):
+                continue
+            self._hash_dirty_children(child, nodes)
+            rlpnode = rlp_encode(child)
+            if len(rlpnode) >= 32:
+                hashkey = sha3(rlpnode)
+                nodes.append((hashkey, rlpnode))
+                node[i] = hashkey
+
+    def _store_dirty_nodes(self):
+        '''hash and store nodes changed since the root was last encoded'''
+        if self._has_dirty_nodes:
+            self._encode_node(self.root_node, is_root=True)
+            self._has_dirty_nodes = False
+
     def _decode_to_node(self, encoded):
         if encoded == BLANK_NODE:
             return BLANK_NODE
@@ -353,9 +414,76 @@ class Trie:
         self.spv_grabbing(o)
         return o
 
+    def _decode_to_node_for_read(self, encoded):
+        '''same as `_decode_to_node` but stored nodes are taken from the
+        node cache, so the returned node must not be changed
+        '''
+        if not self.node_cache_size or not is_string(encoded) or \
+                encoded == BLANK_NODE:
+            return self._decode_to_node(encoded)
+        o = self._get_stored_node(encoded)
+        self.spv_grabbing(o)
+        return o
+
+    def _get_stored_node(self, node_hash):
+        '''decoded node with the given hash, taken from the node cache if
+        it's enabled, so the returned node must not be changed
+        '''
+        if not self.node_cache_size:
+            return rlp.decode(self._db.get(node_hash))
+        key = bytes(node_hash)
+        o = self._node_cache.get(key)
+        if o is not None:
+            self._node_cache.move_to_end(key)
+            self.node_cache_hits += 1
+            return o
+        self.node_cache_misses += 1
+        o = rlp.decode(self._db.get(key))
+        self._node_cache[key] = o
+        if len(self._node_cache) > self.node_cache_size:
+            self._node_cache.popitem(last=False)
+        return o
+
     def _get_inner_node_from_extension(self, node):
         return self._decode_to_node(node[1])
 
+    def iter_stored_nodes(self, root_hash=None):
+        ''' iterate over nodes of the trie with the given root which are
+        stored in db (small nodes are embedded into their parents)
+
+        :return: (hash, rlp encoded node) pairs
+        '''
+        root_hash = self.root_hash if root_hash is None else root_hash
+        if root_hash == BLANK_ROOT:
+            return
+        seen = set()
+        refs = [root_hash]
+        while refs:
+            ref = refs.pop()
+            if isinstance(ref, list):
+                node = ref
+            elif bytes(ref) in seen:
+                continue
+            else:
+                ref = bytes(ref)
+                seen.add(ref)
+                encoded = bytes(self._db.get(ref))
+                yield ref, encoded
+                node = rlp.decode(encoded)
+            refs.extend(self._child_refs(node))
+
+    @staticmethod
+    def _child_refs(node):
+        ''' get references to children of the node, they are either hashes
+        of stored nodes or embedded nodes
+        '''
+        node_type = Trie._get_node_type(node)
+        if node_type == NODE_TYPE_BRANCH:
+            return [item for item in node[:16] if item != BLANK_NODE]
+        if node_type == NODE_TYPE_EXTENSION:
+            return [node[1]]
+        return []
+
     @staticmethod
     def _get_node_type(node):
         ''' get node type and content
@@ -391,7 +519,7 @@ class Trie:
             # already reach the expected node
             if not key:
                 return node[-1]
-            sub_node = self._decode_to_node(node[key[0]])
+            sub_node = self._decode_to_node_for_read(node[key[0]])
             return self._get(sub_node, key[1:])
 
         # key value node
@@ -402,7 +530,7 @@ class Trie:
         if node_type == NODE_TYPE_EXTENSION:
             # traverse child nodes
             if starts_with(key, curr_key):
-                sub_node = self._get_inner_node_from_extension(node)
+                sub_node = self._decode_to_node_for_read(node[1])
                 return self._get(sub_node, key[len(curr_key):])
             else:
                 return BLANK_NODE
@@ -495,6 +623,8 @@ class Trie:
             return self._update_kv_node(node, key, value)
 
     def _update_and_delete_storage(self, node, key, value):
+        if self.deferred:
+            return self._update(node, key, value)
         # sys.stderr.write('uds_start %r\n' % node)
         old_node = copy.deepcopy(node)
         new_node = self._update(node, key, value)
@@ -667,7 +797,7 @@ class Trie:
         '''delete storage
         :param node: node in form of list, or BLANK_NODE
         '''
-        if node == BLANK_NODE:
+        if node == BLANK_NODE or self.deferred:
             return
         # assert isinstance(node, list)
         encoded = rlp_encode(node)
@@ -745,6 +875,8 @@ class Trie:
         assert False
 
     def _delete_and_delete_storage(self, node, key):
+        if self.deferred:
+            return self._delete(node, key)
         # sys.stderr.write('dds_start %r\n' % node)
         old_node = copy.deepcopy(node)
         new_node = self._delete(node, key)
@@ -842,6 +974,11 @@ class Trie:
         # if len(key) > 32:
         #     raise Exception("Max key length is 32")
 
+        if self.deferred:
+            self.root_node = self._delete(self.root_node,
+                                          bin_to_nibbles(to_string(key)))
+            self._has_dirty_nodes = True
+            return
         old_root = copy.deepcopy(self.root_node)
         self.root_node = self._delete_and_delete_storage(
             self.root_node,
@@ -1020,6 +1157,12 @@ class Trie:
 
         # if value == '':
         #     return self.delete(key)
+        if self.deferred:
+            self.root_node = self._update(self.root_node,
+                                          bin_to_nibbles(to_string(key)),
+                                          to_string(value))
+            self._has_dirty_nodes = True
+            return
         old_root = copy.deepcopy(self.root_node)
         self.root_node = self._update_and_delete_storage(
             self.root_node,
@@ -1027,6 +1170,106 @@ class Trie:
             to_string(value))
         self.replace_root_hash(old_root, self.root_node)
 
+    def build_from_sorted(self, items, batch_size=10000):
+        '''build an empty trie bottom-up from (key, value) pairs sorted by
+        key, every node is hashed and stored once when all keys under it
+        are seen, instead of being stored again for every key updated
+        below it. The trie is the same as the one built by `update`s.
+
+        :param items: iterable of (key, value) strings sorted by key
+        without duplicates
+        :param batch_size: number of nodes stored in one db write
+        '''
+        if self.root_node != BLANK_NODE:
+            raise LogicError('Only an empty trie can be built from sorted items')
+        nodes = []
+        # Branches on the path of the previous key, every one is
+        # (nibble index it branches at, path to it, node)
+        branches = []
+        # The last subtree which is not yet added to its parent, it's
+        # either a leaf of the previous key or the deepest closed branch
+        pending = None
+        prev_key = None
+        for key, value in items:
+            if not is_string(key) or not is_string(value):
+                raise PlenumTypeError('item', (key, value), bytes)
+            key = bin_to_nibbles(to_string(key))
+            value = to_string(value)
+            if prev_key is None:
+                prev_key = key
+                pending = (key, value)
+                continue
+            if key <= prev_key:
+                raise PlenumValueError('items', key, 'sorted by key without duplicates')
+            common = 0
+            for a, b in zip(prev_key, key):
+                if a != b:
+                    break
+                common += 1
+            # Subtrees below the nibble where keys differ are complete
+            while branches and branches[-1][0] > common:
+                branch = branches.pop()
+                self._add_built_child(branch, pending, nodes)
+                pending = branch
+            if not branches or branches[-1][0] < common:
+                branches.append((common, key[:common], [BLANK_NODE] * 17))
+            self._add_built_child(branches[-1], pending, nodes)
+            pending = (key, value)
+            prev_key = key
+            if len(nodes) >= batch_size:
+                self._db.inc_refcount_batch(nodes)
+                nodes = []
+        if pending is None:
+            return
+        while branches:
+            branch = branches.pop()
+            self._add_built_child(branch, pending, nodes)
+            pending = branch
+        root = self._built_subtree_node(pending, 0, nodes)
+        rlpnode = rlp_encode(root)
+        nodes.append((sha3(rlpnode), rlpnode))
+        self._db.inc_refcount_batch(nodes)
+        self.root_node = root
+        self._has_dirty_nodes = False
+
+    def _add_built_child(self, branch, child, nodes):
+        '''add a complete subtree to its parent branch for
+        `build_from_sorted`, subtrees are either (key nibbles, value) of
+        a leaf or (nibble index, path, node) of a branch
+        '''
+        depth, _, node = branch
+        if len(child) == 2 and len(child[0]) == depth:
+            node[16] = child[1]
+            return
+        path = child[0] if len(child) == 2 else child[1]
+        node[path[depth]] = self._built_node_ref(
+            self._built_subtree_node(child, depth + 1, nodes), nodes)
+
+    def _built_subtree_node(self, child, start, nodes):
+        '''node of a complete subtree for `build_from_sorted` starting at
+        the nibble index `start` of its path, a branch deeper than that is
+        put under an extension node
+        '''
+        if len(child) == 2:
+            key, value = child
+            return [pack_nibbles(with_terminator(key[start:])), value]
+        depth, path, node = child
+        if depth == start:
+            return node
+        return [pack_nibbles(path[start:depth]), self._built_node_ref(node, nodes)]
+
+    @staticmethod
+    def _built_node_ref(node, nodes):
+        '''embed the node into its parent if it's small, otherwise add it
+        to nodes to store and refer to it by hash
+        '''
+        rlpnode = rlp_encode(node)
+        if len(rlpnode) < 32:
+            return node
+        hashkey = sha3(rlpnode)
+        nodes.append((hashkey, rlpnode))
+        return hashkey
+
     def root_hash_valid(self):
         if self.root_hash == BLANK_ROOT:
             return True
@@ -1042,6 +1285,8 @@ class Trie:
         return self._get(root_node, bin_to_nibbles(to_string(key)))
 
     def produce_spv_proof(self, key, root=None, get_value=False):
+        if root is None:
+            self._store_dirty_nodes()
         root = root if root is not None else self.root_node
         proof.push(RECORDING)
         rv = self.get_at(root, key)
@@ -1052,6 +1297,8 @@ class Trie:
 
     def produce_spv_proof_for_keys_with_prefix(self, key_prfx, root=None, get_value=False):
         # Return a proof for keys in the trie with the given prefix.
+        if root is None:
+            self._store_dirty_nodes()
         root = root if root is not None else self.root_node
         proof.push(RECORDING)
         seen_prfx = []
@@ -1073,6 +1320,98 @@ class Trie:
         proof.pop()
         return (o, rv) if get_value else o
 
+    def produce_spv_proofs(self, keys, root=None):
+        '''
+        Find proofs for several keys at the same root in one walk over the
+        trie, so nodes on common prefixes of keys are read once. Nodes are
+        collected explicitly, so unlike `produce_spv_proof` this doesn't
+        depend on proof recording state.
+
+        :return: dict of key -> (nodes read from db to get the key, value)
+        '''
+        if root is None:
+            self._store_dirty_nodes()
+        root = root if root is not None else self.root_node
+        proofs = {key: [] for key in keys}
+        values = {}
+        self._collect_proof_nodes(root,
+                                  [(key, bin_to_nibbles(to_string(key))) for key in proofs],
+                                  proofs, values)
+        return {key: (nodes, values[key] if values[key] != BLANK_NODE else None)
+                for key, nodes in proofs.items()}
+
+    def _collect_proof_nodes(self, node, items, proofs, values):
+        ''' walk the trie like `_get` does for several keys at once
+
+        :param items: (key, remaining nibbles of key) pairs of keys which
+        paths go through the node
+        '''
+        node_type = self._get_node_type(node)
+
+        if node_type == NODE_TYPE_BLANK:
+            for key, _ in items:
+                values[key] = BLANK_NODE
+            return
+
+        if node_type == NODE_TYPE_BRANCH:
+            sub_items = {}
+            for key, nibbles in items:
+                if not nibbles:
+                    values[key] = node[-1]
+                else:
+                    sub_items.setdefault(nibbles[0], []).append((key, nibbles[1:]))
+            for i, items_of_sub_node in sub_items.items():
+                sub_node = self._get_proof_node(node[i], items_of_sub_node, proofs)
+                self._collect_proof_nodes(sub_node, items_of_sub_node, proofs, values)
+            return
+
+        curr_key = key_nibbles_from_key_value_node(node)
+        if node_type == NODE_TYPE_LEAF:
+            for key, nibbles in items:
+                values[key] = node[1] if nibbles == curr_key else BLANK_NODE
+            return
+
+        if node_type == NODE_TYPE_EXTENSION:
+            items_of_sub_node = []
+            for key, nibbles in items:
+                if starts_with(nibbles, curr_key):
+                    items_of_sub_node.append((key, nibbles[len(curr_key):]))
+                else:
+                    values[key] = BLANK_NODE
+            if items_of_sub_node:
+                sub_node = self._get_proof_node(node[1], items_of_sub_node, proofs)
+                self._collect_proof_nodes(sub_node, items_of_sub_node, proofs, values)
+
+    def _get_proof_node(self, encoded, items, proofs):
+        # Nodes embedded into their parents are not a part of proofs
+        if encoded == BLANK_NODE or isinstance(encoded, list):
+            return encoded
+        node = self._get_stored_node(encoded)
+        for key, _ in items:
+            proofs[key].append(node)
+        return node
+
+    def generate_state_proofs(self, keys, root=None, serialize=False, get_value=False):
+        '''
+        Generate proofs for several keys at the same root, see
+        `produce_spv_proofs`
+
+        :return: dict of key -> proof (or (proof, value) if `get_value`)
+        '''
+        if root is None:
+            self._store_dirty_nodes()
+        root = root if root is not None else self.root_node
+        proofs = self.produce_spv_proofs(keys, root)
+        if not serialize:
+            root = copy.deepcopy(root)
+        rv = {}
+        for key, (nodes, value) in proofs.items():
+            pf = nodes + [root]
+            if serialize:
+                pf = self.serialize_proof(pf)
+            rv[key] = (pf, value) if get_value else pf
+        return rv
+
     def generate_state_proof(self, key, root=None, serialize=False, get_value=False):
         # NOTE: The method `produce_spv_proof` is not deliberately modified
         return self._generate_state_proof(key, self.produce_spv_proof,
@@ -1086,6 +1425,8 @@ class Trie:
                                           get_value=get_value)
 
     def _generate_state_proof(self, path, func, root=None, serialize=False, **kwargs):
+        if root is None:
+            self._store_dirty_nodes()
         root = root if root is not None else self.root_node
         rv = func(path, root, **kwargs)
         has_val = isinstance(rv, tuple) and len(rv) == 2
@@ -1,3 +1,6 @@
+from array import array
+from io import BytesIO
+
 from storage.binary_file_store import BinaryFileStore
 from common.serializers.stream_serializer import StreamSerializer
 
@@ -28,3 +31,22 @@ class BinarySerializerBasedFileStore(BinaryFileStore):
 
     def _append_new_line_if_req(self):
         pass
+
+    def _build_line_offsets(self):
+        # Serialized records have no separators, so offsets are found by
+        # serializing records back, which gives the stored bytes only if
+        # serialization is canonical
+        data = self._read_file()
+        offsets = array('Q')
+        start = 0
+        for line in self.serializer.get_lines(BytesIO(data)):
+            serialized = self.serializer.serialize(line)
+            end = start + len(serialized)
+            if data[start:end] != serialized:
+                return None
+            offsets.extend((start, end))
+            start = end
+        return offsets if start == len(data) else None
+
+    def _decode_line(self, data: bytes):
+        return self.serializer.deserialize(data)
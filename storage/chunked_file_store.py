@@ -1,5 +1,6 @@
 import os
 import shutil
+from collections import OrderedDict
 
 from storage.kv_store_file import KeyValueStorageFile
 from storage.text_file_store import TextFileStore
@@ -18,6 +19,11 @@ class ChunkedFileStore(KeyValueStorageFile):
 
     Every instance of ChunkedFileStore maintains its own directory for
     storing the chunked data files.
+
+    Size of the store is counted once on open and then tracked by `put`.
+    Chunks read by `get` stay open (up to `openChunksLimit` least recently
+    used ones) with offsets of their lines, so a value is read without
+    scanning its chunk. Offsets of a chunk are dropped when it is closed.
     """
 
     firstChunkIndex = 1
@@ -42,11 +48,13 @@ class ChunkedFileStore(KeyValueStorageFile):
                  chunkSize: int=1000,
                  ensureDurability: bool=True,
                  chunk_creator=None,
-                 open=True):
+                 open=True,
+                 openChunksLimit: int=16):
         """
 
         :param chunkSize: number of items in one chunk. Cannot be lower then number of items in defaultFile
         :param chunkStoreConstructor: constructor of store for single chunk
+        :param openChunksLimit: number of chunks kept open for reading
         """
 
         super().__init__(dbDir,
@@ -61,6 +69,9 @@ class ChunkedFileStore(KeyValueStorageFile):
         self.dataDir = os.path.join(dbDir, dbName)  # chunk files destination
         self.currentChunk = None  # type: KeyValueStorageFile
         self.currentChunkIndex = None  # type: int
+        self.openChunksLimit = openChunksLimit
+        self._openChunks = OrderedDict()  # type: OrderedDict[int, KeyValueStorageFile]
+        self._size = None  # type: int
 
         # TODO: fix chunk_creator support
         def default_chunk_creator(name):
@@ -88,6 +99,7 @@ class ChunkedFileStore(KeyValueStorageFile):
             raise ValueError("Transactions file {} is not directory"
                              .format(self.db_path))
         self._useLatestChunk()
+        self._size = self._count_size()
 
     def _useLatestChunk(self) -> None:
         """
@@ -142,6 +154,29 @@ class ChunkedFileStore(KeyValueStorageFile):
         return self._chunkCreator(
             ChunkedFileStore._chunkIndexToFileName(index))
 
+    def _getChunk(self, index) -> KeyValueStorageFile:
+        """
+        Get chunk for reading, the chunk is kept open for next reads
+
+        :param index: chunk index
+        :return: opened chunk
+        """
+        if index == self.currentChunkIndex:
+            return self.currentChunk
+        chunk = self._openChunks.pop(index, None)
+        if chunk is None:
+            chunk = self._openChunk(index)
+            if len(self._openChunks) >= self.openChunksLimit:
+                _, evicted = self._openChunks.popitem(last=False)
+                evicted.close()
+        self._openChunks[index] = chunk
+        return chunk
+
+    def _closeOpenChunks(self):
+        for chunk in self._openChunks.values():
+            chunk.close()
+        self._openChunks.clear()
+
     def _get_key_location(self, key) -> (int, int):
         """
         Return chunk no and 1-based offset of key
@@ -164,6 +199,7 @@ class ChunkedFileStore(KeyValueStorageFile):
             self.itemNum = 1
         self.itemNum += 1
         self.currentChunk.put(key, value)
+        self._size += 1
 
     def get(self, key) -> str:
         """
@@ -171,11 +207,16 @@ class ChunkedFileStore(KeyValueStorageFile):
 
         :return: value corresponding to specified key
         """
-        # TODO: get is creating files when a key is given which is more than
-        # the store size
+        if not 1 <= int(key) <= self.size:
+            raise KeyError("'{}' doesn't contain {} key".format(self.dataDir, key))
         chunk_no, offset = self._get_key_location(key)
-        with self._openChunk(chunk_no) as chunk:
+        chunk = self._getChunk(chunk_no)
+        if not self.isLineNoKey:
             return chunk.get(str(offset))
+        line = chunk.get_line(offset)
+        if line is None:
+            raise KeyError("'{}' doesn't contain {} key".format(self.dataDir, key))
+        return chunk._parse_line(line, returnKey=False, key=str(offset))
 
     def reset(self) -> None:
         """
@@ -185,6 +226,7 @@ class ChunkedFileStore(KeyValueStorageFile):
         for f in os.listdir(self.dataDir):
             os.remove(os.path.join(self.dataDir, f))
         self._useLatestChunk()
+        self._size = 0
 
     def drop(self):
         self.reset()
@@ -207,11 +249,13 @@ class ChunkedFileStore(KeyValueStorageFile):
         return self.currentChunk._parse_line(line, prefix, returnKey, returnValue, key)
 
     def close(self):
+        self._closeOpenChunks()
         if self.currentChunk is not None:
             self.currentChunk.close()
         self.currentChunk = None
         self.currentChunkIndex = None
         self.itemNum = None
+        self._size = None
 
     def _listChunks(self):
         """
@@ -291,6 +335,11 @@ class ChunkedFileStore(KeyValueStorageFile):
 
     @property
     def size(self) -> int:
+        if self._size is None:
+            return self._count_size()
+        return self._size
+
+    def _count_size(self) -> int:
         """
         This will iterate only over the last chunk since the name of the last
         chunk indicates how many lines in total exist in all other chunks
@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from typing import List
+
+
+class GroupCommit:
+    """
+    Collects writes to several RocksDB storages into a write batch per
+    storage and writes the batches together, so that a group of changes
+    (like an ordered 3PC batch) costs one write per storage.
+
+    Batches are written one storage after another in the order the
+    storages were added. If the process crashes while batches are being
+    written, every storage either has all writes of the group or none of
+    them and a storage never has a group which some storage added before it
+    doesn't have. Write-ahead logs are fsynced every `fsync_period` groups,
+    only fsynced groups keep this guarantee if OS crashes. 0 means that
+    fsync is left to OS like for single writes.
+    """
+
+    def __init__(self, fsync_period: int = 0):
+        self.fsync_period = fsync_period
+        self._storages = []  # type: List['KeyValueStorageRocksdb']
+        self._depth = 0
+        self._groups = 0
+
+    @property
+    def storages(self) -> List['KeyValueStorageRocksdb']:
+        return self._storages
+
+    @property
+    def in_progress(self) -> bool:
+        return self._depth > 0
+
+    def add_storage(self, storage: 'KeyValueStorageRocksdb'):
+        if storage in self._storages:
+            return
+        self._storages.append(storage)
+        if self.in_progress:
+            storage.start_write_batch()
+
+    def begin(self):
+        """
+        Start collecting writes, nested groups become a part of the
+        outermost one
+        """
+        if self._depth == 0:
+            for storage in self._storages:
+                storage.start_write_batch()
+        self._depth += 1
+
+    def commit(self):
+        """
+        Write collected writes if this is the outermost group
+        """
+        if self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        self._groups += 1
+        sync = self.fsync_period > 0 and self._groups % self.fsync_period == 0
+        for storage in self._storages:
+            self._flush(storage, sync)
+
+    def _flush(self, storage: 'KeyValueStorageRocksdb', sync: bool):
+        storage.flush_write_batch(sync=sync)
+
+    @contextmanager
+    def group(self):
+        """
+        Collect writes made in the block and write them at exit. Writes are
+        written on exceptions too, as they would be without grouping.
+        """
+        self.begin()
+        try:
+            yield
+        finally:
+            self.commit()
@@ -73,6 +73,16 @@ class KeyValueStorageFile(KeyValueStorage):
         raise KeyError("'{}' doesn't contain {} key".format(
             self.db_file, str(key)))
 
+    def get_line(self, line_no: int):
+        """
+        Return the line with the given 1-based number or None if there is
+        no such line
+        """
+        for i, line in enumerate(self._lines(), start=1):
+            if i == line_no:
+                return line
+        return None
+
     def get_last_key(self):
         result = None
         for result, _ in self.iterator():
@@ -1,6 +1,7 @@
 import os
+import threading
 
-from typing import Iterable, Tuple
+from typing import Iterable, Tuple, Optional
 
 import shutil
 from storage.kv_store import KeyValueStorage
@@ -20,6 +21,13 @@ class KeyValueStorageRocksdb(KeyValueStorage):
         self._read_only = read_only
         self._db = None
         self._db_config = db_config
+        # Writes are collected into the write batch while it is started,
+        # written keys are also kept in `_pending` (None for removed keys)
+        # so that reads by key see them. Only the thread which started the
+        # write batch sees them, other threads read what is written to DB
+        self._write_batch = None  # type: Optional[rocksdb.WriteBatch]
+        self._write_batch_thread = None
+        self._pending = {}
         if open:
             self.open()
 
@@ -102,36 +110,90 @@ class KeyValueStorageRocksdb(KeyValueStorage):
     def closed(self):
         return self._db is None
 
+    @property
+    def in_write_batch(self) -> bool:
+        return self._write_batch is not None
+
+    def start_write_batch(self):
+        """
+        Collect all following writes into a write batch which is written
+        to DB at once by `flush_write_batch`
+        """
+        if self._write_batch is None:
+            self._write_batch = rocksdb.WriteBatch()
+            self._write_batch_thread = threading.get_ident()
+
+    def flush_write_batch(self, sync=False):
+        """
+        Write collected writes to DB and stop collecting them
+
+        :param sync: whether to fsync write-ahead log of DB
+        """
+        batch = self._write_batch
+        self._write_batch = None
+        self._pending = {}
+        if batch is not None and batch.count() > 0:
+            self._db.write(batch, sync=sync)
+
+    def _check_not_in_write_batch(self):
+        # Iterators don't see writes in a write batch and writing the batch
+        # before iterating would write a part of a group, so iterating is
+        # not allowed to the thread collecting writes
+        if self._write_batch is not None and self._write_batch_thread == threading.get_ident():
+            raise RuntimeError("{} can't be iterated while writes are collected "
+                               "into a write batch".format(self))
+
     def put(self, key, value):
         key = self.to_byte_repr(key)
         value = self.to_byte_repr(value)
-        self._db.put(key, value)
+        if self._write_batch is not None:
+            self._write_batch.put(key, value)
+            self._pending[key] = value
+        else:
+            self._db.put(key, value)
+
+    def _visible_pending(self) -> dict:
+        return self._pending if self._write_batch_thread == threading.get_ident() else {}
 
     def get(self, key):
         key = self.to_byte_repr(key)
-        vv = self._db.get(key)
+        pending = self._visible_pending()
+        if key in pending:
+            vv = pending[key]
+        else:
+            vv = self._db.get(key)
         if vv is None:
             raise KeyError
         return vv
 
     def remove(self, key):
         key = self.to_byte_repr(key)
-        self._db.delete(key)
+        if self._write_batch is not None:
+            self._write_batch.delete(key)
+            self._pending[key] = None
+        else:
+            self._db.delete(key)
 
     def setBatch(self, batch: Iterable[Tuple]):
-        b = rocksdb.WriteBatch()
+        b = self._write_batch if self._write_batch is not None else rocksdb.WriteBatch()
         for key, value in batch:
             key = self.to_byte_repr(key)
             value = self.to_byte_repr(value)
             b.put(key, value)
-        self._db.write(b, sync=False)
+            if self._write_batch is not None:
+                self._pending[key] = value
+        if self._write_batch is None:
+            self._db.write(b, sync=False)
 
     def close(self):
+        self.flush_write_batch()
         del self._db
         self._db = None
         removeLockFiles(self._db_path)
 
     def drop(self):
+        self._write_batch = None
+        self._pending = {}
         self.close()
         shutil.rmtree(self._db_path)
 
@@ -142,6 +204,7 @@ class KeyValueStorageRocksdb(KeyValueStorage):
     def iterator(self, start=None, end=None, include_key=True, include_value=True, prefix=None):
         start = self.to_byte_repr(start) if start is not None else None
         end = self.to_byte_repr(end) if end is not None else None
+        self._check_not_in_write_batch()
 
         #  TODO: Figure out why this does not work
         # opts = {}
@@ -174,6 +237,9 @@ class KeyValueStorageRocksdb(KeyValueStorage):
 
     def has_key(self, key):
         key = self.to_byte_repr(key)
+        pending = self._visible_pending()
+        if key in pending:
+            return pending[key] is not None
         return self._db.key_may_exist(key)[0]
 
     @staticmethod
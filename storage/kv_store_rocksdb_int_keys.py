@@ -32,6 +32,7 @@ class KeyValueStorageRocksdbIntKeys(KeyValueStorageRocksdb):
         #    Previous if key does not exist in Db, but there is key less than required
 
         key = self.to_byte_repr(key)
+        self._check_not_in_write_batch()
         itr = self._db.itervalues()
         itr.seek_for_prev(key)
         try:
@@ -41,6 +42,7 @@ class KeyValueStorageRocksdbIntKeys(KeyValueStorageRocksdb):
         return value
 
     def get_last_key(self):
+        self._check_not_in_write_batch()
         itr = self._db.iterkeys()
         itr.seek_to_last()
         try:
@@ -1,5 +1,7 @@
 import os
+from array import array
 from hashlib import sha256
+from typing import Optional
 
 from storage.kv_store_file import KeyValueStorageFile
 
@@ -17,6 +19,10 @@ class SingleFileStore(KeyValueStorageFile):
                  open=True):
         self.delimiter = delimiter
         self.lineSep = lineSep
+        # Start and end byte offsets of lines in the file one after another,
+        # built on first random access and extended by `put`
+        self._line_offsets = None  # type: Optional[array]
+        self._can_find_lines_by_offsets = True
         super().__init__(dbDir,
                          dbName,
                          isLineNoKey,
@@ -25,6 +31,8 @@ class SingleFileStore(KeyValueStorageFile):
                          open=open)
 
     def put(self, key, value):
+        line_start = self._file_size() if self._line_offsets is not None else None
+
         # If line no is not treated as key then write the key and then the
         # delimiter
         if not self.isLineNoKey:
@@ -56,7 +64,66 @@ class SingleFileStore(KeyValueStorageFile):
             # orders of magnitude. See testMeasureWriteTime
             os.fsync(self.db_file.fileno())
 
+        if line_start is not None:
+            line_end = self._file_size() - len(self._line_sep_bytes)
+            if line_end > line_start:
+                self._line_offsets.extend((line_start, line_end))
+
+    def get_line(self, line_no: int):
+        if self._line_offsets is None and self._can_find_lines_by_offsets:
+            self._line_offsets = self._build_line_offsets()
+            self._can_find_lines_by_offsets = self._line_offsets is not None
+        if self._line_offsets is None:
+            return super().get_line(line_no)
+        if not 1 <= line_no <= len(self._line_offsets) // 2:
+            return None
+        start, end = self._line_offsets[2 * line_no - 2], self._line_offsets[2 * line_no - 1]
+        f = self._binary_file
+        f.seek(start)
+        return self._decode_line(f.read(end - start))
+
+    @property
+    def _binary_file(self):
+        return self.db_file
+
+    @property
+    def _line_sep_bytes(self) -> bytes:
+        return self.lineSep.encode() if isinstance(self.lineSep, str) else self.lineSep
+
+    def _file_size(self) -> int:
+        return os.fstat(self.db_file.fileno()).st_size
+
+    def _read_file(self) -> bytes:
+        f = self._binary_file
+        f.seek(0)
+        return f.read()
+
+    def _build_line_offsets(self):
+        """
+        Find offsets of non empty lines in the file
+
+        :return: start and end offsets of lines one after another or None
+        if lines can't be found by offsets in this file
+        """
+        data = self._read_file()
+        sep = self._line_sep_bytes
+        offsets = array('Q')
+        start = 0
+        while start < len(data):
+            end = data.find(sep, start)
+            if end == -1:
+                end = len(data)
+            if end > start:
+                offsets.extend((start, end))
+            start = end + len(sep)
+        return offsets
+
+    def _decode_line(self, data: bytes):
+        return data
+
     def close(self):
+        self._line_offsets = None
+        self._can_find_lines_by_offsets = True
         self.db_file.close()
 
     @property
@@ -64,6 +131,8 @@ class SingleFileStore(KeyValueStorageFile):
         return self.db_file.closed
 
     def reset(self):
+        self._line_offsets = None
+        self._can_find_lines_by_offsets = True
         self.db_file.truncate(0)
 
     def drop(self):
@@ -117,3 +117,48 @@ def test_get_range(populatedChunkedFileStore):
         for k, v in populatedChunkedFileStore.iterator(
                 start=frm, end=to):
             assert data[int(k) - 1] == v
+
+
+def test_size_is_tracked_on_put_and_reopen(tempdir, populatedChunkedFileStore):
+    store = populatedChunkedFileStore
+    store.put(None, getValue(dataSize + 1))
+    assert store.size == dataSize + 1
+    store.close()
+
+    store = ChunkedFileStore(tempdir, "chunked_data", True, True, chunkSize)
+    assert store.size == dataSize + 1
+    store.reset()
+    assert store.size == 0
+    store.close()
+
+
+def test_get_while_putting(chunkedTextFileStore):
+    store = chunkedTextFileStore
+    for i in range(1, 2 * chunkSize + 2):
+        store.put(None, getValue(i))
+        # Reads from the chunk which is being written to
+        assert store.get(i) == getValue(i)
+        assert store.get(1) == getValue(1)
+    for i in range(1, 2 * chunkSize + 2):
+        assert store.get(i) == getValue(i)
+
+
+def test_get_missing_key(populatedChunkedFileStore):
+    dir_path = populatedChunkedFileStore.dataDir
+    chunks = os.listdir(dir_path)
+    for key in (0, dataSize + 1, dataSize + chunkSize + 1):
+        with pytest.raises(KeyError):
+            populatedChunkedFileStore.get(key)
+    assert os.listdir(dir_path) == chunks
+
+
+def test_open_chunks_are_limited(tempdir):
+    store = ChunkedFileStore(tempdir, "chunked_data", True, True, chunkSize,
+                             openChunksLimit=2)
+    for d in data:
+        store.put(None, d)
+    for key in reversed(range(1, dataSize + 1)):
+        assert store.get(key) == getValue(key)
+        assert len(store._openChunks) <= 2
+    store.close()
+    assert not store._openChunks
@@ -0,0 +1,226 @@
+import multiprocessing
+import os
+import random
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from storage.group_commit import GroupCommit
+from storage.kv_store_rocksdb import KeyValueStorageRocksdb
+from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
+
+STORAGE_NAMES = ['state', 'seq_no_db', 'txn_log', 'audit_txn_log']
+KEYS_PER_GROUP = 10
+
+
+@pytest.fixture()
+def storages(tempdir):
+    storages = [KeyValueStorageRocksdb(tempdir, name) for name in STORAGE_NAMES]
+    yield storages
+    for storage in storages:
+        if not storage.closed:
+            storage.close()
+
+
+@pytest.fixture()
+def group_commit(storages):
+    group_commit = GroupCommit()
+    for storage in storages:
+        group_commit.add_storage(storage)
+    return group_commit
+
+
+def test_writes_are_written_on_commit(storages, group_commit):
+    storage = storages[0]
+    storage.put(b'k0', b'v0')
+
+    with group_commit.group():
+        storage.put(b'k1', b'v1')
+        storage.setBatch([(b'k2', b'v2'), (b'k3', b'v3')])
+        storage.remove(b'k0')
+
+        # Reads by key see written values before they get to DB
+        assert storage.get(b'k1') == b'v1'
+        assert storage.get(b'k3') == b'v3'
+        with pytest.raises(KeyError):
+            storage.get(b'k0')
+        assert storage._db.get(b'k1') is None
+        assert storage._db.get(b'k0') == b'v0'
+
+    assert not storage.in_write_batch
+    assert storage._db.get(b'k1') == b'v1'
+    assert storage._db.get(b'k3') == b'v3'
+    assert storage._db.get(b'k0') is None
+
+
+def test_nested_groups_are_written_with_outermost(storages, group_commit):
+    storage = storages[0]
+    with group_commit.group():
+        with group_commit.group():
+            storage.put(b'k1', b'v1')
+        assert storage._db.get(b'k1') is None
+    assert storage._db.get(b'k1') == b'v1'
+
+
+def test_writes_are_written_on_exception(storages, group_commit):
+    storage = storages[0]
+    with pytest.raises(ValueError):
+        with group_commit.group():
+            storage.put(b'k1', b'v1')
+            raise ValueError
+    assert not group_commit.in_progress
+    assert storage.get(b'k1') == b'v1'
+
+
+def test_iterating_in_group_is_not_allowed(tempdir):
+    storage = KeyValueStorageRocksdbIntKeys(tempdir, 'int_keys')
+    group_commit = GroupCommit()
+    group_commit.add_storage(storage)
+    with group_commit.group():
+        storage.put('1', b'v1')
+        with pytest.raises(RuntimeError):
+            storage.get_last_key()
+        with pytest.raises(RuntimeError):
+            storage.get_equal_or_prev('1')
+        with pytest.raises(RuntimeError):
+            storage.iterator()
+        # Nothing of the group is written before it ends
+        assert storage._db.get(b'1') is None
+    assert storage.get_last_key() == b'1'
+    assert [k for k, _ in storage.iterator()] == [b'1']
+    storage.close()
+
+
+def test_writes_in_group_are_not_seen_by_other_threads(tempdir):
+    storage = KeyValueStorageRocksdbIntKeys(tempdir, 'int_keys')
+    storage.put('1', b'v1')
+    group_commit = GroupCommit()
+    group_commit.add_storage(storage)
+
+    def read():
+        with pytest.raises(KeyError):
+            storage.get('2')
+        assert storage.get_last_key() == b'1'
+        return storage.get('1')
+
+    with group_commit.group():
+        storage.put('2', b'v2')
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(read).result() == b'v1'
+        assert storage.get('2') == b'v2'
+        assert storage._db.get(b'2') is None
+    assert storage.get('2') == b'v2'
+    storage.close()
+
+
+def test_fsync_period(storages):
+    synced = []
+
+    class RecordingGroupCommit(GroupCommit):
+        def _flush(self, storage, sync):
+            synced.append(sync)
+            super()._flush(storage, sync)
+
+    group_commit = RecordingGroupCommit(fsync_period=2)
+    group_commit.add_storage(storages[0])
+    for i in range(4):
+        with group_commit.group():
+            storages[0].put(b'k', str(i).encode())
+    assert synced == [False, True, False, True]
+
+
+class KilledGroupCommit(GroupCommit):
+    """
+    Tells the parent process when it is going to write the given storage
+    in the given group and waits to be killed
+    """
+
+    def __init__(self, conn, kill_group, kill_storage):
+        super().__init__()
+        self._conn = conn
+        self._kill_group = kill_group
+        self._kill_storage = kill_storage
+        self._flushed = 0
+
+    def _flush(self, storage, sync):
+        if self._groups == self._kill_group and self._flushed == self._kill_storage:
+            self._conn.send('flushing')
+            time.sleep(60)
+        self._flushed = (self._flushed + 1) % len(self.storages)
+        super()._flush(storage, sync)
+
+
+def write_groups(db_dir, group_commit):
+    storages = [KeyValueStorageRocksdb(db_dir, name) for name in STORAGE_NAMES]
+    for storage in storages:
+        group_commit.add_storage(storage)
+    group = 0
+    while True:
+        group += 1
+        with group_commit.group():
+            for storage in storages:
+                storage.setBatch([('{}-{}'.format(group, i), b'1') for i in range(KEYS_PER_GROUP)])
+                storage.put(b'last_group', str(group).encode())
+
+
+def write_groups_until_killed(db_dir, kill_group, kill_storage, conn):
+    write_groups(db_dir, KilledGroupCommit(conn, kill_group, kill_storage))
+
+
+def last_written_groups(db_dir):
+    """
+    Check that every storage has either all writes of a group or none of
+    them and return the last group written to every storage
+    """
+    last_groups = []
+    for name in STORAGE_NAMES:
+        storage = KeyValueStorageRocksdb(db_dir, name)
+        try:
+            last_group = int(storage.get(b'last_group'))
+        except KeyError:
+            last_group = 0
+        keys = {bytes(k) for k in storage.iterator(include_value=False)}
+        storage.close()
+        expected = {'{}-{}'.format(g, i).encode()
+                    for g in range(1, last_group + 1) for i in range(KEYS_PER_GROUP)}
+        assert keys - {b'last_group'} == expected
+        last_groups.append(last_group)
+    return last_groups
+
+
+def run_and_kill(target, args, wait_for):
+    process = multiprocessing.Process(target=target, args=args)
+    process.start()
+    try:
+        wait_for()
+    finally:
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+
+
+@pytest.mark.parametrize('kill_storage', range(len(STORAGE_NAMES)))
+def test_crash_during_flush_keeps_storages_consistent(tempdir, kill_storage):
+    kill_group = 5
+    parent_conn, child_conn = multiprocessing.Pipe()
+    run_and_kill(write_groups_until_killed,
+                 (tempdir, kill_group, kill_storage, child_conn),
+                 lambda: parent_conn.poll(30) and parent_conn.recv())
+
+    # Storages before the killed one have the last group
+    assert last_written_groups(tempdir) == \
+        [kill_group] * kill_storage + [kill_group - 1] * (len(STORAGE_NAMES) - kill_storage)
+
+
+def test_crash_at_random_time_keeps_storages_consistent(tempdir):
+    for _ in range(5):
+        run_and_kill(write_groups,
+                     (tempdir, GroupCommit()),
+                     lambda: time.sleep(random.uniform(0.2, 0.5)))
+        last_groups = last_written_groups(tempdir)
+        # Storages written earlier are never behind storages written later
+        assert last_groups == sorted(last_groups, reverse=True)
+        assert last_groups[0] - last_groups[-1] <= 1
+        for name in STORAGE_NAMES:
+            KeyValueStorageRocksdb(tempdir, name).drop()
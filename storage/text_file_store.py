@@ -38,6 +38,13 @@ class TextFileStore(SingleFileStore):
         self.db_file.seek(0)
         return store_utils.cleanLines(self.db_file)
 
+    @property
+    def _binary_file(self):
+        return self.db_file.buffer
+
+    def _decode_line(self, data: bytes):
+        return data.decode(self.db_file.encoding)
+
     def _append_new_line_if_req(self):
         try:
             logging.debug("new line check for file: {}".format(self.db_path))
@@ -23,6 +23,11 @@ MAX_RECONNECT_RETRY_ON_SAME_SOCKET = 1
 # Enables/disables debug mode for Looper class
 LOOPER_DEBUG = False
 
+# Makes Looper wait for I/O and timers of its prodables when idle instead of
+# polling them every 10 ms; LOOPER_MAX_IDLE_TIME (seconds) limits the wait
+LOOPER_EVENT_DRIVEN = False
+LOOPER_MAX_IDLE_TIME = 0.1
+
 # Quotas configuration
 ENABLE_DYNAMIC_QUOTAS = False
 MAX_REQUEST_QUEUE_SIZE = 1000
@@ -60,17 +60,45 @@ class Prodable:
         raise NotImplementedError("subclass {} should implement this method"
                                   .format(self))
 
+    def get_wakeup_fds(self) -> Optional[List[int]]:
+        """
+        File descriptors which become readable when this Prodable may have
+        something to do, used by an event-driven Looper. None means that
+        the Prodable can't tell and has to be polled.
+        """
+        return None
+
+    def has_pending_events(self) -> bool:
+        """
+        Whether this Prodable has something to do right away although
+        `prod` has just processed nothing
+        """
+        return False
+
+    def get_next_wakeup(self) -> Optional[float]:
+        """
+        Time (in terms of `time.perf_counter`) when this Prodable has to be
+        prodded again regardless of I/O, e.g. when its next timer is due.
+        None if there is no such time.
+        """
+        return None
+
 
 class Looper:
     """
     A helper class for asyncio's event_loop
     """
 
+    # how long to sleep when there was nothing to do in polling mode
+    pollInterval = 0.01
+
     def __init__(self,
                  prodables: List[Prodable]=None,
                  loop=None,
                  debug=False,
-                 autoStart=True):
+                 autoStart=True,
+                 event_driven=False,
+                 max_idle_time=0.1):
         """
         Initialize looper with an event loop.
 
@@ -78,6 +106,10 @@ class Looper:
         :param loop: the event loop to use
         :param debug: set_debug on event loop will be set to this value
         :param autoStart: start immediately?
+        :param event_driven: when idle, wait for I/O on descriptors of the
+        prodables or for their next timer instead of sleeping for a fixed time
+        :param max_idle_time: the longest time in seconds an event-driven
+        looper waits without prodding
         """
         self.prodables = list(prodables) if prodables is not None \
             else []  # type: List[Prodable]
@@ -130,6 +162,9 @@ class Looper:
                 logger.debug(
                     "Cannot set handler for {} because {}".format(sigName, e))
 
+        self.event_driven = event_driven  # type: bool
+        self.max_idle_time = max_idle_time  # type: float
+
         self.autoStart = autoStart  # type: bool
         if self.autoStart:
             self.startall()
@@ -205,17 +240,63 @@ class Looper:
         """
         Execute `runOnce` with a small tolerance of 0.01 seconds so that the Prodables
         can complete their other asynchronous tasks not running on the event-loop.
+        An event-driven looper waits for I/O or timers of the Prodables instead.
         """
         start = time.perf_counter()
         msgsProcessed = await self.prodAllOnce()
         if msgsProcessed == 0:
             # if no let other stuff run
-            await asyncio.sleep(0.01, loop=self.loop)
+            if self.event_driven:
+                await self.waitForEvents()
+            else:
+                await asyncio.sleep(self.pollInterval, loop=self.loop)
         dur = time.perf_counter() - start
         if dur >= 15:
             logger.info("it took {:.3f} seconds to run once nicely".
                         format(dur), extra={"cli": False})
 
+    async def waitForEvents(self):
+        """
+        Wait until any Prodable's descriptor becomes readable or its next
+        wakeup time comes, but no longer than `max_idle_time`. Prodables
+        which can't provide descriptors limit the wait to `pollInterval`.
+        """
+        now = time.perf_counter()
+        deadline = now + self.max_idle_time
+        fds = set()
+        for n in self.prodables:
+            prodable_fds = n.get_wakeup_fds()
+            if prodable_fds is None:
+                deadline = min(deadline, now + self.pollInterval)
+                continue
+            if n.has_pending_events():
+                return
+            fds.update(prodable_fds)
+            nxt = n.get_next_wakeup()
+            if nxt is not None:
+                deadline = min(deadline, nxt)
+
+        timeout = deadline - time.perf_counter()
+        if timeout <= 0:
+            await asyncio.sleep(0, loop=self.loop)
+            return
+
+        woken = self.loop.create_future()
+
+        def wakeup():
+            if not woken.done():
+                woken.set_result(None)
+
+        for fd in fds:
+            self.loop.add_reader(fd, wakeup)
+        try:
+            await asyncio.wait_for(woken, timeout, loop=self.loop)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for fd in fds:
+                self.loop.remove_reader(fd)
+
     def runFor(self, timeout):
         self.run(asyncio.sleep(timeout))
 
@@ -1,6 +1,6 @@
 import time
 from abc import abstractmethod, ABCMeta
-from typing import Set
+from typing import Set, Optional, List
 
 from stp_core.common.log import getlogger
 from stp_core.network.exceptions import RemoteNotFound, DuplicateRemotes
@@ -78,6 +78,19 @@ class NetworkInterface(metaclass=ABCMeta):
     def removeRemote(self, r):
         pass
 
+    def get_wakeup_fds(self) -> Optional[List[int]]:
+        """
+        Return file descriptors which become readable when there may be
+        something to receive, None if the stack can only be polled
+        """
+        return None
+
+    def has_pending_messages(self) -> bool:
+        """
+        Check whether there are messages which can be received right away
+        """
+        return False
+
     @abstractmethod
     def transmit(self, msg, uid, timeout=None):
         pass
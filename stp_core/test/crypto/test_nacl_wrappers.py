@@ -0,0 +1,33 @@
+from stp_core.crypto.nacl_wrappers import Signer, Verifier, verify_batch
+
+
+def test_verify_batch_finds_failed_indices():
+    signers = [Signer() for _ in range(3)]
+    items = []
+    for i in range(30):
+        signer = signers[i % len(signers)]
+        msg = 'message {}'.format(i).encode()
+        items.append((signer.signature(msg), msg, signer.verraw))
+
+    assert verify_batch(items) == []
+    assert verify_batch([]) == []
+
+    sig, msg, verkey = items[3]
+    items[3] = (sig, msg + b'!', verkey)
+    sig, msg, verkey = items[7]
+    items[7] = (sig, msg, signers[0].verraw if verkey != signers[0].verraw else signers[1].verraw)
+    sig, msg, verkey = items[11]
+    items[11] = (sig[:-1], msg, verkey)
+    sig, msg, verkey = items[20]
+    items[20] = (sig, msg, b'')
+
+    assert verify_batch(items) == [3, 7, 11, 20]
+
+
+def test_verify_batch_matches_verifier():
+    signer = Signer()
+    verifier = Verifier(signer.verraw)
+    msg = b'some message'
+    sig = signer.signature(msg)
+    for s, m in [(sig, msg), (sig, b'other'), (bytes(64), msg)]:
+        assert verifier.verify(s, m) == (verify_batch([(s, m, signer.verraw)]) == [])
@@ -82,6 +82,12 @@ class SMotor(Motor):
     def stop(self):
         self.stack.stop()
 
+    def get_wakeup_fds(self):
+        return self.stack.get_wakeup_fds()
+
+    def has_pending_events(self):
+        return self.stack.has_pending_messages()
+
 
 def prepStacks(looper, *stacks, connect=True, useKeys=True):
     motors = []
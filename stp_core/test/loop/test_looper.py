@@ -1,3 +1,6 @@
+import os
+import time
+
 import pytest
 import asyncio
 
@@ -9,3 +12,91 @@ def test_hasProdable():
     with pytest.raises(ValueError):
         Looper().hasProdable(Prodable(), 'prodable')
     looper.shutdownSync()
+
+
+class PipeProdable(Prodable):
+    def __init__(self, name, fds=True):
+        self._name = name
+        self._fds = fds
+        self.rfd, self.wfd = os.pipe()
+        os.set_blocking(self.rfd, False)
+        self.prods = 0
+        self.received_at = []
+        self.next_wakeup = None
+
+    @property
+    def name(self):
+        return self._name
+
+    async def prod(self, limit) -> int:
+        self.prods += 1
+        try:
+            data = os.read(self.rfd, 1024)
+        except BlockingIOError:
+            return 0
+        self.received_at.append(time.perf_counter())
+        return len(data)
+
+    def start(self, loop):
+        pass
+
+    def stop(self):
+        os.close(self.rfd)
+        os.close(self.wfd)
+
+    def get_wakeup_fds(self):
+        return [self.rfd] if self._fds else None
+
+    def get_next_wakeup(self):
+        return self.next_wakeup
+
+
+@pytest.fixture()
+def event_looper():
+    looper = Looper(event_driven=True, max_idle_time=1)
+    yield looper
+    looper.shutdownSync()
+
+
+def test_event_driven_looper_does_not_poll_when_idle(event_looper):
+    prodable = PipeProdable('p')
+    event_looper.add(prodable)
+    event_looper.runFor(0.5)
+    assert prodable.prods < 5
+
+
+def test_event_driven_looper_wakes_up_on_io(event_looper):
+    prodable = PipeProdable('p')
+    event_looper.add(prodable)
+    event_looper.runFor(0.1)
+
+    sent_at = []
+
+    def send():
+        sent_at.append(time.perf_counter())
+        os.write(prodable.wfd, b'x')
+
+    event_looper.loop.call_later(0.2, send)
+    event_looper.runFor(0.5)
+    assert len(prodable.received_at) == 1
+    assert prodable.received_at[0] - sent_at[0] < Looper.pollInterval
+
+
+def test_event_driven_looper_wakes_up_at_next_wakeup_time(event_looper):
+    prodable = PipeProdable('p')
+    prodable.next_wakeup = time.perf_counter() + 0.3
+    event_looper.add(prodable)
+    event_looper.runFor(0.2)
+    prods = prodable.prods
+    assert prods < 5
+
+    event_looper.runFor(0.5)
+    # the wakeup stays due, so the prodable is prodded over and over after it
+    assert prodable.prods - prods > 10
+
+
+def test_event_driven_looper_polls_prodables_without_fds(event_looper):
+    prodable = PipeProdable('p', fds=False)
+    event_looper.add(prodable)
+    event_looper.runFor(0.5)
+    assert prodable.prods > 10
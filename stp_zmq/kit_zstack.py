@@ -51,6 +51,11 @@ class KITZStack(simple_zstack_class, KITNetworkInterface):
 
         self._retry_connect = {}
 
+        # Wire protocol announced to remotes, None means JSON only
+        self.wire_protocol = None  # type: Optional[str]
+        # Names of remotes which announced the same wire protocol
+        self.wire_protocol_peers = set()
+
     def maintainConnections(self, force=False):
         """
         Ensure appropriate connections.
@@ -124,6 +129,23 @@ class KITZStack(simple_zstack_class, KITNetworkInterface):
                                format(CONNECTION_PREFIX, self, name, ex))
         return missing
 
+    def handlePingPong(self, msg, frm, ident):
+        if super().handlePingPong(msg, frm, ident):
+            # The remote could have been restarted with another wire protocol,
+            # it is announced again along with the ping or pong
+            self.wire_protocol_peers.discard(frm)
+            return True
+        return False
+
+    def _set_peer_wire_protocol(self, frm, protocol):
+        if self.wire_protocol is not None and protocol == self.wire_protocol \
+                and frm in self.remotes:
+            if frm not in self.wire_protocol_peers:
+                logger.debug("{} uses wire protocol {} with {}".format(self, protocol, frm))
+                self.wire_protocol_peers.add(frm)
+        else:
+            self.wire_protocol_peers.discard(frm)
+
     async def service(self, limit=None, quota: Optional[Quota] = None):
         c = await super().service(limit, quota)
         return c
@@ -3,6 +3,7 @@ import pytest
 from common.exceptions import PlenumTypeError, PlenumValueError
 from stp_core.crypto.util import randomSeed
 from stp_core.loop.eventually import eventually
+from stp_core.loop.looper import Looper
 from stp_core.network.port_dispenser import genHa
 from stp_core.test.helper import Printer, prepStacks, chkPrinted
 from stp_zmq.test.helper import genKeys, create_and_prep_stacks, \
@@ -339,3 +340,48 @@ def test_queue_size_limit_set(tdir, tconf):
     stack.start()
     assert stack.listener.get_hwm() == queue_size
     stack.stop()
+
+
+def test_zstack_communication_with_event_driven_looper(tdir, loop, tconf):
+    with Looper(loop=loop, event_driven=True, max_idle_time=1) as looper:
+        names = ['Alpha', 'Beta']
+        (alpha, beta), (alphaP, betaP) = create_and_prep_stacks(names, tdir,
+                                                                looper, tconf)
+        # the listener and the socket connected to the other stack
+        assert len(alpha.get_wakeup_fds()) == 2
+        assert not alpha.has_pending_messages()
+
+        check_stacks_communicating(looper, (alpha, beta), (alphaP, betaP))
+
+
+def test_zstack_deserializes_received_bytes():
+    assert ZStack.deserializeMsg(b'{"k1": "v1", "k2": [1, 2]}') == {"k1": "v1", "k2": [1, 2]}
+    assert ZStack.deserializeMsg('{"k1": "v1"}') == {"k1": "v1"}
+    assert ZStack.deserializeMsg('{"k1": "м"}'.encode()) == {"k1": "м"}
+    with pytest.raises(ValueError):
+        ZStack.deserializeMsg(b'{"k1": "v1\x9c"}')
+
+
+def test_zstack_deserializes_integers_above_64_bits_with_orjson():
+    pytest.importorskip('orjson')
+    assert ZStack.deserializeMsg(b'{"k1": 123456789012345678901234567890}') == \
+        {"k1": 123456789012345678901234567890}
+    with pytest.raises(ValueError):
+        ZStack.deserializeMsg(b'{"k1": 123456789012345678901234567890')
+
+
+def test_zstack_processes_received_bytes(tdir, tconf):
+    handled = []
+    rejected = []
+    stack = ZStack('Alpha', ha=genHa(), basedirpath=tdir,
+                   msgHandler=handled.append, onlyListener=True,
+                   msgRejectHandler=lambda reason, frm: rejected.append(frm),
+                   seed=randomSeed(), config=tconf)
+    stack.rxMsgs.append((b'{"k1": "v1"}', b'client1'))
+    stack.rxMsgs.append((b'{"k2": "v2\x9c"}', b'client2'))
+    stack.rxMsgs.append((b'{"k3": ', b'client3'))
+    stack.rxMsgs.append(('{"k4": "v4"}', b'client4'))
+
+    assert stack.processReceived(10) == 4
+    assert handled == [({"k1": "v1"}, b'client1'), ({"k4": "v4"}, b'client4')]
+    assert rejected == [b'client2']
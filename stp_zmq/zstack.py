@@ -7,18 +7,41 @@ from stp_core.common.config.util import getConfig
 from stp_core.common.constants import CONNECTION_PREFIX, ZMQ_NETWORK_PROTOCOL
 from stp_zmq.client_message_provider import ClientMessageProvider
 
+import json as std_json
+
 try:
     import ujson as json
 except ImportError:
     import json
 
+try:
+    # orjson parses utf-8 encoded bytes as they are, validating the encoding
+    # on the way, so received frames don't need to be decoded to str first
+    from orjson import loads as orjson_loads
+
+    def json_loads(msg):
+        try:
+            return orjson_loads(msg)
+        except ValueError:
+            # orjson rejects integers which don't fit into 64 bits, they
+            # are valid JSON, so the message is parsed once more with the
+            # standard library which raises if it is really not valid
+            if isinstance(msg, (bytes, bytearray)):
+                msg = msg.decode()
+            return std_json.loads(msg)
+except ImportError:
+    def json_loads(msg):
+        if isinstance(msg, (bytes, bytearray)):
+            msg = msg.decode()
+        return json.loads(msg)
+
 import os
 import shutil
 import sys
 import time
 from binascii import hexlify, unhexlify
 from collections import deque, OrderedDict
-from typing import Mapping, Tuple, Any, Union, Optional, NamedTuple
+from typing import Mapping, Tuple, Any, Union, Optional, NamedTuple, List
 
 from common.exceptions import PlenumTypeError, PlenumValueError
 
@@ -472,19 +495,23 @@ class ZStack(NetworkInterface):
         return 0
 
     def _verifyAndAppend(self, msg, ident):
+        # Frames are kept as bytes, they are decoded and parsed at once
+        # by `deserializeMsg` when processed
         try:
             self.metrics.add_event(self.mt_incoming_size, len(msg))
             self.msgLenVal.validate(msg)
-            decoded = msg.decode()
-        except (UnicodeDecodeError, InvalidMessageExceedingSizeException) as ex:
-            errstr = 'Message will be discarded due to {}'.format(ex)
-            frm = self.remotesByKeys[ident].name if ident in self.remotesByKeys else ident
-            logger.error("Got from {} {}".format(z85_to_friendly(frm), errstr))
-            self.msgRejectHandler(errstr, frm)
+        except InvalidMessageExceedingSizeException as ex:
+            self._rejectReceived(ex, ident)
             return False
-        self.rxMsgs.append((decoded, ident))
+        self.rxMsgs.append((msg, ident))
         return True
 
+    def _rejectReceived(self, ex, ident):
+        errstr = 'Message will be discarded due to {}'.format(ex)
+        frm = self.remotesByKeys[ident].name if ident in self.remotesByKeys else ident
+        logger.error("Got from {} {}".format(z85_to_friendly(frm), errstr))
+        self.msgRejectHandler(errstr, frm)
+
     def _receiveFromListener(self, quota: Quota) -> int:
         """
         Receives messages from listener
@@ -539,6 +566,30 @@ class ZStack(NetworkInterface):
             totalReceived += i
         return totalReceived
 
+    def _receiving_sockets(self) -> list:
+        if not self.listener:
+            return []
+        socks = [self.listener]
+        socks.extend(remote.socket for remote in self.remotesByKeys.values()
+                     if remote.socket)
+        return socks
+
+    def get_wakeup_fds(self) -> List[int]:
+        """
+        ZeroMQ signals these descriptors when state of the listener or
+        remote sockets changes. They are edge-triggered: only a change of
+        state is signalled, so `has_pending_messages` must be checked
+        before waiting on them.
+        """
+        return [sock.FD for sock in self._receiving_sockets()]
+
+    def has_pending_messages(self) -> bool:
+        if self.rxMsgs:
+            return True
+        # Reading ZMQ_EVENTS also re-arms the descriptors
+        return any(sock.EVENTS & zmq.POLLIN
+                   for sock in self._receiving_sockets())
+
     async def _serviceStack(self, age, quota: Optional[Quota] = None):
         # TODO: age is unused
 
@@ -578,16 +629,29 @@ class ZStack(NetworkInterface):
                 continue
 
             try:
-                msg = self.deserializeMsg(msg)
+                msgs = self.deserializeReceived(msg, frm)
             except Exception as e:
+                if isinstance(msg, bytes):
+                    try:
+                        msg.decode()
+                    except UnicodeDecodeError as ex:
+                        self._rejectReceived(ex, ident)
+                        continue
                 logger.error('Error {} while converting message {} '
                              'to JSON from {}'.format(e, msg, z85_to_friendly(ident)))
                 continue
-            msg = self.doProcessReceived(msg, frm, ident)
-            if msg:
-                self.msgHandler((msg, frm))
+            for msg in msgs:
+                msg = self.doProcessReceived(msg, frm, ident)
+                if msg:
+                    self.msgHandler((msg, frm))
         return num_processed + 1
 
+    def deserializeReceived(self, msg, frm) -> List:
+        """
+        Deserialize a frame received from `frm` into the messages it carries
+        """
+        return [self.deserializeMsg(msg)]
+
     def doProcessReceived(self, msg, frm, ident):
         return msg
 
@@ -694,7 +758,7 @@ class ZStack(NetworkInterface):
         msg = self.pingMessage if is_ping else self.pongMessage
         action = 'ping' if is_ping else 'pong'
         name = remote if isinstance(remote, (str, bytes)) else remote.name
-        r = self.send(msg, name)
+        r = self._send_health_message(msg, name)
         if r[0] is True:
             logger.debug('{} {}ed {}'.format(self.name, action, z85_to_friendly(name)))
         elif r[0] is False:
@@ -711,7 +775,13 @@ class ZStack(NetworkInterface):
                          format(CONNECTION_PREFIX, self, r))
         return r[0]
 
+    def _send_health_message(self, msg, remote_name):
+        return self.send(msg, remote_name)
+
     def handlePingPong(self, msg, frm, ident):
+        # received frames are bytes while messages from batches are str
+        if isinstance(msg, bytes) and msg in self.healthMessages:
+            msg = msg.decode()
         if msg in (self.pingMessage, self.pongMessage):
             if msg == self.pingMessage:
                 logger.trace('{} got ping from {}'.format(self, z85_to_friendly(frm)))
@@ -823,10 +893,7 @@ class ZStack(NetworkInterface):
 
     @staticmethod
     def deserializeMsg(msg):
-        if isinstance(msg, bytes):
-            msg = msg.decode()
-        msg = json.loads(msg)
-        return msg
+        return json_loads(msg)
 
     def signedMsg(self, msg: bytes, signer: Signer = None):
         sig = self.signer.signature(msg)